@@ -5,42 +5,64 @@ Antiques.py
 Main scraper to extract antique item data from the 4AM admin panel.
 
 FUNCTIONALITY:
-- Performs automatic login to the admin site.
+- Performs automatic login to the admin site, reusing the saved session cookies
+  (output/session_cookies.json) while the panel still accepts them.
 - Navigates through all item pages.
 - For each item:
     - Extracts ID, name, category, number of images, price, featured, status, updated date.
     - Extracts all image links (forcing https).
-    - Accesses the edit page to extract and summarize the HTML description (DescriptionSummary).
+    - Accesses the edit page to extract and summarize the HTML description (DescriptionSummary),
+      in a background stage so the listing page is never left mid-iteration.
 - Saves results in CSV and JSON in the 'output' folder (created if it does not exist).
-- Makes partial backups every 200 items.
+- Appends every item to an append-only JSONL checkpoint log as soon as it is scraped
+  (and its description when it arrives); the log is compacted into the final export.
+- Incremental mode (--incremental): items whose Updated, Price, Status and Pictures
+  match output/items_all.json reuse their stored ImageLinks and DescriptionSummary.
 
 REQUIREMENTS:
-- Selenium, beautifulsoup4, re, csv
-- ChromeDriver installed and path configured
+- Selenium, beautifulsoup4, lxml, csv, pyarrow (columnar export)
+- ChromeDriver installed and path configured (resolved from the local cache, downloaded only once)
 
 OUTPUT:
 - output/items_all.csv
-- output/items_all.json
-- output/items_backup_X.json (every 200 items)
+- output/items_all.json (streamed item by item, finalised on exit, Ctrl+C or error)
+- output/items_all.parquet / output/items_all.arrow (typed columnar export)
+- output/snapshots/ (deduplicated snapshot of every run: only changed record chunks are written)
+- output/items_checkpoint.jsonl (one line per item, flushed immediately)
+- output/checkpoint_manifest.json (exact resume cursor: page, row, last ID, log hash);
+  an interrupted run resumes from it automatically, --fresh starts over
+- output/items.db (SQLite item store: ID primary key, upserts, indexed queries)
+- All writes during the run go through a background writer thread; snapshot files are
+  written to a temporary file, fsynced and renamed, so every file on disk is complete.
 
 Author: hamza
 Last modified: 2025-05-30
 """
-import time
-import pandas as pd
-import json
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import NoSuchElementException
-from bs4 import BeautifulSoup
-import re
-import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Scripts'))
+from backup import backup_manager
+from config import login_config
+from backup.checkpoint_log import CHECKPOINT_PATH
+from backup.checkpoint_manifest import CheckpointManifest, MANIFEST_PATH, resume_checkpoint
+from backup.background_writer import BackgroundWriter
+from backup.item_store import ItemStore
+from backup.snapshot_store import SnapshotStore
+from backup.stream_export import StreamingExport, iter_json_array
+from scraping.browser_session import create_driver, login_cached
+from scraping.aspnet_forms import parse_document
+from scraping.description_fetcher import DescriptionFetcher
+from scraping.gallery_fetcher import MAX_WORKERS as GALLERY_WORKERS, collect_gallery_urls, fetch_galleries
+from scraping.grid_parser import parse_grid_rows
+from scraping.incremental import compact_previous, load_previous, split_rows
+from scraping.pager import PagerMap, is_last_page
+from scraping.session_pool import SessionPool, login_session
+from scraping.wait_scheduler import AdaptiveWait
 
 # CONFIGURATION
 LOGIN_URL = "https://4am.ie/Logon.aspx?admin&ReturnUrl=%2fAdmin%2fItems.aspx"  # Updated login URL
@@ -57,78 +79,66 @@ LOGIN_BUTTON = "ctl00_ContentPlaceHolderBody_Button1"     # login button id
 START_PAGE = 1  # Start from the first page
 END_PAGE = 43   # Last page to process
 MAX_RETRIES = 5  # Max navigation retries
-WAIT_BETWEEN_PAGES = 4  # Wait between pages (seconds)
-WAIT_AFTER_REFRESH = 3  # Wait after refresh (seconds)
-WAIT_BETWEEN_ROWS = 1   # Wait between rows (seconds)
+# Sin pausas fijas: AdaptiveWait espera condiciones del DOM y sólo hace
+# backoff cuando el sitio responde más lento de lo habitual; tras un error
+# se reintenta con una pausa mínima que crece en cada intento
+MAX_WAIT = 30    # Max wait for a condition (seconds)
+MAX_BACKOFF = 10 # Max backoff when the site is slow (seconds)
+# Modo incremental: sólo se reabren galería y edición de items nuevos o modificados
+INCREMENTAL = '--incremental' in sys.argv
+# Por defecto se reanuda desde el manifiesto de checkpoint; --fresh empieza de cero
+FRESH_START = '--fresh' in sys.argv
 
 # Create output folder if it does not exist
 os.makedirs('output', exist_ok=True)
 
 def load_existing_data():
-    """Carga datos existentes del archivo JSON más reciente"""
+    """
+    Reanuda desde el manifiesto de checkpoint: devuelve los items confirmados,
+    sus IDs y el cursor (página, fila, último ID), o datos vacíos si no hay nada
+    que reanudar o se pasó --fresh.
+    """
+    if FRESH_START:
+        return [], set(), None
     try:
-        # Buscar el archivo de backup más reciente
-        backup_files = [f for f in os.listdir('output') if f.startswith('items_backup_') and f.endswith('.json')]
-        if not backup_files:
-            return [], set()
-        
-        # Ordenar por fecha de modificación del archivo
-        latest_backup = max(backup_files, key=lambda x: os.path.getmtime(os.path.join('output', x)))
-        backup_path = os.path.join('output', latest_backup)
-        
-        print(f"📂 Cargando datos existentes desde {backup_path}")
-        with open(backup_path, 'r', encoding='utf-8') as f:
-            existing_data = json.load(f)
-        
-        # Crear conjunto de IDs procesados
-        processed_ids = {item['ID'] for item in existing_data}
-        print(f"✅ Cargados {len(existing_data)} items previos")
-        return existing_data, processed_ids
-        
+        resumed = resume_checkpoint(MANIFEST_PATH, CHECKPOINT_PATH)
     except Exception as e:
         print(f"⚠️ Error cargando datos existentes: {e}")
-        return [], set()
+        resumed = None
+    if resumed is None:
+        return [], set(), None
+    existing_data, cursor = resumed
+    print(f"✅ Cargados {len(existing_data)} items previos")
+    return existing_data, {item['ID'] for item in existing_data}, cursor
+
+def already_scraped(page, row):
+    """True si (page, row) está en o antes del cursor de reanudación."""
+    return resume_cursor is not None and (page, row) <= (resume_cursor['page'], resume_cursor['row'])
 
 # Initialize browser con opciones mejoradas
-service = Service(ChromeDriverManager().install())
-options = webdriver.ChromeOptions()
-options.add_argument('--start-maximized')
-options.add_argument('--disable-dev-shm-usage')
-options.add_argument('--no-sandbox')
-options.add_argument('--disable-gpu')
-options.add_experimental_option('excludeSwitches', ['enable-logging'])
-driver = webdriver.Chrome(service=service, options=options)
-
-# Cargar datos existentes
-all_data, seen_ids = load_existing_data()
-wait = WebDriverWait(driver, 20)
+driver = create_driver()
+
+# Almacén SQLite de items (ID como clave primaria, upserts e índices)
+item_store = ItemStore()
+# Hilo de persistencia: el bucle de scraping sólo encola escrituras
+writer = BackgroundWriter()
+
+# Cargar datos existentes: conjunto completo anterior y cursor exacto de reanudación
+all_data, seen_ids, resume_cursor = load_existing_data()
+wait = AdaptiveWait(driver, max_timeout=MAX_WAIT, max_backoff=MAX_BACKOFF)
 
 # 1. Login con verificación
 print("\n=== INICIANDO SESIÓN ===")
 try:
-    driver.get(LOGIN_URL)
-    print("✅ Página de login cargada")
-    
-    # Esperar y verificar campos de login
-    wait.until(EC.presence_of_element_located((By.ID, USERNAME_FIELD)))
-    wait.until(EC.presence_of_element_located((By.ID, PASSWORD_FIELD)))
-    wait.until(EC.presence_of_element_located((By.ID, LOGIN_BUTTON)))
-    print("✅ Campos de login detectados")
-    
-    # Ingresar credenciales
-    driver.find_element(By.ID, USERNAME_FIELD).send_keys(USERNAME)
-    driver.find_element(By.ID, PASSWORD_FIELD).send_keys(PASSWORD)
-    print("✅ Credenciales ingresadas")
-    
-    # Click en login y esperar redirección
-    driver.find_element(By.ID, LOGIN_BUTTON).click()
-    wait.until(EC.url_contains("Admin"))
+    # Reutilizar la sesión guardada o hacer login completo (esperar campos, credenciales, redirección)
+    session_restored = login_cached(driver, wait)
     print("✅ Login exitoso")
     
-    # 2. Ir a la página de items con verificación
+    # 2. Ir a la página de items con verificación (ya abierta si se restauró la sesión)
     print("\n=== ACCEDIENDO A ITEMS ===")
-    driver.get(ITEMS_URL)
-    wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
+    if not session_restored:
+        driver.get(ITEMS_URL)
+        wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")), 'listing')
     print("✅ Página de items cargada")
     
     # Verificar que hay datos en la tabla
@@ -143,101 +153,47 @@ except Exception as e:
     driver.quit()
     exit(1)
 
-# Small pause to ensure everything is loaded
-time.sleep(5)  # Wait 5 seconds before starting
+# Se empieza en START_PAGE o directamente en la página del cursor de reanudación
+start_page = resume_cursor['page'] if resume_cursor else START_PAGE
+page = start_page
+# Registros anteriores ({ID: CompactItem}) con los que se comparan las filas del listado
+previous_items = compact_previous(item_store.items()) if INCREMENTAL else {}
+if INCREMENTAL and not previous_items:
+    previous_items = load_previous()
+
+# En lugar de una pausa fija, esperar a que la tabla del listado esté presente
+wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.gridView")), 'listing')
 
-def get_item_images_from_td(td):
-    images = []
-    main_window = driver.current_window_handle
+# Mapa del paginador: destino del postback de cada página (output/pager_map.json),
+# guardado por el hilo de escritura para no bloquear cada navegación
+pager_map = PagerMap(writer=writer)
+
+def jump_to_page(target_page):
+    """Salta directamente a target_page con un único postback si ya se conoce su enlace."""
     try:
-        link = td.find_element(By.TAG_NAME, 'a')
-        img_url = link.get_attribute('href')
-        driver.execute_script("window.open(arguments[0]);", img_url)
-        driver.switch_to.window(driver.window_handles[-1])
-        time.sleep(3)  # Aumentado de 1.5 a 3 segundos
-        # Find all <li> inside the image gallery <ul>
-        lis = driver.find_elements(By.CSS_SELECTOR, 'div#ctl00_ContentPlaceHolderBody_ReorderList1 ul > li')
-        for li in lis:
-            try:
-                a_tag = li.find_element(By.CSS_SELECTOR, 'a[target="_blank"]')
-                href = a_tag.get_attribute('href')
-                if href and href.startswith('http'):
-                    images.append(href)
-            except Exception:
-                continue
+        pager_map.learn_html(driver.page_source, driver.current_url)
+        current_elem = driver.find_element(By.CSS_SELECTOR, ".PagingLinkCurrent")
+        if current_elem.text.strip() == str(target_page):
+            return True
+        if pager_map.jump_with_driver(driver, target_page):
+            pager_map.learn_html(driver.page_source, driver.current_url)
+            return True
     except Exception as e:
-        print(f"[ERROR] Error obteniendo imágenes: {str(e)}")
-    finally:
-        # Always try to close the secondary tab and return to the main one
-        if len(driver.window_handles) > 1:
-            try:
-                driver.close()
-            except Exception as e:
-                print(f"[ERROR] Error cerrando ventana secundaria: {str(e)}")
-            try:
-                driver.switch_to.window(main_window)
-                time.sleep(3)  # Añadido tiempo de espera después de volver a la ventana principal
-            except Exception as e:
-                print(f"[ERROR] Error volviendo a ventana principal: {str(e)}")
-    return images
+        print(f"[PAGER] Salto directo no disponible: {e}")
+    return False
 
-def summarize_description(html):
-    """
-    Cleans the HTML and extracts key data from an antique product description.
-    Returns a concise string with dimensions, materials, provenance, condition, and unique features.
-    """
-    soup = BeautifulSoup(html, 'html.parser')
-    text = soup.get_text(separator=' ', strip=True)
-    text = re.sub(r'\s+', ' ', text)
-    dims = re.findall(r'(Height|Width|Depth)[^\d]*(\d+[.,]?\d*)["\']? ?\(?([\d.,]+)? ?cm?\)?', text, re.I)
-    dims_str = ', '.join([f"{d[0].capitalize()}: {d[1]}{(' ('+d[2]+'cm)') if d[2] else ''}" for d in dims]) if dims else ''
-    materials = re.findall(r'(Arbutus|Yew Wood|Mahogany|Oak|Walnut|Bronze|Porcelain|Glass|Marble|Silver|Gold|Ivory|Ebony)', text, re.I)
-    materials_str = ', '.join(sorted(set([m.capitalize() for m in materials]))) if materials else ''
-    provenance = ''
-    prov_match = re.search(r'(made in|originates from|provenance:?|located in) ([A-Za-z ,.-]+)', text, re.I)
-    if prov_match:
-        provenance = prov_match.group(0)
-    elif 'Ireland' in text:
-        provenance = 'Ireland'
-    features = []
-    if 'inlaid' in text.lower():
-        features.append('Inlaid decoration')
-    if 'crossed ferns' in text.lower():
-        features.append('Crossed Ferns motif')
-    if 'original condition' in text.lower():
-        features.append('Original condition')
-    if 'provenance' in text.lower():
-        features.append('Provenance available')
-    if 'rare' in text.lower():
-        features.append('Rare piece')
-    features_str = ', '.join(features)
-    state = ''
-    if 'restored' in text.lower() or 'cleaned' in text.lower() or 'waxed' in text.lower():
-        state = 'Restored/Cleaned'
-    elif 'original condition' in text.lower():
-        state = 'Original condition'
-    summary_parts = []
-    if dims_str:
-        summary_parts.append(dims_str)
-    if materials_str:
-        summary_parts.append(f"Materials: {materials_str}")
-    if provenance:
-        summary_parts.append(f"Provenance: {provenance}")
-    if features_str:
-        summary_parts.append(f"Features: {features_str}")
-    if state:
-        summary_parts.append(f"State: {state}")
-    summary = '; '.join(summary_parts)
-    return summary or text[:200]
-
-all_data = []
-page = START_PAGE  # Start from the first page
-
-wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
+def click_pager_link(link):
+    """Pulsa un enlace del paginador y espera a que el postback recargue la página."""
+    link.click()
+    wait.until(EC.staleness_of(link), 'pager')
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".PagingLinkCurrent")), 'pager')
 
 # Funciones de navegación mejoradas
 def navigate_to_page(target_page, max_retries=30):
     print(f"🔍 Intentando navegar a la página {target_page}...")
+    if jump_to_page(target_page):
+        print(f"✅ Navegado a la página {target_page}")
+        return True
     for attempt in range(max_retries):
         try:
             wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolderBody_PanelDataListPaging")))
@@ -254,8 +210,7 @@ def navigate_to_page(target_page, max_retries=30):
             for link in page_links:
                 if link.text.strip() == str(target_page):
                     driver.execute_script("arguments[0].scrollIntoView(true);", link)
-                    link.click()
-                    time.sleep(2)
+                    click_pager_link(link)
                     found = True
                     break
             if found:
@@ -266,7 +221,7 @@ def navigate_to_page(target_page, max_retries=30):
                     return True
                 else:
                     print(f"[WARN] No estamos en la página {target_page} (actual: {current_page}), reintentando...")
-                    time.sleep(2)
+                    wait.retry_backoff(attempt + 1, 'pager')
                     continue
 
             # Si no está visible, puede que necesite pulsar << para mostrar el bloque superior
@@ -287,8 +242,7 @@ def navigate_to_page(target_page, max_retries=30):
                                 break
                         if rewind_btn:
                             driver.execute_script("arguments[0].scrollIntoView(true);", rewind_btn)
-                            rewind_btn.click()
-                            time.sleep(2)
+                            click_pager_link(rewind_btn)
                             continue
                     # Si la página objetivo está por detrás, pulsa '<<' hasta que esté visible
                     elif target_page < min_visible:
@@ -299,16 +253,14 @@ def navigate_to_page(target_page, max_retries=30):
                                 break
                         if rewind_btn:
                             driver.execute_script("arguments[0].scrollIntoView(true);", rewind_btn)
-                            rewind_btn.click()
-                            time.sleep(2)
+                            click_pager_link(rewind_btn)
                             continue
                 # Si la página está visible tras pulsar <<, haz clic
                 if str(target_page) in visible_pages:
                     for link in page_links:
                         if link.text.strip() == str(target_page):
                             driver.execute_script("arguments[0].scrollIntoView(true);", link)
-                            link.click()
-                            time.sleep(2)
+                            click_pager_link(link)
                             current_elem = driver.find_element(By.CSS_SELECTOR, ".PagingLinkCurrent")
                             current_page = int(current_elem.text.strip())
                             if current_page == target_page:
@@ -316,7 +268,7 @@ def navigate_to_page(target_page, max_retries=30):
                                 return True
                             else:
                                 print(f"[WARN] No estamos en la página {target_page} (actual: {current_page}), reintentando...")
-                                time.sleep(2)
+                                wait.retry_backoff(attempt + 1, 'pager')
                                 break
                     break
                 # Si no está visible, busca el botón '>>' y avanza
@@ -327,8 +279,7 @@ def navigate_to_page(target_page, max_retries=30):
                         break
                 if avanzar_btn:
                     driver.execute_script("arguments[0].scrollIntoView(true);", avanzar_btn)
-                    avanzar_btn.click()
-                    time.sleep(2)
+                    click_pager_link(avanzar_btn)
                 else:
                     print(f"❌ No se pudo avanzar a la página {target_page} desde la página {current_page}")
                     return False
@@ -338,7 +289,7 @@ def navigate_to_page(target_page, max_retries=30):
                     return False
         except Exception as e:
             print(f"⚠️ Error en intento {attempt + 1}/{max_retries}: {e}")
-            time.sleep(2)
+            wait.retry_backoff(attempt + 1, 'pager')
     print(f"❌ No se pudo navegar a la página {target_page} después de {max_retries} intentos")
     return False
 
@@ -348,8 +299,7 @@ def navigate_to_start_page():
     
     try:
         driver.get(ITEMS_URL)
-        wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-        time.sleep(2)
+        wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")), 'listing')
         
         current_elem = driver.find_element(By.CSS_SELECTOR, "a.PagingLinkCurrent")
         current_page = int(current_elem.text.strip())
@@ -360,8 +310,7 @@ def navigate_to_start_page():
             
             for link in next_links:
                 if link.text.strip() in ['»', '>>', 'Next', '>|']:
-                    link.click()
-                    time.sleep(2)
+                    click_pager_link(link)
                     current_elem = driver.find_element(By.CSS_SELECTOR, "a.PagingLinkCurrent")
                     current_page = int(current_elem.text.strip())
                     print(f"  ⏩ Avanzando a página {current_page}")
@@ -382,16 +331,17 @@ def navigate_to_start_page():
 # Start extraction process
 print("\n=== STARTING EXTRACTION PROCESS ===")
 print(f"[INFO] Loaded data: {len(all_data)} items")
-print(f"[INFO] Starting from page {START_PAGE}")
+print(f"[INFO] Starting from page {start_page}")
 
 try:
-    driver.get(ITEMS_URL)
-    wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-    time.sleep(2)
+    # El listado ya está abierto desde el login; sólo se recarga si no lo está
+    if ITEMS_URL not in driver.current_url:
+        driver.get(ITEMS_URL)
+        wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")), 'listing')
 
     # Navegar directamente a la página de inicio usando la función robusta
-    if not navigate_to_page(START_PAGE):
-        print(f"❌ No se pudo llegar a la página objetivo {START_PAGE}")
+    if not navigate_to_page(start_page):
+        print(f"❌ No se pudo llegar a la página objetivo {start_page}")
         driver.quit()
         exit(1)
 
@@ -429,12 +379,37 @@ except Exception as e:
     driver.quit()
     exit(1)
 
-# Configuración de la extracción
-backup_size = 100  # Cambia de 200 a 100
-final_backup_written = False
+# Log de checkpoint JSONL: cada item se escribe una sola vez, en una línea.
+# Al reanudar se sigue anexando al log ya verificado contra el manifiesto.
+checkpoint_log = backup_manager.open_checkpoint(reset=resume_cursor is None, writer=writer)
+checkpoint_manifest = CheckpointManifest(checkpoint_log, MANIFEST_PATH, resume_cursor, len(all_data), writer)
+run_finished = False
+
+# Exportación final en streaming: items_all.json / items_all.csv se escriben item
+# a item y se cierran en el finally, así que el catálogo no se acumula en memoria
+final_export = StreamingExport('output')
+for item in all_data:
+    final_export.add(item)
+items_count = len(all_data)
+del all_data  # los items reanudados ya están en la exportación
+
+def checkpoint_description(item):
+    """Anexa al log la descripción que llega después de haber guardado el item."""
+    record = {'ID': item['ID'], 'DescriptionSummary': item['DescriptionSummary']}
+    backup_manager.checkpoint_item(record)
+    writer.submit(item_store.upsert, record)
+    checkpoint_manifest.complete(item['ID'])
+    final_export.complete(item['ID'])
+
+# Sesiones HTTP para galerías y descripciones, cada una con su propio login: ASP.NET
+# serializa las peticiones de una misma sesión (también la del navegador)
+http_sessions = SessionPool(lambda: login_session(login_config), size=GALLERY_WORKERS)
+description_fetcher = DescriptionFetcher(http_sessions, on_done=checkpoint_description)
 
 def go_to_page(target_page):
     print(f"\n[NAV] Intentando ir a la página {target_page}")
+    if jump_to_page(target_page):
+        return True
     max_attempts = 3
     attempt = 0
     
@@ -450,70 +425,54 @@ def go_to_page(target_page):
             print(f"[NAV] Intento {attempt}/{max_attempts}")
             paging_panel = driver.find_element(By.ID, "ctl00_ContentPlaceHolderBody_PanelDataListPaging")
             page_links = paging_panel.find_elements(By.CSS_SELECTOR, 'a.PagingLink')
+            # Un enlace stale o un clic fallido llegan al except: se reintenta tras la pausa
             for link in page_links:
-                try:
-                    if link.text.strip() == str(target_page):
-                        link.click()
-                        WebDriverWait(driver, 10).until(
-                            lambda d: d.find_element(By.CSS_SELECTOR, "a.PagingLinkCurrent").text.strip() == str(target_page)
-                        )
-                        # Verifica que realmente estamos en la página correcta
-                        current_page_elem = driver.find_element(By.CSS_SELECTOR, "a.PagingLinkCurrent")
-                        if current_page_elem.text.strip() == str(target_page):
-                            return
-                except Exception:
-                    break  # Si stale, reinicia el while
+                if link.text.strip() == str(target_page):
+                    link.click()
+                    wait.until(
+                        lambda d: d.find_element(By.CSS_SELECTOR, "a.PagingLinkCurrent").text.strip() == str(target_page),
+                        'pager'
+                    )
+                    # Verifica que realmente estamos en la página correcta
+                    current_page_elem = driver.find_element(By.CSS_SELECTOR, "a.PagingLinkCurrent")
+                    if current_page_elem.text.strip() == str(target_page):
+                        return
             else:
                 for link in page_links:
-                    try:
-                        if link.text.strip() in ['»', '>>']:
-                            link.click()
-                            time.sleep(1)
-                            break
-                    except Exception:
+                    if link.text.strip() in ['»', '>>']:
+                        click_pager_link(link)
                         break
                 else:
                     raise Exception(f"No se pudo encontrar la página {target_page} en el paginador.")
         except Exception:
-            time.sleep(1)
+            wait.retry_backoff(attempt, 'pager')
             continue
 
-def get_cell_text(td):
-    try:
-        return td.find_element(By.TAG_NAME, 'span').text.strip()
-    except Exception:
-        try:
-            return td.text.strip()
-        except Exception:
-            return ''
-
 try:
     print("\n=== INICIANDO BUCLE PRINCIPAL DE SCRAPING ===")
-    print(f"[INFO] Comenzando procesamiento desde página {START_PAGE}")
+    print(f"[INFO] Comenzando procesamiento desde página {start_page}")
     
-    page = START_PAGE
+    page = start_page
     # Asegurarse de estar en la página correcta antes de scrapear
     current_elem = driver.find_element(By.CSS_SELECTOR, "a.PagingLinkCurrent")
     current_page = int(current_elem.text.strip())
-    if current_page != START_PAGE:
-        print(f"[INFO] No estamos en la página de inicio ({START_PAGE}), navegando...")
-        navigate_to_page(START_PAGE)
-        time.sleep(2)
+    if current_page != start_page:
+        print(f"[INFO] No estamos en la página de inicio ({start_page}), navegando...")
+        navigate_to_page(start_page)
         current_elem = driver.find_element(By.CSS_SELECTOR, "a.PagingLinkCurrent")
         current_page = int(current_elem.text.strip())
-        if current_page != START_PAGE:
-            print(f"[ERROR] No se pudo llegar a la página de inicio {START_PAGE}. Abortando.")
+        if current_page != start_page:
+            print(f"[ERROR] No se pudo llegar a la página de inicio {start_page}. Abortando.")
             driver.quit()
             exit(1)
     print(f"[INFO] Confirmado: estamos en la página {current_page} para iniciar el scraping.")
     # Ahora sí, iniciar el bucle principal
     while True:
         try:
-    print(f"\n--- Processing page {page} ---")
+            print(f"\n--- Processing page {page} ---")
             # Navega y verifica que realmente estamos en la página correcta
             for nav_attempt in range(5):
                 go_to_page(page)
-                time.sleep(2)
                 current_elem = driver.find_element(By.CSS_SELECTOR, "a.PagingLinkCurrent")
                 current_page = int(current_elem.text.strip())
                 if current_page == page:
@@ -524,254 +483,76 @@ try:
                 driver.quit()
                 exit(1)
 
-            # SOLO AQUÍ obtén las filas de la tabla
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.gridView")))
-            rows = driver.find_elements(By.CSS_SELECTOR, "table.gridView > tbody > tr")
-            
-            idx = 1
-            max_retries_per_row = 3
-            
-            while idx < len(rows):
-                retry_count = 0
-                while retry_count < max_retries_per_row:
-                    try:
-                        # Si necesitas refrescar la página por referencias obsoletas:
-                        # driver.refresh()
-                        # time.sleep(2)
-                        # rows = driver.find_elements(By.CSS_SELECTOR, "table.gridView > tbody > tr")
-                        
-                        row = rows[idx]
-                        inner_tables = row.find_elements(By.TAG_NAME, "table")
-                        
-                        if not inner_tables:
-                            print(f"[DEBUG] Fila {idx} no tiene tablas internas")
-                            idx += 1
-                            continue
-                        
-                        try:
-                            inner_row = inner_tables[0].find_elements(By.TAG_NAME, "tr")[0]
-                            tds = inner_row.find_elements(By.TAG_NAME, "td")
-                            
-                            if len(tds) < 10:
-                                print(f"[DEBUG] Fila {idx} no tiene suficientes columnas ({len(tds)} encontradas)")
-                                idx += 1
-                                continue
-                        except Exception as e:
-                            print(f"[ERROR] No se pudo acceder a las celdas de la fila {idx}: {str(e)}")
-                            idx += 1
-                            continue
-                        
-                        # Verificar que los elementos no estén obsoletos y esperar a que sean interactuables
-                        try:
-                            # Esperar explícitamente a que el primer elemento sea interactuable
-                            wait.until(EC.element_to_be_clickable((By.XPATH, f"//table[@class='gridView']//tr[{idx+1}]")))
-                            # Intenta acceder a alguna propiedad para verificar que el elemento sigue válido
-                            _ = tds[0].is_displayed()
-                        except Exception:
-                            print(f"[WARN] Los elementos de la fila {idx} están obsoletos o no son interactuables, reintentando...")
-                            retry_count += 1
-                            if retry_count >= max_retries_per_row:
-                                print(f"[ERROR] No se pudo procesar la fila {idx} después de {max_retries_per_row} intentos")
-                                idx += 1
-                                break  # Salir del bucle de reintentos
-                            time.sleep(WAIT_BETWEEN_ROWS)  # Esperar antes de reintentar
-                            continue  # Mantener el mismo índice para reintentar
-                        
-                        # --- EXTRACCIÓN ROBUSTA DEL ID ---
-                        try:
-                            id_span = tds[2].find_element(By.XPATH, ".//span[contains(@id, '_RptIdItem')]")
-                            item_id = id_span.text.strip()
-                        except Exception:
-                            item_id = ''
-                        print(f"[DEBUG] Extracted item_id: '{item_id}' en página {page}, fila {idx}")
-
-                        if not item_id:
-                            print(f"[ERROR] Item sin ID en página {page}, fila {idx}. No se guarda.")
-                            idx += 1
-                            continue
-                        
-                        # Extract all cell values BEFORE navigation
-                        name = get_cell_text(tds[3])
-                        category = get_cell_text(tds[4])
-                        pictures = get_cell_text(tds[5])
-                        price = get_cell_text(tds[6])
-                        try:
-                            featured_input = tds[7].find_element(By.TAG_NAME, 'input')
-                            featured = 'Yes' if featured_input.is_selected() else 'No'
-                        except Exception:
-                            featured = 'No'
-                        if tds[8].find_elements(By.TAG_NAME, 'select'):
-                            status = tds[8].find_element(By.TAG_NAME, 'select').get_attribute('value')
-                        else:
-                            status = get_cell_text(tds[8])
-                        updated = get_cell_text(tds[9])
-                        
-                        # Get images by opening the secondary page
-                        images = get_item_images_from_td(tds[5])
-                        images = [img.replace('http://', 'https://', 1) for img in images]
-                        main_window = driver.current_window_handle
-                        desc_summary = ''
-                        edit_input = None
-                        
-                        # Buscar botón de edición
-                        try:
-                            # Find input[type='image'] with 'RptEdit' in name
-                            for td in tds:
-                                edit_inputs = td.find_elements(By.CSS_SELECTOR, "input[type='image']")
-                                for inp in edit_inputs:
-                                    name_attr = inp.get_attribute('name') or ''
-                                    if 'RptEdit' in name_attr:
-                                        edit_input = inp
-                                        print(f"[DEBUG] Found input[type='image'] with name={name_attr}")
-                                        break
-                                if edit_input:
-                                    break
-                            
-                            # If not found, look for <a> or <button> with edit-related text/attribute
-                            if not edit_input:
-                                for td in tds:
-                                    links = td.find_elements(By.TAG_NAME, 'a')
-                                    for link in links:
-                                        link_text = link.text.lower()
-                                        link_title = link.get_attribute('title') or ''
-                                        if 'edit' in link_text or 'edit' in link_title.lower():
-                                            edit_input = link
-                                            print(f"[DEBUG] Found <a> with edit-related text or title: {link_text} | {link_title}")
-                                            break
-                                    if edit_input:
-                                        break
-                                
-                                buttons = td.find_elements(By.TAG_NAME, 'button')
-                                for btn in buttons:
-                                    btn_text = btn.text.lower()
-                                    btn_title = btn.get_attribute('title') or ''
-                                    if 'edit' in btn_text or 'edit' in btn_title.lower():
-                                        edit_input = btn
-                                        print(f"[DEBUG] Found <button> with edit-related text or title: {btn_text} | {btn_title}")
-                                        break
-                                if edit_input:
-                                    break
-                        except Exception as e:
-                            print(f"[ERROR] Error buscando botón de edición: {str(e)}")
-                        
-                        # Extraer descripción si se encontró botón de edición
-                        if edit_input:
-                            try:
-                                # Si es <a href=...> abre en nueva pestaña
-                                if hasattr(edit_input, 'tag_name') and edit_input.tag_name == 'a':
-                                    edit_url = edit_input.get_attribute('href')
-                                    if edit_url:
-                                        driver.execute_script("window.open(arguments[0]);", edit_url)
-                                        driver.switch_to.window(driver.window_handles[-1])
-                                        wait.until(EC.presence_of_element_located((By.NAME, "ctl00$ContentPlaceHolderBody$txtdesc")))
-                                        desc_elem = driver.find_element(By.NAME, "ctl00$ContentPlaceHolderBody$txtdesc")
-                                        desc_html = desc_elem.get_attribute('value')
-                                        desc_summary = summarize_description(desc_html)
-                                        driver.close()
-                                        driver.switch_to.window(main_window)
-                                        # --- Corrección: restaurar la paginación ---
-                                        wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-                                        current_elem = driver.find_element(By.CSS_SELECTOR, "a.PagingLinkCurrent")
-                                        current_page = int(current_elem.text.strip())
-                                        if current_page != page:
-                                            print(f"[WARN] Después de volver atrás estamos en la página {current_page} (esperada: {page}), navegando de nuevo...")
-                                            navigate_to_page(page)
-                                            wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-                                        rows = driver.find_elements(By.CSS_SELECTOR, "table.gridView > tbody > tr")
-                                    else:
-                                        print("      [!] <a> edit button without valid href, skipping description.")
-                                else:
-                                    # Click tradicional para input[type=image] y <button>
-                                    edit_input.click()
-                                    wait.until(EC.presence_of_element_located((By.NAME, "ctl00$ContentPlaceHolderBody$txtdesc")))
-                                    desc_elem = driver.find_element(By.NAME, "ctl00$ContentPlaceHolderBody$txtdesc")
-                                    desc_html = desc_elem.get_attribute('value')
-                                    desc_summary = summarize_description(desc_html)
-                                    driver.back()
-                                    wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-                                    current_elem = driver.find_element(By.CSS_SELECTOR, "a.PagingLinkCurrent")
-                                    current_page = int(current_elem.text.strip())
-                                    if current_page != page:
-                                        print(f"[WARN] Después de volver atrás estamos en la página {current_page} (esperada: {page}), navegando de nuevo...")
-                                        navigate_to_page(page)
-                                        wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-                                    rows = driver.find_elements(By.CSS_SELECTOR, "table.gridView > tbody > tr")
-                            except Exception as e:
-                                print(f"      [!] Could not extract description: {e}")
-                                try:
-                                    # Manejar posibles problemas de navegación
-                                    if len(driver.window_handles) > 1:
-                                        driver.close()
-                                        driver.switch_to.window(main_window)
-                                        time.sleep(2)
-                                    # Si no estamos en la URL correcta, intentar volver
-                                    if 'Items.aspx' not in driver.current_url:
-                                        print(f"[WARN] Navegación incorrecta detectada. URL actual: {driver.current_url}")
-                                        driver.get(ITEMS_URL)
-                                        time.sleep(3)
-                                        # --- Corrección: restaurar la paginación ---
-                                        navigate_to_page(page)
-                                        wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-                                        rows = driver.find_elements(By.CSS_SELECTOR, "table.gridView > tbody > tr")
-                                except Exception as inner_e:
-                                    print(f"[ERROR] Error grave de navegación: {inner_e}")
-                        else:
-                            print(f"      [!] No edit button of type input, <a> or <button> found for this item in any column, skipping description.")
-                        
-                        item = {
-                            'ID': item_id,
-                            'Name': name,
-                            'Category': category,
-                            'Pictures': pictures,
-                            'Price': price,
-                            'Featured': featured,
-                            'Status': status,
-                            'Updated': updated,
-                            'ImageLinks': images,
-                            'DescriptionSummary': desc_summary
-                        }
-
-                        # --- Evita duplicados globales de ID ---
-                        if not hasattr(globals(), 'seen_ids'):
-                            seen_ids = set()
-                        if item_id in seen_ids:
-                            print(f"[WARN] ID global duplicado: {item_id}. Saltando.")
-                        else:
-                            all_data.append(item)
-                            seen_ids.add(item_id)
-
-                        # --- Backup parcial automático cada backup_size items ---
-                        if len(all_data) % backup_size == 0 and len(all_data) > 0:
-                            backup_filename = f'output/items_backup_{len(all_data)}.json'
-                            with open(backup_filename, 'w', encoding='utf-8') as f:
-                                json.dump(all_data, f, ensure_ascii=False, indent=2)
-                            print(f"[BACKUP] Guardado backup parcial: {backup_filename} ({len(all_data)} items)")
-
-                        # --- Progreso cada 10 páginas ---
-                        if page % 10 == 0:
-                            print(f"[PROGRESO] Ya procesadas {page} páginas y {len(all_data)} items.")
-
-                        idx += 1
-                        break  # Salir del bucle retry_count después de procesar exitosamente
-                    
-                    except Exception as e:
-                        print(f"[ERROR] Error procesando fila {idx}: {str(e)}")
-                        retry_count += 1
-                        if retry_count >= max_retries_per_row:
-                            idx += 1  # Avanzar a la siguiente fila después de fallar todos los reintentos
-                        continue
-            
+            # SOLO AQUÍ obtén las filas de la tabla: una única lectura del HTML por página
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.gridView")), 'listing')
+            page_doc = parse_document(driver.page_source)
+            page_rows = parse_grid_rows(page_doc, driver.current_url)
+            # Al reanudar, las filas hasta el cursor ya están confirmadas en el log
+            page_rows = [parsed for parsed in page_rows if not already_scraped(page, parsed['row'])]
+            # --- Evita duplicados globales de ID (seen_ids es global del módulo) antes de
+            # pedir galerías y descripciones: futures, manifiesto y exportación van por ID ---
+            unique_rows, page_ids = [], set()
+            for parsed in page_rows:
+                item_id = parsed['item']['ID']
+                if item_id in seen_ids or item_id in page_ids:
+                    print(f"[WARN] ID global duplicado: {item_id} en página {page}, fila {parsed['row']}. Saltando.")
+                else:
+                    page_ids.add(item_id)
+                    unique_rows.append(parsed)
+            page_rows = unique_rows
+            # En modo incremental los items sin cambios ya traen galería y descripción guardadas
+            changed_rows, unchanged_rows = split_rows(page_rows, previous_items)
+            if unchanged_rows:
+                print(f"[INCREMENTAL] {len(unchanged_rows)} items sin cambios, {len(changed_rows)} a actualizar")
+            # Galerías de toda la página en paralelo, con las cookies de la sesión del navegador
+            page_images = fetch_galleries(http_sessions, collect_gallery_urls(changed_rows))
+            # Descripciones en segundo plano por ID: el listado nunca sale de esta página
+            description_fetcher.submit_page(changed_rows, page_doc, driver.current_url)
+            changed_ids = {parsed['item']['ID'] for parsed in changed_rows}
+
+            for parsed in page_rows:
+                idx = parsed['row']
+                item = parsed['item']
+                item_id = item['ID']
+                print(f"[DEBUG] Extracted item_id: '{item_id}' en página {page}, fila {idx}")
+
+                if item_id in changed_ids:
+                    item['ImageLinks'] = page_images.get(item_id, [])
+
+                # Se marca al guardarlo: si la página se reintenta tras un error, las filas
+                # aún no guardadas no cuentan como duplicadas
+                seen_ids.add(item_id)
+                items_count += 1
+                pending = item_id in description_fetcher.futures
+                # --- Checkpoint: una línea por item, volcada al momento ---
+                backup_manager.checkpoint_item(item)
+                writer.submit(item_store.upsert, item)
+                # El cursor avanza cuando el item (y su descripción) está completo
+                checkpoint_manifest.track(page, idx, item_id, pending=pending)
+                # Y en ese mismo orden se escribe en la exportación final
+                final_export.add(item, pending=pending)
+
+                # --- Progreso cada 10 páginas ---
+                if page % 10 == 0:
+                    print(f"[PROGRESO] Ya procesadas {page} páginas y {items_count} items.")
+
             # Al terminar de procesar todas las filas de la página
-            items_this_page = len(rows) - 1  # -1 por el encabezado
+            items_this_page = len(page_rows)
             if items_this_page > 0:
-                recent_items = all_data[-items_this_page:] if len(all_data) >= items_this_page else all_data
-                page_ids = [item['ID'] for item in recent_items]
+                page_ids = [parsed['item']['ID'] for parsed in page_rows]
                 print(f"[DEBUG] Página {page} - {items_this_page} items procesados - IDs: {page_ids}")
             else:
                 print(f"[DEBUG] Página {page} - No se procesaron items")
                     
-            print(f"[INFO] Page {page} processed with {len(rows)-1} items found")
+            print(f"[INFO] Page {page} processed with {len(page_rows)} items found")
             
+            # Sólo se da la ejecución por terminada si el paginador de esta página lo
+            # confirma: sin » ni enlace a una página mayor
+            if is_last_page(page_doc):
+                print("🔚 No hay más páginas disponibles")
+                run_finished = True
+                break
+
             # Intentar avanzar a la siguiente página
             next_page = page + 1
             print(f"➡️ Intentando navegar a la página {next_page}")
@@ -784,11 +565,13 @@ try:
                         page = next_page
                         break
                     print(f"[WARN] No estamos en la página {next_page} (actual: {current_page}), reintentando navegación...")
-                    time.sleep(2)
                 else:
                     print(f"[WARN] No se pudo navegar a la página {next_page}, reintentando...")
+                wait.retry_backoff(nav_attempt + 1, 'pager')
             else:
-                print("🔚 No hay más páginas disponibles")
+                # Fallo de navegación, no fin del listado: el manifiesto queda reanudable
+                print(f"❌ No se pudo llegar a la página {next_page}. "
+                      f"La próxima ejecución se reanudará desde la página {page}")
                 break
 
             print(f"[INFO] Processing page {page}")
@@ -801,34 +584,56 @@ try:
             print(f"[ERROR] General error on page {page}: {str(e)}")
             try:
                 driver.refresh()
-                time.sleep(2)
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.gridView")), 'listing')
                 continue
             except:
                 break
 finally:
-    # Always save a final backup if not already saved for the last chunk
-    if all_data and (not final_backup_written or len(all_data) % backup_size != 0):
-        backup_filename = f'output/items_backup_final.json'
-        with open(backup_filename, 'w', encoding='utf-8') as f:
-            json.dump(all_data[-(len(all_data)%backup_size or backup_size):], f, ensure_ascii=False, indent=2)
-        print(f"Final backup saved: {backup_filename} ({len(all_data) % backup_size or backup_size} records)")
-    # Guarda el JSON final
-    with open('output/items_all.json', 'w', encoding='utf-8') as f:
-        json.dump(all_data, f, ensure_ascii=False, indent=2)
-
-    # Guarda el CSV final
-    if all_data:
-        with open('output/items_all.csv', 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=all_data[0].keys())
-            writer.writeheader()
-            writer.writerows(all_data)
-    else:
-        print("No data to save.")
-    if len(all_data) % backup_size == 0 and len(all_data) > 0:
-        print(f"[WARNING] Script ended exactly at a multiple of {backup_size} records ({len(all_data)}). Check pagination and backup logic if unexpected.")
-        print(f"[DEBUG] Last page processed: {page}")
-        if all_data:
-            print(f"[DEBUG] First ID of last backup: {all_data[-backup_size]['ID'] if len(all_data) >= backup_size else all_data[0]['ID']}")
-            print(f"[DEBUG] Last recorded ID: {all_data[-1]['ID']}")
-    driver.quit()
+    # El navegador se cierra pase lo que pase en el cierre y en las exportaciones
+    try:
+        try:
+            try:
+                # Esperar a las descripciones pendientes antes de cerrar la exportación
+                print(f"[INFO] Esperando {description_fetcher.pending()} descripciones pendientes...")
+                description_fetcher.wait()
+                description_fetcher.close()
+                http_sessions.close()
+            finally:
+                # Cierra el array JSON y el CSV también tras KeyboardInterrupt o un error
+                final_export.close()
+                if run_finished:
+                    checkpoint_manifest.finish()
+                backup_manager.close_checkpoint()
+        finally:
+            # Vaciar la cola de escrituras (log, manifiesto, SQLite) pase lo que pase antes:
+            # el hilo de escritura es daemon y lo encolado se perdería al salir
+            print(f"[INFO] Esperando {writer.pending()} escrituras pendientes...")
+            try:
+                writer.close()
+            except Exception as e:
+                # El log dejó de anexarse en el fallo y el manifiesto sigue en el último punto
+                # escrito de verdad: la próxima ejecución se reanuda desde ahí
+                print(f"❌ Error en las escrituras en segundo plano: {e}. "
+                      f"El checkpoint queda en el último item guardado en disco")
+            finally:
+                item_store.close()
+        if final_export.count:
+            # Exportación columnar tipada (Parquet + Arrow IPC) e instantánea deduplicada,
+            # leyendo items_all.json item a item. Un fallo aquí no debe impedir cerrar el navegador:
+            # items_all.json y items_all.csv ya están completos
+            try:
+                from data_processing.columnar_export import export_columnar  # pyarrow sólo hace falta aquí
+                export_columnar(final_export.json_path)
+            except Exception as e:
+                print(f"❌ Error en la exportación columnar: {e}")
+            try:
+                SnapshotStore().put(iter_json_array(final_export.json_path))
+            except Exception as e:
+                print(f"❌ Error guardando la instantánea: {e}")
+            print(f"[DEBUG] Last page processed: {page}")
+            print(f"[DEBUG] Last recorded ID: {final_export.last_id}")
+        for page_type, (count, p50, p95) in wait.summary().items():
+            print(f"[WAIT] {page_type}: {count} esperas, p50={p50:.2f}s, p95={p95:.2f}s")
+    finally:
+        driver.quit()
 
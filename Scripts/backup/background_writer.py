@@ -0,0 +1,190 @@
+# Hilo de persistencia en segundo plano con escrituras atómicas
+# -*- coding: utf-8 -*-
+"""
+BackgroundWriter
+----------------
+Saca las escrituras a disco del bucle de scraping: el navegador sólo encola
+trabajos y un único hilo los ejecuta en orden FIFO.
+
+- write_snapshot(path, serialize): fichero completo escrito con
+  write_atomic (fichero temporal, fsync y os.replace). Si se encolan varias
+  versiones del mismo fichero sólo se escribe la última, así que un disco lento
+  no acumula instantáneas viejas.
+- append(path, data): bytes anexados a un fichero abierto por el hilo (log de
+  checkpoint JSONL), volcados tras cada escritura.
+- submit(fn, *args): cualquier otra escritura (p. ej. ItemStore.upsert).
+
+Como la cola es FIFO, una instantánea encolada después de unos append (el
+manifiesto de checkpoint) nunca llega a disco antes que ellos. En disco sólo
+hay ficheros completos: o la versión anterior o la nueva, nunca una a medias.
+
+Si falla un append, el fichero queda marcado como fallido: no se le anexa nada
+más (el log no tendrá huecos) ni se escriben las instantáneas que dependen de
+él (write_snapshot(..., after=path)), así que el manifiesto en disco sigue
+apuntando a un prefijo válido del log. flush() y close() lanzan el primer
+error guardado.
+"""
+import json
+import os
+import queue
+import threading
+
+
+def write_atomic(path, serialize, binary=False, fsync=True):
+    """
+    Escribe path llamando a serialize(f) sobre un fichero temporal del mismo
+    directorio, hace fsync y lo renombra sobre path.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        if binary:
+            f = open(tmp_path, 'wb')
+        else:
+            f = open(tmp_path, 'w', encoding='utf-8', newline='')
+        with f:
+            serialize(f)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if fsync and hasattr(os, 'O_DIRECTORY'):
+        # Persistir también la entrada de directorio del rename
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def write_json_atomic(path, data, **kwargs):
+    """write_atomic para un objeto JSON (indent=2, ensure_ascii=False por defecto)."""
+    kwargs.setdefault('ensure_ascii', False)
+    kwargs.setdefault('indent', 2)
+    write_atomic(path, lambda f: json.dump(data, f, **kwargs))
+
+
+class BackgroundWriter:
+    def __init__(self, fsync=True):
+        self.fsync = fsync
+        self.queue = queue.Queue()
+        self.versions = {}  # path -> última versión encolada de write_snapshot
+        self.files = {}  # path -> fichero abierto para append (sólo lo usa el hilo)
+        self.errors = []
+        self.failed = {}  # path de append -> error que lo dejó a medias
+        self.stale = {}  # path -> última versión descartada de una instantánea con after
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name='background-writer', daemon=True)
+        self.thread.start()
+
+    # --- Trabajos -------------------------------------------------------------
+
+    def write_snapshot(self, path, serialize, binary=False, after=None):
+        """Con after (un fichero de append), no se escribe si ese fichero ha fallado."""
+        with self.lock:
+            version = self.versions.get(path, 0) + 1
+            self.versions[path] = version
+        self.queue.put(('snapshot', path, (serialize, binary, version, after)))
+
+    def write_json(self, path, data, after=None, **kwargs):
+        kwargs.setdefault('ensure_ascii', False)
+        kwargs.setdefault('indent', 2)
+        self.write_snapshot(path, lambda f: json.dump(data, f, **kwargs), after=after)
+
+    def append(self, path, data):
+        self.queue.put(('append', path, data))
+
+    def close_file(self, path=None):
+        """Cierra el fichero de append de path (todos si path es None)."""
+        self.queue.put(('close', path, None))
+
+    def submit(self, fn, *args):
+        self.queue.put(('call', fn, args))
+
+    # --- Hilo -----------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None:
+                    return
+                self._execute(*job)
+            except Exception as e:
+                self.errors.append(e)
+                if job[0] == 'append':
+                    self.failed[job[1]] = e
+                    print(f"[WRITER] Error anexando a {job[1]}: {e}. No se escribirá nada más en él")
+                else:
+                    print(f"[WRITER] Error en escritura en segundo plano: {e}")
+            finally:
+                self.queue.task_done()
+
+    def _execute(self, kind, target, payload):
+        if kind == 'snapshot':
+            serialize, binary, version, after = payload
+            with self.lock:
+                newer = self.versions.get(target) != version
+            if newer:
+                # Ya hay una versión más reciente en la cola; se guarda por si esa queda
+                # bloqueada por un append fallido que aún no ha ocurrido
+                if after is not None and after not in self.failed:
+                    self.stale[target] = (serialize, binary)
+                return
+            if after in self.failed:
+                # Se referiría a datos que no llegaron a disco: vale la última versión
+                # anterior al fallo, si se llegó a descartar
+                if target not in self.stale:
+                    return
+                serialize, binary = self.stale[target]
+            self.stale.pop(target, None)
+            write_atomic(target, serialize, binary, self.fsync)
+        elif kind == 'append':
+            if target in self.failed:
+                return  # anexar tras el fallo dejaría un hueco en el fichero
+            f = self.files.get(target)
+            if f is None:
+                f = self.files[target] = open(target, 'ab')
+            f.write(payload)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        elif kind == 'close':
+            for path in ([target] if target is not None else list(self.files)):
+                f = self.files.pop(path, None)
+                if f is not None:
+                    f.close()
+        elif kind == 'call':
+            target(*payload)
+
+    def pending(self):
+        return self.queue.unfinished_tasks
+
+    def flush(self):
+        """Espera a que se escriba todo lo encolado. Lanza el primer error de escritura."""
+        self.queue.join()
+        self.raise_errors()
+
+    def raise_errors(self):
+        if self.errors:
+            raise self.errors[0]
+
+    def close(self):
+        """Cierra los ficheros y para el hilo; después lanza el primer error de escritura."""
+        self.close_file()
+        self.queue.join()
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self.raise_errors()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
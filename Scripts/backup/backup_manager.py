@@ -1,23 +1,87 @@
 # Script para gestión de copias de seguridad
+import csv
 import json
 import os
 
-def save_partial_backup(all_data, backup_size):
+from backup.background_writer import write_atomic
+from backup.checkpoint_log import CheckpointLog, CHECKPOINT_PATH, load_checkpoint
+
+# Log de checkpoint compartido por el proceso (ver backup/checkpoint_log.py)
+_checkpoint = None
+
+def open_checkpoint(path=CHECKPOINT_PATH, reset=False, writer=None):
+    """
+    Abre el log de checkpoint JSONL del proceso. Con reset=True empieza uno vacío;
+    con writer (BackgroundWriter) las líneas se escriben en segundo plano.
+    """
+    global _checkpoint
+    if _checkpoint is None or _checkpoint.path != path or _checkpoint.writer is not writer:
+        close_checkpoint()
+        _checkpoint = CheckpointLog(path, writer=writer)
+    return _checkpoint.open(reset)
+
+def checkpoint_item(record):
+    """
+    Anexa un item (o sólo sus campos nuevos, con su 'ID') al log de checkpoint.
+    """
+    (_checkpoint or open_checkpoint()).append(record)
+
+def close_checkpoint():
+    global _checkpoint
+    if _checkpoint is not None:
+        _checkpoint.close()
+
+def compact_checkpoint(path=CHECKPOINT_PATH, output_dir='output'):
+    """
+    Convierte el log de checkpoint en la exportación final (items_all.json e items_all.csv).
     """
-    Guarda un backup parcial cada 'backup_size' items.
+    all_data = load_checkpoint(path)
+    save_outputs(all_data, output_dir)
+    print(f"[CHECKPOINT] Log compactado: {len(all_data)} items en {output_dir}")
+    return all_data
+
+def save_partial_backup(all_data, backup_size=None):
+    """
+    Compatibilidad con los scrapers antiguos: se llama tras añadir cada item y
+    anexa sólo el último al log de checkpoint (ya no reescribe toda la lista).
+    """
+    if all_data:
+        checkpoint_item(all_data[-1])
+
+def save_final_backup(all_data=None, backup_size=None):
+    """
+    Cierra el log de checkpoint al terminar el scraping.
     """
-    if len(all_data) % backup_size == 0 and len(all_data) > 0:
-        backup_filename = f'output/items_backup_{len(all_data)}.json'
-        with open(backup_filename, 'w', encoding='utf-8') as f:
-            json.dump(all_data, f, ensure_ascii=False, indent=2)
-        print(f"[BACKUP] Guardado backup parcial: {backup_filename} ({len(all_data)} items)")
+    close_checkpoint()
+    if _checkpoint is not None:
+        print(f"Final checkpoint saved: {_checkpoint.path} ({_checkpoint.count} records)")
 
-def save_final_backup(all_data, backup_size):
+def export_store(store, output_dir='output', **filters):
     """
-    Guarda el backup final al terminar el scraping.
+    Exporta el almacén SQLite (todo o filtrado por índice) a items_all.json e items_all.csv.
     """
-    if all_data and (len(all_data) % backup_size != 0):
-        backup_filename = f'output/items_backup_final.json'
-        with open(backup_filename, 'w', encoding='utf-8') as f:
-            json.dump(all_data[-(len(all_data)%backup_size or backup_size):], f, ensure_ascii=False, indent=2)
-        print(f"Final backup saved: {backup_filename} ({len(all_data) % backup_size or backup_size} records)")
+    all_data = store.items(**filters)
+    save_outputs(all_data, output_dir)
+    return all_data
+
+def save_outputs(all_data, output_dir='output', writer=None):
+    """
+    Guarda la exportación final (items_all.json e items_all.csv) con escritura
+    atómica: en disco siempre hay una versión completa. Con writer
+    (BackgroundWriter) la escritura se hace en segundo plano.
+    """
+    def write_json(f):
+        json.dump(all_data, f, ensure_ascii=False, indent=2)
+
+    def write_csv(f):
+        csv_writer = csv.DictWriter(f, fieldnames=all_data[0].keys())
+        csv_writer.writeheader()
+        csv_writer.writerows(all_data)
+
+    os.makedirs(output_dir, exist_ok=True)
+    snapshot = writer.write_snapshot if writer is not None else write_atomic
+    snapshot(os.path.join(output_dir, 'items_all.json'), write_json)
+    if all_data:
+        snapshot(os.path.join(output_dir, 'items_all.csv'), write_csv)
+    else:
+        print("No data to save.")
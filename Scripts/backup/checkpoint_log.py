@@ -0,0 +1,143 @@
+# Log de checkpoint JSONL de sólo anexado y su compactación
+# -*- coding: utf-8 -*-
+"""
+CheckpointLog
+-------------
+Sustituye los backups completos items_backup_N.json (que reescribían toda la
+lista cada 100 items) por un log JSONL en el que cada registro se escribe una
+sola vez, en una línea, y se vuelca a disco al momento. El coste de backup por
+item es constante con independencia del tamaño del catálogo.
+
+Cada línea es un registro con al menos 'ID'. Un registro posterior con el
+mismo ID se fusiona sobre el anterior, de modo que las etapas que terminan más
+tarde (por ejemplo la descripción) pueden anexar sólo los campos nuevos:
+
+    {"ID": "831", "Name": "...", "DescriptionSummary": ""}
+    {"ID": "831", "DescriptionSummary": "Height: 19.75 (50cm)"}
+
+backup_manager.compact_checkpoint() convierte el log en la exportación final
+(items_all.json / items_all.csv) en el orden en que apareció cada ID.
+
+El log lleva la cuenta de su tamaño en bytes y de un sha256 acumulado de su
+contenido (position()), que el manifiesto de checkpoint usa para reanudar
+exactamente desde el último item confirmado (backup/checkpoint_manifest.py).
+
+Con writer=BackgroundWriter las líneas se escriben desde el hilo de
+persistencia y append() no espera nunca al disco.
+"""
+import hashlib
+import json
+import os
+import threading
+
+CHECKPOINT_PATH = 'output/items_checkpoint.jsonl'
+
+
+class CheckpointLog:
+    def __init__(self, path=CHECKPOINT_PATH, fsync=False, writer=None):
+        self.path = path
+        self.fsync = fsync
+        self.writer = writer
+        self.count = 0
+        self.offset = 0
+        self.digest = hashlib.sha256()
+        self.is_open = False
+        self.file = None
+        # Las descripciones se anexan desde los hilos de DescriptionFetcher
+        self.lock = threading.Lock()
+
+    def open(self, reset=False):
+        """Abre el log para anexar. Con reset=True empieza un log vacío."""
+        if not self.is_open:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            if reset or not os.path.exists(self.path):
+                open(self.path, 'wb').close()
+            self.offset, self.digest = hash_prefix(self.path)
+            if self.writer is None:
+                self.file = open(self.path, 'ab')
+            self.is_open = True
+        return self
+
+    def append(self, record):
+        """Escribe un registro en una línea y lo vuelca a disco."""
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        with self.lock:
+            if not self.is_open:
+                self.open()
+            if self.writer is not None:
+                # Dentro del lock: el orden de la cola es el orden de offset/digest
+                self.writer.append(self.path, line)
+            else:
+                self.file.write(line)
+                self.file.flush()
+                if self.fsync:
+                    os.fsync(self.file.fileno())
+            self.count += 1
+            self.offset += len(line)
+            self.digest.update(line)
+
+    def position(self):
+        """(bytes escritos, sha256 hexadecimal del contenido) en un mismo instante."""
+        with self.lock:
+            return self.offset, self.digest.hexdigest()
+
+    def close(self):
+        with self.lock:
+            if self.writer is not None and self.is_open:
+                self.writer.close_file(self.path)
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            self.is_open = False
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def hash_prefix(path, size=None):
+    """Devuelve (bytes leídos, sha256) de los primeros `size` bytes del fichero (todo si None)."""
+    digest = hashlib.sha256()
+    read = 0
+    with open(path, 'rb') as f:
+        while size is None or read < size:
+            chunk = f.read(1 << 20 if size is None else min(1 << 20, size - read))
+            if not chunk:
+                break
+            digest.update(chunk)
+            read += len(chunk)
+    return read, digest
+
+
+def read_checkpoint(path=CHECKPOINT_PATH):
+    """
+    Recorre los registros del log. Una última línea incompleta (corte a mitad
+    de escritura) se ignora.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"[CHECKPOINT] Línea {number} incompleta en {path}, se ignora")
+
+
+def load_checkpoint(path=CHECKPOINT_PATH):
+    """Fusiona los registros del log por ID. Devuelve la lista de items en orden de aparición."""
+    items = {}
+    for record in read_checkpoint(path):
+        item_id = record.get('ID')
+        if item_id is None:
+            continue
+        if item_id in items:
+            items[item_id].update(record)
+        else:
+            items[item_id] = dict(record)
+    return list(items.values())
@@ -0,0 +1,145 @@
+# Manifiesto de checkpoint para reanudar desde el último item confirmado
+# -*- coding: utf-8 -*-
+"""
+CheckpointManifest
+------------------
+Guarda en output/checkpoint_manifest.json el cursor exacto de la extracción:
+
+- page / row: página y fila del listado del último item confirmado,
+- last_id y count: su ID y cuántos items hay confirmados hasta él,
+- log_offset / sha256: tamaño y hash del log de checkpoint JSONL en ese punto.
+
+Un item está confirmado cuando su línea está en el log y su descripción (que
+llega en segundo plano) también, o no la necesita. Como las descripciones
+terminan en cualquier orden, el cursor sólo avanza sobre el prefijo contiguo
+de items completos.
+
+Al reanudar se comprueba el hash del log hasta log_offset, se descarta lo
+escrito después y se recuperan los `count` primeros items: el scraper salta
+directamente a page y continúa en la fila siguiente con todo el conjunto de
+datos anterior, sin volver a recorrer las páginas ya extraídas.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from backup.background_writer import write_json_atomic
+from backup.checkpoint_log import CHECKPOINT_PATH, hash_prefix, load_checkpoint
+
+MANIFEST_PATH = 'output/checkpoint_manifest.json'
+
+
+def read_manifest(path=MANIFEST_PATH):
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ Manifiesto de checkpoint ilegible: {e}")
+        return None
+
+
+def write_manifest(manifest, path=MANIFEST_PATH, writer=None):
+    """
+    Escribe el manifiesto de forma atómica (fichero temporal, fsync y rename),
+    en segundo plano si se pasa writer: en la cola va detrás de las líneas del
+    log a las que se refiere, y no se escribe si alguna de ellas no llegó a disco.
+    """
+    if not path:
+        return
+    if writer is not None:
+        writer.write_json(path, manifest, after=manifest.get('log_path'))
+    else:
+        write_json_atomic(path, manifest)
+
+
+class CheckpointManifest:
+    def __init__(self, log, path=MANIFEST_PATH, cursor=None, count=0, writer=None):
+        self.log = log  # CheckpointLog del que se toman offset y hash
+        self.path = path
+        self.writer = writer
+        # Al reanudar se parte del cursor y del número de items ya confirmados
+        self.cursor = cursor
+        self.count = count
+        self.open_items = OrderedDict()  # ID -> [página, fila, completo] en orden de log
+        self.done_early = set()  # descripciones terminadas antes de track()
+        self.lock = threading.Lock()
+
+    def track(self, page, row, item_id, pending=False):
+        """Registra un item recién anexado al log; pending si falta su descripción."""
+        with self.lock:
+            done = not pending or item_id in self.done_early
+            self.done_early.discard(item_id)
+            self.open_items[item_id] = [page, row, done]
+            self._advance()
+
+    def complete(self, item_id):
+        """Marca como terminada la descripción de un item."""
+        with self.lock:
+            if item_id in self.open_items:
+                self.open_items[item_id][2] = True
+                self._advance()
+            else:
+                self.done_early.add(item_id)
+
+    def _advance(self):
+        advanced = False
+        while self.open_items:
+            item_id, (page, row, done) = next(iter(self.open_items.items()))
+            if not done:
+                break
+            self.open_items.popitem(last=False)
+            self.count += 1
+            self.cursor = {'page': page, 'row': row, 'last_id': item_id}
+            advanced = True
+        if advanced:
+            self.write()
+
+    def write(self, finished=False):
+        offset, sha256 = self.log.position()
+        manifest = dict(self.cursor or {}, count=self.count, log_path=self.log.path,
+                        log_offset=offset, sha256=sha256, finished=finished)
+        write_manifest(manifest, self.path, self.writer)
+
+    def finish(self):
+        """Marca la ejecución como completa: la siguiente empezará desde cero."""
+        with self.lock:
+            self.write(finished=True)
+
+
+def set_aside(log_path):
+    """Renombra un log que no se puede verificar a <log>.<fecha>.unverified."""
+    aside = f"{log_path}.{time.strftime('%Y%m%d-%H%M%S')}.unverified"
+    os.replace(log_path, aside)
+    return aside
+
+
+def resume_checkpoint(path=MANIFEST_PATH, log_path=CHECKPOINT_PATH):
+    """
+    Comprueba el manifiesto contra el log. Devuelve (items confirmados, cursor)
+    o None si no hay nada que reanudar (sin manifiesto, ejecución terminada o
+    log que no coincide con el hash).
+    """
+    manifest = read_manifest(path)
+    if not manifest or manifest.get('finished') or not manifest.get('count'):
+        return None
+    if not os.path.exists(log_path):
+        print(f"⚠️ No existe el log de checkpoint {log_path}, no se puede reanudar")
+        return None
+    size, digest = hash_prefix(log_path, manifest['log_offset'])
+    if size != manifest['log_offset'] or digest.hexdigest() != manifest['sha256']:
+        # Se aparta en lugar de dejar que la ejecución nueva lo vacíe
+        aside = set_aside(log_path)
+        print(f"⚠️ El log de checkpoint no coincide con el manifiesto, no se puede reanudar "
+              f"(guardado como {aside})")
+        return None
+    # Lo escrito después del último item confirmado se descarta y se vuelve a extraer
+    os.truncate(log_path, manifest['log_offset'])
+    all_data = load_checkpoint(log_path)[:manifest['count']]
+    cursor = {key: manifest[key] for key in ('page', 'row', 'last_id')}
+    print(f"📂 Reanudando desde la página {cursor['page']}, fila {cursor['row']} "
+          f"(último ID {cursor['last_id']}, {len(all_data)} items)")
+    return all_data, cursor
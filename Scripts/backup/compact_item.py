@@ -0,0 +1,131 @@
+# Representación compacta en memoria de los items (slots, cadenas internadas)
+# -*- coding: utf-8 -*-
+"""
+CompactItem
+-----------
+Un item extraído es un dict de 10 claves en el que casi todo se repite:
+Category, Status, Featured, Pictures, Price y Updated toman pocos valores
+distintos
+y todas las ImageLinks de un item comparten el prefijo
+https://file.4pm.ie/<dir>/.
+
+CompactItem guarda lo mismo en una clase con __slots__ (sin dict por
+instancia):
+
+- Esos campos se internan con sys.intern, así que miles de items comparten
+  una sola copia de cada valor.
+- ImageLinks se guarda como el prefijo común (internado) más los nombres de
+  fichero en una sola cadena.
+
+to_dict() devuelve exactamente el dict original (mismas claves y orden), y el
+acceso item['ID'], item.get(...) y `in` funciona como en un dict para el código
+que sólo lee los items (modo incremental, diffs entre instantáneas).
+"""
+import os
+import sys
+
+from backup.item_store import FIELDS
+
+IMAGE_HOST = 'https://file.4pm.ie/'
+INTERNED_FIELDS = ('Category', 'Pictures', 'Price', 'Featured', 'Status', 'Updated')
+
+
+def split_links(links):
+    """
+    ['https://file.4pm.ie/843/a.jpg', 'https://file.4pm.ie/843/b.jpg']
+    -> ('https://file.4pm.ie/843/', 'a.jpg\nb.jpg'): prefijo internado y una sola
+    cadena con los nombres (una cadena pesa menos que una tupla de cadenas).
+    """
+    if not links:
+        return '', None
+    prefix = os.path.commonprefix(links)
+    prefix = prefix[:prefix.rfind('/') + 1]
+    if not prefix.startswith(IMAGE_HOST) or any('\n' in link for link in links):
+        return '', tuple(links)
+    return sys.intern(prefix), '\n'.join(link[len(prefix):] for link in links)
+
+
+class CompactItem:
+    __slots__ = ('ID', 'Name', 'Category', 'Pictures', 'Price', 'Featured', 'Status',
+                 'Updated', 'image_prefix', 'image_names', 'DescriptionSummary', 'extra')
+
+    @classmethod
+    def from_dict(cls, item):
+        self = cls.__new__(cls)
+        for field in FIELDS:
+            if field != 'ImageLinks':
+                value = item.get(field)
+                if field in INTERNED_FIELDS and isinstance(value, str):
+                    value = sys.intern(value)
+                setattr(self, field, value)
+        links = item.get('ImageLinks')
+        if isinstance(links, list):
+            self.image_prefix, self.image_names = split_links(links)
+        else:
+            # Ausente (None) o texto sin parsear (CSV): se conserva tal cual
+            self.image_prefix, self.image_names = None, links
+        # Claves fuera de FIELDS, o un orden distinto, se conservan para to_dict()
+        keys = tuple(item)
+        if keys != FIELDS[:len(keys)] or any(item[key] is None for key in keys):
+            self.extra = {key: item[key] for key in keys if key not in FIELDS or item[key] is None}
+            self.extra['__keys__'] = keys
+        else:
+            self.extra = None
+        return self
+
+    @property
+    def ImageLinks(self):
+        if self.image_prefix is None:
+            return self.image_names
+        if self.image_names is None:
+            return []
+        if isinstance(self.image_names, tuple):
+            return list(self.image_names)
+        return [self.image_prefix + name for name in self.image_names.split('\n')]
+
+    def keys(self):
+        if self.extra is not None:
+            return self.extra['__keys__']
+        return tuple(field for field in FIELDS if self._get(field) is not None)
+
+    def _get(self, key):
+        if key in FIELDS:
+            return getattr(self, key)
+        return None
+
+    def __getitem__(self, key):
+        if self.extra is not None and key in self.extra and key != '__keys__':
+            return self.extra[key]
+        if key not in self.keys():
+            raise KeyError(key)
+        return self._get(key)
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        """El item con la forma original del dict (mismas claves, mismo orden)."""
+        return {key: self[key] for key in self.keys()}
+
+    def __eq__(self, other):
+        if isinstance(other, CompactItem):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return f'CompactItem({self.to_dict()!r})'
+
+
+def compact_items(items):
+    """Lista de CompactItem a partir de dicts (o cualquier iterable de dicts)."""
+    return [CompactItem.from_dict(item) for item in items]
+
+
+def to_dicts(items):
+    return [item.to_dict() for item in items]
@@ -0,0 +1,210 @@
+# Almacén SQLite de items con upserts e índices secundarios
+# -*- coding: utf-8 -*-
+"""
+ItemStore
+---------
+Almacén embebido (SQLite, output/items.db) para los items extraídos, en lugar
+de listas en memoria y ficheros JSON que cada consumidor relee completos.
+
+- ID es la clave primaria y upsert() inserta o actualiza: un registro parcial
+  (p. ej. {'ID', 'DescriptionSummary'}) sólo modifica sus columnas.
+- Índices sobre Category, Status, Updated y Price. Updated (dd/mm/yyyy) y Price
+  (€23,500.00) se guardan además normalizados (updated_iso, price_value) para
+  que los filtros por fecha y por precio sean consultas por índice.
+- items() devuelve los items con la forma de siempre (ImageLinks como lista)
+  en el orden en que se insertaron, con filtros opcionales.
+
+load_items() permite a los scripts de data_processing leer indistintamente un
+JSON exportado o el almacén (.db).
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+STORE_PATH = 'output/items.db'
+FIELDS = ('ID', 'Name', 'Category', 'Pictures', 'Price', 'Featured', 'Status', 'Updated',
+          'ImageLinks', 'DescriptionSummary')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    ID TEXT PRIMARY KEY,
+    Name TEXT DEFAULT '',
+    Category TEXT DEFAULT '',
+    Pictures TEXT DEFAULT '',
+    Price TEXT DEFAULT '',
+    Featured TEXT DEFAULT '',
+    Status TEXT DEFAULT '',
+    Updated TEXT DEFAULT '',
+    ImageLinks TEXT DEFAULT '[]',
+    DescriptionSummary TEXT DEFAULT '',
+    updated_iso TEXT,
+    price_value REAL
+);
+CREATE INDEX IF NOT EXISTS idx_items_category ON items (Category);
+CREATE INDEX IF NOT EXISTS idx_items_status ON items (Status);
+CREATE INDEX IF NOT EXISTS idx_items_updated ON items (updated_iso);
+CREATE INDEX IF NOT EXISTS idx_items_price ON items (price_value);
+"""
+
+
+def parse_updated(value):
+    """'08/11/2016' -> '2016-11-08'; None si no es una fecha dd/mm/yyyy."""
+    try:
+        return datetime.strptime(str(value).strip(), '%d/%m/%Y').strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def parse_price(value):
+    """'€23,500.00' -> 23500.0; None si no es un precio."""
+    text = str(value).replace('€', '').replace(',', '').strip()
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _to_row(record):
+    row = {field: record[field] for field in FIELDS if field in record}
+    row['ID'] = str(record['ID'])
+    if 'ImageLinks' in row:
+        row['ImageLinks'] = json.dumps(row['ImageLinks'] or [], ensure_ascii=False)
+    if 'Updated' in row:
+        row['updated_iso'] = parse_updated(row['Updated'])
+    if 'Price' in row:
+        row['price_value'] = parse_price(row['Price'])
+    return row
+
+
+def _to_item(row):
+    item = {field: row[field] for field in FIELDS}
+    item['ImageLinks'] = json.loads(item['ImageLinks'] or '[]')
+    return item
+
+
+class ItemStore:
+    def __init__(self, path=STORE_PATH, commit_every=100):
+        self.path = path
+        self.commit_every = commit_every
+        self.pending = 0
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Las descripciones llegan desde los hilos de DescriptionFetcher
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        if path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    # --- Escritura ----------------------------------------------------------
+
+    def upsert(self, record):
+        """Inserta el item o actualiza sólo las columnas presentes en record."""
+        row = _to_row(record)
+        columns = list(row)
+        updates = ', '.join(f'{c} = excluded.{c}' for c in columns if c != 'ID')
+        sql = (f"INSERT INTO items ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+               f"ON CONFLICT(ID) DO " + (f"UPDATE SET {updates}" if updates else "NOTHING"))
+        with self.lock:
+            self.conn.execute(sql, [row[c] for c in columns])
+            self.pending += 1
+            if self.pending >= self.commit_every:
+                self.conn.commit()
+                self.pending = 0
+
+    def upsert_many(self, records):
+        for record in records:
+            self.upsert(record)
+        self.commit()
+
+    def delete(self, item_id):
+        with self.lock:
+            self.conn.execute('DELETE FROM items WHERE ID = ?', (str(item_id),))
+
+    def commit(self):
+        with self.lock:
+            self.conn.commit()
+            self.pending = 0
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- Consultas ----------------------------------------------------------
+
+    def __contains__(self, item_id):
+        with self.lock:
+            return self.conn.execute('SELECT 1 FROM items WHERE ID = ?', (str(item_id),)).fetchone() is not None
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+
+    def get(self, item_id):
+        with self.lock:
+            row = self.conn.execute('SELECT * FROM items WHERE ID = ?', (str(item_id),)).fetchone()
+        return _to_item(row) if row else None
+
+    def ids(self):
+        with self.lock:
+            return {row[0] for row in self.conn.execute('SELECT ID FROM items')}
+
+    def items(self, category=None, status=None, updated_since=None, min_price=None, max_price=None):
+        """
+        Items en orden de inserción, filtrados por índice. updated_since admite
+        'dd/mm/yyyy' o 'yyyy-mm-dd'.
+        """
+        where, params = [], []
+        if category is not None:
+            where.append('Category = ?')
+            params.append(category)
+        if status is not None:
+            where.append('Status = ?')
+            params.append(str(status))
+        if updated_since is not None:
+            where.append('updated_iso >= ?')
+            params.append(parse_updated(updated_since) or updated_since)
+        if min_price is not None:
+            where.append('price_value >= ?')
+            params.append(min_price)
+        if max_price is not None:
+            where.append('price_value <= ?')
+            params.append(max_price)
+        sql = 'SELECT * FROM items' + (' WHERE ' + ' AND '.join(where) if where else '') + ' ORDER BY rowid'
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [_to_item(row) for row in rows]
+
+
+def load_items(path, **filters):
+    """
+    Lee items de un JSON exportado o de un almacén SQLite (.db). Los filtros
+    (los de ItemStore.items) sólo se aplican al almacén.
+    """
+    if path.endswith('.db'):
+        with ItemStore(path) as store:
+            return store.items(**filters)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def import_json(json_path, store_path=STORE_PATH):
+    """Carga una exportación items_all.json existente en el almacén."""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    with ItemStore(store_path) as store:
+        store.upsert_many(data)
+        print(f"[STORE] {len(data)} items importados en {store_path} ({len(store)} en total)")
+
+
+if __name__ == "__main__":
+    import_json('output/items_all.json')
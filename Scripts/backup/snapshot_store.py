@@ -0,0 +1,221 @@
+# Almacén de instantáneas deduplicado por contenido (chunks de registros)
+# -*- coding: utf-8 -*-
+"""
+SnapshotStore
+-------------
+Sustituye las copias casi idénticas (items_backup_100/200/300.json,
+"items_all_1_11 copy.csv", "items_all_1_11 copy 2.csv"...) por un único
+almacén en output/snapshots/:
+
+- chunks/ab/<sha256>: grupos de registros (una línea JSON por registro,
+  comprimidos con zlib) direccionados por el hash de su contenido. Cada chunk
+  se guarda una sola vez aunque aparezca en muchas instantáneas.
+- snapshots/<nombre>.json: manifiesto de cada instantánea con la lista
+  ordenada de chunks, el formato de origen (json/csv), las columnas y el hash
+  del fichero original.
+
+Los cortes entre chunks dependen del contenido de los registros (un registro
+cierra chunk si su hash cae en 1 de cada CHUNK_AVG), no de su posición: un item
+insertado o modificado sólo cambia el chunk en el que cae y el resto se
+reutiliza. Escribir una instantánea sólo escribe los chunks nuevos, así que el
+disco crece con los cambios y no con el número de copias.
+"""
+import csv
+import hashlib
+import json
+import os
+import sys
+import zlib
+from datetime import datetime
+
+from backup.background_writer import write_atomic, write_json_atomic
+
+SNAPSHOT_DIR = 'output/snapshots'
+CHUNK_AVG = 32  # registros por chunk en promedio
+CHUNK_MAX = 256
+
+
+def record_line(record):
+    """Serialización canónica de un registro (respeta el orden de sus campos)."""
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def split_chunks(records):
+    """Agrupa las líneas de los registros en chunks con cortes definidos por contenido."""
+    chunk = []
+    for record in records:
+        line = record_line(record)
+        chunk.append(line)
+        boundary = int.from_bytes(hashlib.sha256(line).digest()[:4], 'big') % CHUNK_AVG == 0
+        if boundary or len(chunk) >= CHUNK_MAX:
+            yield b''.join(chunk)
+            chunk = []
+    if chunk:
+        yield b''.join(chunk)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_dataset(path):
+    """Registros y metadatos (formato, columnas, fin de línea) de un .json o .csv."""
+    if path.endswith('.csv'):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            first = f.readline()
+            f.seek(0)
+            reader = csv.DictReader(f)
+            records = list(reader)
+            fields = reader.fieldnames
+        newline = '\r\n' if first.endswith('\r\n') else '\n'
+        return records, {'format': 'csv', 'fields': fields, 'newline': newline}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f), {'format': 'json'}
+
+
+class SnapshotStore:
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = root
+        self.chunk_dir = os.path.join(root, 'chunks')
+        self.manifest_dir = os.path.join(root, 'snapshots')
+        os.makedirs(self.chunk_dir, exist_ok=True)
+        os.makedirs(self.manifest_dir, exist_ok=True)
+
+    # --- Chunks ---------------------------------------------------------------
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.chunk_dir, digest[:2], digest)
+
+    def _put_chunk(self, data):
+        """Guarda un chunk si no existe. Devuelve (hash, bytes escritos)."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        compressed = zlib.compress(data, 6)
+        write_atomic(path, lambda f: f.write(compressed), binary=True)
+        return digest, len(compressed)
+
+    def _get_chunk(self, digest):
+        with open(self._chunk_path(digest), 'rb') as f:
+            data = zlib.decompress(f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk corrupto: {digest}")
+        return data
+
+    # --- Instantáneas ---------------------------------------------------------
+
+    def _manifest_path(self, name):
+        return os.path.join(self.manifest_dir, f'{name}.json')
+
+    def put(self, records, name=None, **meta):
+        """
+        Guarda una instantánea de `records` (lista de dicts). Sólo escribe los
+        chunks que no estaban ya en el almacén. Devuelve el manifiesto.
+        """
+        name = name or datetime.now().strftime('%Y%m%d-%H%M%S')
+        chunks, count, written, new_chunks = [], 0, 0, 0
+        for data in split_chunks(records):
+            digest, size = self._put_chunk(data)
+            chunks.append(digest)
+            count += data.count(b'\n')
+            written += size
+            new_chunks += size > 0
+        manifest = dict(meta, name=name, created=datetime.now().isoformat(timespec='seconds'),
+                        count=count, chunks=chunks)
+        write_json_atomic(self._manifest_path(name), manifest)
+        print(f"[SNAPSHOT] {name}: {count} registros, {len(chunks)} chunks "
+              f"({new_chunks} nuevos, {written / 1024:.1f} KB escritos)")
+        return manifest
+
+    def import_file(self, path, name=None):
+        """Guarda un .json o .csv existente como instantánea (por defecto con su nombre de fichero)."""
+        records, meta = read_dataset(path)
+        name = name or os.path.basename(path)
+        return self.put(records, name, source=path, sha256=file_sha256(path), **meta)
+
+    def manifest(self, name):
+        with open(self._manifest_path(name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def names(self):
+        return sorted(n[:-len('.json')] for n in os.listdir(self.manifest_dir)
+                      if n.endswith('.json'))
+
+    def iter_records(self, name):
+        for digest in self.manifest(name)['chunks']:
+            for line in self._get_chunk(digest).splitlines():
+                yield json.loads(line)
+
+    def get(self, name):
+        """Reconstruye la lista de registros de una instantánea."""
+        return list(self.iter_records(name))
+
+    def restore(self, name, path):
+        """
+        Reconstruye el fichero de una instantánea en su formato original
+        (JSON con indent=2 o CSV con las mismas columnas) y comprueba su hash.
+        """
+        manifest = self.manifest(name)
+        records = self.iter_records(name)
+        if manifest.get('format') == 'csv':
+            def serialize(f):
+                if not manifest['fields']:
+                    return  # CSV vacío
+                writer = csv.DictWriter(f, fieldnames=manifest['fields'],
+                                        lineterminator=manifest.get('newline', '\n'))
+                writer.writeheader()
+                writer.writerows(records)
+        else:
+            def serialize(f):
+                json.dump(list(records), f, ensure_ascii=False, indent=2)
+        write_atomic(path, serialize)
+        if manifest.get('sha256') and file_sha256(path) != manifest['sha256']:
+            print(f"⚠️ {path}: mismos registros que {name}, pero el fichero no es idéntico byte a byte")
+        return path
+
+    def delete(self, name):
+        os.remove(self._manifest_path(name))
+
+    def gc(self):
+        """Borra los chunks que ya no usa ninguna instantánea. Devuelve cuántos."""
+        used = set()
+        for name in self.names():
+            used.update(self.manifest(name)['chunks'])
+        removed = 0
+        for directory, _, files in os.walk(self.chunk_dir):
+            for digest in files:
+                if digest not in used:
+                    os.remove(os.path.join(directory, digest))
+                    removed += 1
+        return removed
+
+    def disk_usage(self):
+        total = 0
+        for directory, _, files in os.walk(self.root):
+            total += sum(os.path.getsize(os.path.join(directory, n)) for n in files)
+        return total
+
+
+if __name__ == "__main__":
+    # python -m backup.snapshot_store import output/items_backup_*.json
+    # python -m backup.snapshot_store restore items_backup_100.json restored.json
+    # python -m backup.snapshot_store list
+    store = SnapshotStore()
+    command, args = (sys.argv[1], sys.argv[2:]) if len(sys.argv) > 1 else ('list', [])
+    if command == 'import':
+        for source in args:
+            store.import_file(source)
+        print(f"[SNAPSHOT] Almacén: {store.disk_usage() / 1024:.1f} KB en {store.root}")
+    elif command == 'restore':
+        print(f"[SNAPSHOT] Restaurado: {store.restore(args[0], args[1])}")
+    elif command == 'gc':
+        print(f"[SNAPSHOT] Chunks eliminados: {store.gc()}")
+    else:
+        for name in store.names():
+            manifest = store.manifest(name)
+            print(f"{name}\t{manifest['count']} registros\t{len(manifest['chunks'])} chunks")
@@ -0,0 +1,251 @@
+# Exportación final en streaming (JSON array y CSV escritos item a item)
+# -*- coding: utf-8 -*-
+"""
+StreamingExport
+---------------
+Escribe items_all.json e items_all.csv a medida que se extraen los items, en
+lugar de acumular todo el catálogo en memoria para volcarlo al final:
+
+- JsonArrayWriter: array JSON con el mismo formato que json.dump(..., indent=2),
+  un item cada vez.
+- CsvStreamWriter: CSV con las columnas del primer item.
+- StreamingExport: los dos a la vez, conservando el orden del listado aunque
+  las descripciones lleguen en segundo plano y en cualquier orden. Sólo se
+  retienen los items cuya descripción está pendiente.
+
+Cada fichero se escribe en <ruta>.part y se renombra al cerrarlo, así que el
+fichero anterior sigue completo durante la ejecución. close() cierra el array
+y renombra también tras KeyboardInterrupt o un error (úsese en un finally o
+como context manager).
+
+iter_json_array() lee un array JSON elemento a elemento sin cargarlo entero;
+scan_json_array() da además la posición en bytes de cada elemento.
+"""
+import csv
+import json
+import os
+import re
+import threading
+from collections import deque
+
+
+_encode_str = json.encoder.encode_basestring  # versión en C cuando está disponible
+
+
+def _flat_element(item):
+    """
+    indent=2 para un item plano (valores texto o listas de texto) sin pasar
+    por el codificador con sangría de json, que es Python puro y mucho más lento.
+    None si el item no es plano.
+    """
+    lines = []
+    for key, value in item.items():
+        if not isinstance(key, str):
+            return None
+        if isinstance(value, str):
+            text = _encode_str(value)
+        elif isinstance(value, list) and all(isinstance(v, str) for v in value):
+            text = ('[\n      ' + ',\n      '.join(map(_encode_str, value)) + '\n    ]') if value else '[]'
+        else:
+            return None
+        lines.append(f'    {_encode_str(key)}: {text}')
+    return '{\n' + ',\n'.join(lines) + '\n  }' if lines else '{}'
+
+
+def array_element(item, first):
+    """Texto de un elemento tal como lo escribe json.dump(lista, indent=2, ensure_ascii=False)."""
+    text = _flat_element(item) if isinstance(item, dict) else None
+    if text is None:
+        text = json.dumps(item, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+    return ('[\n  ' if first else ',\n  ') + text
+
+
+def array_end(count):
+    return '\n]' if count else '[]'
+
+
+class JsonArrayWriter:
+    def __init__(self, path, fsync=True):
+        self.path = path
+        self.tmp_path = f'{path}.part'
+        self.fsync = fsync
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.f = open(self.tmp_path, 'w', encoding='utf-8', newline='')
+
+    def write(self, item):
+        self.f.write(array_element(item, self.count == 0))
+        self.count += 1
+
+    def close(self):
+        if self.f is None:
+            return
+        self.f.write(array_end(self.count))
+        _finalise(self.f, self.tmp_path, self.path, self.fsync)
+        self.f = None
+
+
+class CsvStreamWriter:
+    def __init__(self, path, fieldnames=None, fsync=True):
+        self.path = path
+        self.tmp_path = f'{path}.part'
+        self.fieldnames = fieldnames
+        self.fsync = fsync
+        self.count = 0
+        self.f = None
+        self.writer = None
+
+    def write(self, item):
+        if self.writer is None:
+            # Se abre con el primer item: sin datos no se genera CSV
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self.f = open(self.tmp_path, 'w', encoding='utf-8', newline='')
+            self.writer = csv.DictWriter(self.f, fieldnames=self.fieldnames or list(item.keys()))
+            self.writer.writeheader()
+        self.writer.writerow(item)
+        self.count += 1
+
+    def close(self):
+        if self.f is None:
+            return
+        _finalise(self.f, self.tmp_path, self.path, self.fsync)
+        self.f = None
+
+
+def _finalise(f, tmp_path, path, fsync):
+    f.flush()
+    if fsync:
+        os.fsync(f.fileno())
+    f.close()
+    os.replace(tmp_path, path)
+
+
+class StreamingExport:
+    def __init__(self, output_dir='output', fsync=True):
+        self.json_path = os.path.join(output_dir, 'items_all.json')
+        self.csv_path = os.path.join(output_dir, 'items_all.csv')
+        self.json_writer = JsonArrayWriter(self.json_path, fsync)
+        self.csv_writer = CsvStreamWriter(self.csv_path, fsync=fsync)
+        self.waiting = deque()  # [item, completo] aún sin escribir, en orden
+        self.pending = {}  # ID -> entrada de waiting cuya descripción falta
+        self.done_early = set()  # descripciones terminadas antes de add()
+        self.last_id = None
+        self.closed = False
+        self.lock = threading.Lock()
+
+    @property
+    def count(self):
+        return self.json_writer.count
+
+    def add(self, item, pending=False):
+        """Añade un item; con pending=True se escribe cuando llegue su descripción."""
+        with self.lock:
+            item_id = item['ID']
+            entry = [item, not pending or item_id in self.done_early]
+            self.done_early.discard(item_id)
+            if not entry[1]:
+                self.pending[item_id] = entry
+            self.waiting.append(entry)
+            self._drain()
+
+    def complete(self, item_id):
+        """Marca como terminada la descripción de un item."""
+        with self.lock:
+            entry = self.pending.pop(item_id, None)
+            if entry is not None:
+                entry[1] = True
+                self._drain()
+            else:
+                self.done_early.add(item_id)
+
+    def _drain(self, force=False):
+        while self.waiting:
+            item, done = self.waiting[0]
+            if not done and not force:
+                break
+            self.waiting.popleft()
+            self.json_writer.write(item)
+            self.csv_writer.write(item)
+            self.last_id = item['ID']
+
+    def close(self):
+        """Escribe lo que quede (con la descripción que tenga) y cierra los dos ficheros."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            try:
+                self._drain(force=True)
+            finally:
+                self.json_writer.close()
+                self.csv_writer.close()
+        if self.count:
+            print(f"[EXPORT] {self.count} items en {self.json_path} y {self.csv_path}")
+        else:
+            print("No data to save.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def scan_json_array(path, block_size=1 << 16, offsets=True):
+    """
+    Recorre un array JSON por bloques y devuelve (offset, longitud, elemento)
+    con la posición en bytes de cada elemento dentro del fichero (None, None
+    con offsets=False, que evita recodificar el texto).
+    """
+    decoder = json.JSONDecoder()
+    whitespace = re.compile(r'\s*')
+    with open(path, 'r', encoding='utf-8') as f:
+        # buffer[pos:] es lo pendiente; offset es la posición en bytes de buffer[pos]
+        buffer, pos, offset, eof, started = '', 0, 0, False, False
+
+        def advance(end):
+            nonlocal pos, offset
+            if offsets:
+                offset += len(buffer[pos:end].encode('utf-8'))
+            pos = end
+
+        while True:
+            advance(whitespace.match(buffer, pos).end())
+            if pos == len(buffer) and not eof:
+                buffer, pos = f.read(block_size), 0
+                eof = not buffer
+                continue
+            if not started:
+                if not buffer.startswith('[', pos):
+                    raise ValueError(f"{path} no es un array JSON")
+                advance(pos + 1)
+                started = True
+                continue
+            if buffer.startswith(']', pos):
+                return
+            if buffer.startswith(',', pos):
+                advance(pos + 1)
+                continue
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                if end == len(buffer) and not eof:
+                    raise json.JSONDecodeError('Elemento al final del bloque', buffer, end)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                block = f.read(block_size)
+                buffer, pos = buffer[pos:] + block, 0
+                eof = not block
+                continue
+            start = offset
+            advance(end)
+            if offsets:
+                yield start, offset - start, value
+            else:
+                yield None, None, value
+
+
+def iter_json_array(path, block_size=1 << 16):
+    """Itera los elementos de un array JSON leyendo el fichero por bloques."""
+    for _, _, value in scan_json_array(path, block_size, offsets=False):
+        yield value
@@ -1,31 +1,159 @@
 import csv
+import io
+import mmap
+import os
 import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Caracteres raros que se eliminan del Name
+UNWANTED = re.compile(r'[^\w\s.,;:()\-\'\"]+')
+# Separadores que siguen al prefijo de ID
+PREFIX_TRAILER = re.compile(r'[\s,-]*')
+# Separador para limpiar una columna entera con una sola sustitución; es \s,
+# así que UNWANTED no lo toca
+SEPARATOR = '\x1f'
+BATCH_SIZE = 10000
+CHUNK_SIZE = 8 * 1024 * 1024  # bytes por chunk en el modo paralelo
+
+def strip_id_prefix(name, id_value):
+    """
+    Igual que re.sub(rf'^"?{re.escape(id_value)}[\s,-]*', '', name), pero sin
+    construir y compilar un patrón distinto en cada fila.
+    """
+    if name.startswith('"' + id_value):
+        start = len(id_value) + 1
+    elif name.startswith(id_value):
+        start = len(id_value)
+    else:
+        return name
+    return name[PREFIX_TRAILER.match(name, start).end():]
 
 def clean_name(name, id_value):
     """
     Elimina el prefijo de ID del Name y caracteres raros.
     Ejemplo: 'M178 Pair of Framed...' -> 'Pair of Framed...'
     """
-    pattern = rf'^"?{re.escape(id_value)}[\s,-]*'
-    name = re.sub(pattern, '', name)
-    name = re.sub(r'[^\w\s.,;:()\-\'\"]+', '', name)
-    return name.strip()
+    return UNWANTED.sub('', strip_id_prefix(name, id_value)).strip()
+
+def clean_names(names, ids):
+    """
+    Versión por lotes de clean_name: quita los prefijos y después limpia toda la
+    columna con una sola sustitución sobre los nombres unidos por SEPARATOR.
+    """
+    names = [strip_id_prefix(name, id_value) for name, id_value in zip(names, ids)]
+    if any(SEPARATOR in name for name in names):
+        return [UNWANTED.sub('', name).strip() for name in names]
+    return [name.strip() for name in UNWANTED.sub('', SEPARATOR.join(names)).split(SEPARATOR)]
+
+def clean_rows(rows):
+    """Limpia en bloque la columna Name (row[1]) de las filas con al menos dos columnas."""
+    targets = [row for row in rows if row and len(row) >= 2]
+    for row, cleaned in zip(targets, clean_names([row[1] for row in targets], [row[0] for row in targets])):
+        row[1] = cleaned
+    return rows
 
-def process_csv(input_path, output_path):
+def process_csv(input_path, output_path, batch_size=BATCH_SIZE):
+    """Limpia la columna Name del CSV por lotes de batch_size filas."""
     with open(input_path, 'r', encoding='utf-8') as infile, open(output_path, 'w', newline='', encoding='utf-8') as outfile:
         reader = csv.reader(infile)
         writer = csv.writer(outfile)
+        batch = []
         for row in reader:
-            if not row or len(row) < 2:
-                writer.writerow(row)
-                continue
-            id_value = row[0]
-            name_value = row[1]
-            cleaned_name = clean_name(name_value, id_value)
-            row[1] = cleaned_name
-            writer.writerow(row)
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.writerows(clean_rows(batch))
+                batch = []
+        writer.writerows(clean_rows(batch))
+
+def chunk_boundaries(input_path, chunk_size=CHUNK_SIZE):
+    """
+    Corta el fichero en rangos de bytes de ~chunk_size que terminan en un fin de
+    línea fuera de comillas: el número de comillas hasta el corte es par, así
+    que ningún campo multilínea queda partido entre dos chunks.
+    """
+    size = os.path.getsize(input_path)
+    if size == 0:
+        return []
+    boundaries, start = [], 0
+    with open(input_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        position, odd = 0, False  # comillas impares entre start y position
+        while start < size:
+            target = start + chunk_size
+            if target >= size:
+                boundaries.append((start, size))
+                break
+            odd ^= data[position:target].count(b'"') & 1
+            position = target
+            while True:
+                newline = data.find(b'\n', position)
+                if newline < 0:
+                    position = size
+                    break
+                odd ^= data[position:newline].count(b'"') & 1
+                position = newline + 1
+                if not odd:
+                    break
+            boundaries.append((start, position))
+            start = position
+    return boundaries
+
+def clean_chunk(input_path, start, end):
+    """Limpia un rango de bytes del CSV en un proceso del pool. Devuelve el CSV limpio en bytes."""
+    with open(input_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # Mismo modo que process_csv: texto con saltos de línea universales
+    infile = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8')
+    outfile = io.StringIO(newline='')
+    # strict=True da el mismo resultado que el lector normal, pero lanza csv.Error si
+    # el chunk termina dentro de un campo entre comillas (un corte mal colocado)
+    reader = csv.reader(infile, strict=True)
+    writer = csv.writer(outfile)
+    batch = []
+    for row in reader:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            writer.writerows(clean_rows(batch))
+            batch = []
+    writer.writerows(clean_rows(batch))
+    return outfile.getvalue().encode('utf-8')
+
+def process_csv_parallel(input_path, output_path, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    process_csv en paralelo: el CSV se corta en chunks por bytes
+    (chunk_boundaries), cada proceso del pool limpia el suyo y la salida se
+    escribe en el orden original. Como mucho hay 2 chunks por worker en vuelo.
+    El resultado es idéntico byte a byte al de process_csv: si una comilla
+    suelta fuera de un campo entrecomillado descoloca los cortes, el chunk
+    anterior al primer corte erróneo termina dentro de comillas, el lector
+    estricto lo detecta y se repite todo en un solo proceso.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = chunk_boundaries(input_path, chunk_size)
+    if len(chunks) <= 1 or workers == 1:
+        process_csv(input_path, output_path)
+        return
+    print(f"[CLEAN] {len(chunks)} chunks en {workers} procesos")
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor, open(output_path, 'wb') as outfile:
+            in_flight = deque()
+            for start, end in chunks:
+                in_flight.append(executor.submit(clean_chunk, input_path, start, end))
+                if len(in_flight) >= workers * 2:
+                    outfile.write(in_flight.popleft().result())
+            while in_flight:
+                outfile.write(in_flight.popleft().result())
+    except csv.Error as e:
+        print(f"[CLEAN] Cortes no válidos ({e}), se procesa en un solo proceso")
+        process_csv(input_path, output_path)
 
 if __name__ == "__main__":
+    # python clean_csv_name_column.py [--parallel]
     input_csv = "CSV_FILES/items_all_.csv"
     output_csv = "CSV_FILES/items_all__clean.csv"
-    process_csv(input_csv, output_csv)
+    if '--parallel' in sys.argv:
+        process_csv_parallel(input_csv, output_csv)
+    else:
+        process_csv(input_csv, output_csv)
@@ -0,0 +1,120 @@
+# Exportación columnar (Parquet / Arrow IPC) del catálogo con columnas tipadas
+# -*- coding: utf-8 -*-
+"""
+columnar_export
+---------------
+Convierte el catálogo (items_all.json, el almacén SQLite .db o los CSV de
+CSV_FILES/) en una tabla Arrow con tipos reales en lugar de texto:
+
+    ID string, Name string, Category dictionary<string>, Pictures int32,
+    Price decimal128(12, 2), Featured bool, Status dictionary<string>,
+    Updated date32, ImageLinks list<string>, DescriptionSummary string
+
+y la guarda como Parquet (comprimido) o Arrow IPC (mapeable en memoria). Los
+trabajos posteriores leen sólo las columnas que necesitan con read_columns()
+en lugar de parsear todo el CSV con listas de Python incrustadas como texto.
+"""
+import csv
+import os
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from backup.item_store import load_items
+from backup.stream_export import iter_json_array
+from data_processing.csv_to_json import parse_image_links
+from data_processing.value_parsers import parse_featured, parse_pictures, parse_price, parse_updated
+
+SCHEMA = pa.schema([
+    ('ID', pa.string()),
+    ('Name', pa.string()),
+    ('Category', pa.dictionary(pa.int16(), pa.string())),
+    ('Pictures', pa.int32()),
+    ('Price', pa.decimal128(12, 2)),
+    ('Featured', pa.bool_()),
+    ('Status', pa.dictionary(pa.int8(), pa.string())),
+    ('Updated', pa.date32()),
+    ('ImageLinks', pa.list_(pa.string())),
+    ('DescriptionSummary', pa.string()),
+])
+
+
+# --- Tabla Arrow --------------------------------------------------------------
+
+def items_to_table(items):
+    """Convierte los items (dicts) en una tabla Arrow con SCHEMA en una sola pasada."""
+    columns = {field.name: [] for field in SCHEMA}
+    for item in items:
+        columns['ID'].append(str(item.get('ID', '')))
+        columns['Name'].append(item.get('Name', ''))
+        columns['Category'].append(item.get('Category', ''))
+        columns['Pictures'].append(parse_pictures(item.get('Pictures')))
+        columns['Price'].append(parse_price(item.get('Price')))
+        columns['Featured'].append(parse_featured(item.get('Featured')))
+        columns['Status'].append(str(item.get('Status', '')))
+        columns['Updated'].append(parse_updated(item.get('Updated')))
+        columns['ImageLinks'].append(parse_image_links(item.get('ImageLinks')))
+        columns['DescriptionSummary'].append(item.get('DescriptionSummary', ''))
+    arrays = []
+    for field in SCHEMA:
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(columns[field.name], pa.string()).dictionary_encode()
+                          .cast(field.type))
+        else:
+            arrays.append(pa.array(columns[field.name], field.type))
+    return pa.Table.from_arrays(arrays, schema=SCHEMA)
+
+
+def load_source(path):
+    """Items de un CSV exportado, de un JSON o del almacén SQLite (.db), uno a uno."""
+    if path.endswith('.csv'):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            yield from csv.DictReader(f)
+    elif path.endswith('.json'):
+        yield from iter_json_array(path)
+    else:
+        yield from load_items(path)
+
+
+# --- Escritura y lectura ------------------------------------------------------
+
+def write_parquet(items, path):
+    """Parquet comprimido con zstd; acepta items o una tabla ya convertida."""
+    table = items if isinstance(items, pa.Table) else items_to_table(items)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    pq.write_table(table, path, compression='zstd')
+    print(f"[DATA] Parquet guardado: {path} ({table.num_rows} items)")
+    return table
+
+
+def write_arrow(items, path):
+    """Arrow IPC (formato fichero) sin comprimir, para leerlo con memory_map."""
+    table = items if isinstance(items, pa.Table) else items_to_table(items)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with pa.OSFile(path, 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    print(f"[DATA] Arrow guardado: {path} ({table.num_rows} items)")
+    return table
+
+
+def read_columns(path, columns=None):
+    """Lee sólo las columnas pedidas de un .parquet o de un .arrow (mapeado en memoria)."""
+    if path.endswith('.parquet'):
+        return pq.read_table(path, columns=columns)
+    with pa.memory_map(path, 'r') as source:
+        table = ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
+
+
+def export_columnar(source, output_dir='output', name='items_all'):
+    """Exporta `source` (ruta o lista de items) a <name>.parquet y <name>.arrow."""
+    items = load_source(source) if isinstance(source, str) else source
+    table = items_to_table(items)
+    os.makedirs(output_dir, exist_ok=True)
+    write_parquet(table, os.path.join(output_dir, f'{name}.parquet'))
+    write_arrow(table, os.path.join(output_dir, f'{name}.arrow'))
+
+
+if __name__ == "__main__":
+    export_columnar('output/items_all.json')
@@ -1,17 +1,68 @@
+import ast
 import csv
 import json
 import os
+import sys
 
-def csv_to_json(csv_path, json_path):
-    """Convierte un archivo CSV en un archivo JSON."""
-    with open(csv_path, 'r', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        data = list(reader)
-    with open(json_path, 'w', encoding='utf-8') as jsonfile:
-        json.dump(data, jsonfile, ensure_ascii=False, indent=2)
-    print(f"[DATA] CSV convertido a JSON: {json_path}")
+from backup.background_writer import write_atomic
+from backup.stream_export import array_element, array_end
+
+def parse_image_links(value):
+    """
+    Lista de enlaces; en los CSV viene como literal de lista de Python
+    ("['https://file.4pm.ie/843/a.jpg', ...]"), como lista sin comillas
+    ("[https://..., https://...]", en los CSV limpiados) o separada por comas.
+    """
+    if isinstance(value, list):
+        return value
+    text = str(value or '').strip()
+    if text.startswith('['):
+        # repr() de una lista de URLs sin comillas ni barras: se trocea sin literal_eval
+        if text.startswith("['") and text.endswith("']") and '"' not in text and '\\' not in text:
+            return text[2:-2].split("', '")
+        try:
+            return [str(link) for link in ast.literal_eval(text)]
+        except (ValueError, SyntaxError):
+            text = text.strip('[]')
+    return [link.strip().strip('\'"') for link in text.split(',') if link.strip()]
+
+def iter_csv_rows(csv_path):
+    """Filas del CSV una a una, con ImageLinks convertido en lista."""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as csvfile:
+        for row in csv.DictReader(csvfile):
+            if 'ImageLinks' in row:
+                row['ImageLinks'] = parse_image_links(row['ImageLinks'])
+            yield row
+
+def csv_to_json(csv_path, json_path, lines=None):
+    """
+    Convierte un archivo CSV en JSON leyendo y escribiendo fila a fila, con
+    memoria constante. Con lines=True (o si json_path termina en .jsonl) se
+    escribe JSONL, un item por línea; si no, un array JSON con indent=2.
+    El fichero se escribe en un temporal y se renombra al terminar.
+    """
+    if lines is None:
+        lines = json_path.endswith('.jsonl')
+    count = 0
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+
+    def write_rows(jsonfile):
+        nonlocal count
+        for row in iter_csv_rows(csv_path):
+            if lines:
+                jsonfile.write(encode(row) + '\n')
+            else:
+                jsonfile.write(array_element(row, count == 0))
+            count += 1
+        if not lines:
+            jsonfile.write(array_end(count))
+
+    write_atomic(json_path, write_rows)
+    print(f"[DATA] CSV convertido a {'JSONL' if lines else 'JSON'}: {json_path} ({count} filas)")
+    return count
 
 if __name__ == "__main__":
-    csv_path = 'output/items_all.csv'
-    json_path = 'output/items_all.json'
+    # python csv_to_json.py [entrada.csv] [salida.json|salida.jsonl]
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else 'output/items_all.csv'
+    json_path = sys.argv[2] if len(sys.argv) > 2 else 'output/items_all.json'
     csv_to_json(csv_path, json_path)
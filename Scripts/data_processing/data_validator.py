@@ -1,21 +1,134 @@
-import json
-import os
-
-def validate_data(json_path):
-    """Valida los datos extraídos y muestra posibles problemas."""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    errors = []
-    for idx, item in enumerate(data):
-        if not item.get('ID') or not item.get('Name'):
-            errors.append((idx, item))
-    if errors:
-        print(f"[VALIDATOR] Se encontraron {len(errors)} items con problemas de ID o Name:")
-        for idx, item in errors:
-            print(f"  - Fila {idx}: {item}")
+import re
+import sys
+from datetime import datetime
+from functools import lru_cache
+
+from backup.background_writer import write_json_atomic
+from backup.item_store import load_items
+from backup.stream_export import iter_json_array
+from data_processing.csv_to_json import iter_csv_rows, parse_image_links
+from data_processing.id_index import get_items
+
+PRICE = re.compile(r'€\d{1,3}(?:,\d{3})*\.\d{2}')  # €23,500.00
+PICTURES = re.compile(r'(\d+) x')  # 8 x
+STATUS_VALUES = frozenset({'1', '2'})
+FEATURED_VALUES = frozenset({'Yes', 'No'})
+EXAMPLES = 5  # IDs de ejemplo por regla en el informe
+REPORT_PATH = 'output/validation_report.json'
+
+@lru_cache(maxsize=None)
+def is_date(text):
+    """dd/mm/yyyy con fecha real; hay pocas fechas distintas, así que se cachea."""
+    try:
+        return len(text) == 10 and datetime.strptime(text, '%d/%m/%Y') is not None
+    except ValueError:
+        return False
+
+# --- Reglas: reciben el item (ImageLinks ya como lista) y devuelven True si lo cumple ---
+
+def id_name(item):
+    return bool(item.get('ID')) and bool(item.get('Name'))
+
+def price_format(item):
+    return PRICE.fullmatch(str(item.get('Price') or '')) is not None
+
+def pictures_count(item):
+    match = PICTURES.fullmatch(str(item.get('Pictures') or ''))
+    return match is not None and int(match.group(1)) == len(item['ImageLinks'])
+
+def updated_date(item):
+    return is_date(str(item.get('Updated') or ''))
+
+def https_images(item):
+    return all(link.startswith('https://') for link in item['ImageLinks'])
+
+def status_domain(item):
+    return str(item.get('Status')) in STATUS_VALUES
+
+def featured_domain(item):
+    return item.get('Featured') in FEATURED_VALUES
+
+def id_prefix_in_name(item):
+    """Falla si el Name aún empieza por el ID ('831 Bankers Lamp'), como antes de limpiarlo."""
+    item_id = str(item.get('ID') or '')
+    name = str(item.get('Name') or '').lstrip('"')
+    if not item_id or not name.startswith(item_id):
+        return True
+    rest = name[len(item_id):]
+    return bool(rest) and rest[0] not in ' ,-'
+
+RULES = {rule.__name__: rule for rule in (
+    id_name, price_format, pictures_count, updated_date, https_images,
+    status_domain, featured_domain, id_prefix_in_name)}
+
+def iter_items(path, ids=None, **filters):
+    """
+    Items de un JSON (en streaming), un CSV exportado o el almacén .db (con los
+    filtros de ItemStore.items), con ImageLinks como lista. Con ids, sólo esos
+    items, leídos por el índice de IDs.
+    """
+    if path.endswith('.db'):
+        items = load_items(path, **filters)
+        if ids is not None:
+            wanted = set(ids)
+            items = (item for item in items if str(item.get('ID')) in wanted)
+    elif ids is not None:
+        items = get_items(path, ids)
+    elif path.endswith('.csv'):
+        items = (row for row in iter_csv_rows(path) if row.get('ID') != 'ID')  # cabeceras repetidas
+    else:
+        items = iter_json_array(path)
+    for item in items:
+        if not isinstance(item.get('ImageLinks'), list):
+            item['ImageLinks'] = parse_image_links(item.get('ImageLinks'))
+        yield item
+
+def validate_items(items, rules=RULES, examples=EXAMPLES):
+    """
+    Aplica todas las reglas (y la de IDs duplicados) en una sola pasada. Devuelve
+    {'items': n, 'valid': n, 'rules': {regla: {'failed': n, 'examples': [IDs]}}}.
+    """
+    rules = list(rules.items())
+    report = {name: {'failed': 0, 'examples': []} for name, _ in rules}
+    report['duplicate_id'] = {'failed': 0, 'examples': []}
+    seen, total, valid = set(), 0, 0
+    for item in items:
+        item_id = str(item.get('ID') or '')
+        failed = [name for name, rule in rules if not rule(item)]
+        if item_id in seen:
+            failed.append('duplicate_id')
+        else:
+            seen.add(item_id)
+        for name in failed:
+            entry = report[name]
+            entry['failed'] += 1
+            if len(entry['examples']) < examples:
+                entry['examples'].append(item_id or f'#{total}')
+        total += 1
+        valid += not failed
+    return {'items': total, 'valid': valid, 'rules': report}
+
+def validate_data(json_path, ids=None, report_path=None):
+    """
+    Valida los datos extraídos (JSON, CSV o almacén SQLite .db) con RULES y muestra
+    cuántos items incumplen cada regla. Con ids sólo se comprueban esos items,
+    leídos por el índice de IDs sin cargar el fichero. Con report_path se guarda
+    el informe en JSON.
+    """
+    report = {'source': json_path, **validate_items(iter_items(json_path, ids))}
+    failing = {name: entry for name, entry in report['rules'].items() if entry['failed']}
+    if failing:
+        print(f"[VALIDATOR] {report['items'] - report['valid']} de {report['items']} items con problemas:")
+        for name, entry in failing.items():
+            print(f"  - {name}: {entry['failed']} (p. ej. {', '.join(entry['examples'])})")
     else:
-        print("[VALIDATOR] Todos los items tienen ID y Name válidos.")
+        print(f"[VALIDATOR] Los {report['items']} items cumplen todas las reglas.")
+    if report_path:
+        write_json_atomic(report_path, report)
+        print(f"[VALIDATOR] Informe guardado: {report_path}")
+    return report
 
 if __name__ == "__main__":
     json_path = 'output/items_all.json'
-    validate_data(json_path)
+    # python data_validator.py [ID ...] comprueba sólo esos items
+    validate_data(json_path, sys.argv[1:] or None, REPORT_PATH)
@@ -0,0 +1,278 @@
+# Índice por ID con posiciones en bytes para acceder a un item sin leer todo el fichero
+# -*- coding: utf-8 -*-
+"""
+id_index
+--------
+build_index() recorre una vez un fichero de items (log JSONL de checkpoint,
+CSV exportado o array JSON como items_all.json) y guarda junto a él
+<fichero>.idx con la posición y longitud en bytes de cada registro,
+ordenado por ID.
+
+IdIndex abre el fichero y su índice con mmap y busca por bisección: get(ID),
+get_all(ID) o range(desde, hasta) leen y parsean sólo los registros pedidos,
+así que una comprobación puntual o la reexportación de un item no dependen
+del tamaño del fichero. Si el fichero ha cambiado desde que se creó el
+índice (tamaño o fecha), se vuelve a construir automáticamente.
+
+Los IDs se guardan alineados a la derecha, de modo que los IDs numéricos se
+ordenan como números ('831' < '1000') y range('800', '850') funciona.
+
+    python -m data_processing.id_index output/items_all.json 831 832
+"""
+import csv
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+
+from backup.stream_export import scan_json_array
+
+HEADER = struct.Struct('<4sQQIHc')  # magic, tamaño, mtime_ns, nº registros, ancho de ID, tipo
+ENTRY = struct.Struct('<QI')  # offset, longitud
+MAGIC = b'IDX1'
+KINDS = {'.jsonl': b'l', '.csv': b'c', '.json': b'j'}
+
+
+def index_path(path):
+    return f'{path}.idx'
+
+
+def file_kind(path):
+    kind = KINDS.get(os.path.splitext(path)[1].lower())
+    if kind is None:
+        raise ValueError(f"Formato no soportado para el índice: {path}")
+    return kind
+
+
+def _key(item_id, width):
+    return str(item_id).encode('utf-8').rjust(width)
+
+
+# --- Recorrido de los ficheros -------------------------------------------------
+
+# Cada recorrido devuelve (offset, longitud, registro) de los registros con ID
+
+def scan_jsonl(path):
+    """Líneas de un log JSONL (se salta una línea incompleta)."""
+    offset = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if isinstance(record, dict) and record.get('ID'):
+                    yield offset, len(line), record
+            offset += len(line)
+
+
+def csv_records(f):
+    """(offset, bytes) de cada registro CSV, uniendo las líneas con campos entre comillas."""
+    offset, start, parts, quotes = 0, 0, [], 0
+    for line in f:
+        if not parts:
+            start = offset
+        parts.append(line)
+        quotes += line.count(b'"')
+        offset += len(line)
+        if quotes % 2 == 0:
+            yield start, b''.join(parts)
+            parts, quotes = [], 0
+    if parts:
+        yield start, b''.join(parts)
+
+
+def parse_csv_record(data):
+    return next(csv.reader(io.StringIO(data.decode('utf-8'), newline='')), [])
+
+
+def scan_csv(path):
+    """Filas de un CSV como dicts (se saltan las cabeceras repetidas)."""
+    with open(path, 'rb') as f:
+        records = csv_records(f)
+        header = next(records, None)
+        if header is None:
+            return
+        fields = parse_csv_record(header[1])
+        column = fields.index('ID')
+        for offset, data in records:
+            row = parse_csv_record(data)
+            if len(row) > column and row[column] and row != fields:
+                yield offset, len(data), dict(zip(fields, row))
+
+
+def scan_json(path):
+    """Elementos de un array JSON."""
+    for offset, length, item in scan_json_array(path):
+        if isinstance(item, dict) and item.get('ID'):
+            yield offset, length, item
+
+
+def csv_header(data):
+    """Columnas de un CSV a partir de su contenido (bytes o mmap)."""
+    lines = iter(data.readline, b'') if isinstance(data, mmap.mmap) else io.BytesIO(data)
+    header = next(csv_records(lines), None)
+    return parse_csv_record(header[1]) if header else []
+
+
+def decode_record(data, kind, fields=None):
+    """Registro a partir de sus bytes en el fichero."""
+    if kind == b'c':
+        return dict(zip(fields, parse_csv_record(data)))
+    return json.loads(data)
+
+
+SCANNERS = {b'l': scan_jsonl, b'c': scan_csv, b'j': scan_json}
+
+
+# --- Construcción -------------------------------------------------------------
+
+def build_index(path):
+    """Construye <path>.idx. Devuelve el número de registros indexados."""
+    kind = file_kind(path)
+    stat = os.stat(path)
+    entries = [(offset, length, str(record['ID']))
+               for offset, length, record in SCANNERS[kind](path)]
+    width = max((len(item_id.encode('utf-8')) for _, _, item_id in entries), default=1)
+    # Orden estable: los registros repetidos de un ID quedan en orden de fichero
+    entries.sort(key=lambda entry: _key(entry[2], width))
+    tmp_path = f'{index_path(path)}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, len(entries), width, kind))
+        for _, _, item_id in entries:
+            f.write(_key(item_id, width))
+        for offset, length, _ in entries:
+            f.write(ENTRY.pack(offset, length))
+    os.replace(tmp_path, index_path(path))
+    print(f"[INDEX] {len(entries)} registros indexados: {index_path(path)}")
+    return len(entries)
+
+
+def is_fresh(path):
+    """True si <path>.idx existe y corresponde al fichero actual."""
+    try:
+        with open(index_path(path), 'rb') as f:
+            magic, size, mtime_ns, _, _, kind = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return False
+    stat = os.stat(path)
+    return (magic == MAGIC and kind == file_kind(path)
+            and size == stat.st_size and mtime_ns == stat.st_mtime_ns)
+
+
+# --- Lectura ------------------------------------------------------------------
+
+class IdIndex:
+    def __init__(self, path, rebuild=True):
+        self.path = path
+        if not is_fresh(path):
+            if not rebuild:
+                raise ValueError(f"Índice inexistente o desactualizado: {index_path(path)}")
+            build_index(path)
+        with open(index_path(path), 'rb') as f:
+            self.index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, _, self.count, self.width, self.kind = HEADER.unpack_from(self.index)
+        self.keys_at = HEADER.size
+        self.entries_at = self.keys_at + self.count * self.width
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.count else b''
+        self.fields = csv_header(self.data) if self.kind == b'c' and self.count else None
+
+    # --- Búsqueda -------------------------------------------------------------
+
+    def _key_at(self, position):
+        start = self.keys_at + position * self.width
+        return self.index[start:start + self.width]
+
+    def _entry(self, position):
+        return ENTRY.unpack_from(self.index, self.entries_at + position * ENTRY.size)
+
+    def _bisect(self, key, right=False):
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            current = self._key_at(middle)
+            if current < key or (right and current == key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _positions(self, item_id):
+        key = _key(item_id, self.width)
+        if len(key) > self.width:
+            return range(0)
+        return range(self._bisect(key), self._bisect(key, right=True))
+
+    def _record(self, position):
+        offset, length = self._entry(position)
+        return decode_record(self.data[offset:offset + length], self.kind, self.fields)
+
+    # --- API ------------------------------------------------------------------
+
+    def get_all(self, item_id):
+        """Todos los registros de un ID, en orden de fichero."""
+        return [self._record(position) for position in self._positions(item_id)]
+
+    def get(self, item_id, default=None):
+        """
+        El registro de un ID. En un log JSONL se fusionan sus líneas (item y
+        descripción añadida después); en CSV/JSON se devuelve el primero.
+        """
+        records = self.get_all(item_id)
+        if not records:
+            return default
+        if self.kind == b'l':
+            merged = {}
+            for record in records:
+                merged.update(record)
+            return merged
+        return records[0]
+
+    def range(self, start, end):
+        """Registros con ID entre start y end (ambos incluidos), ordenados por ID."""
+        low = self._bisect(_key(start, self.width))
+        high = self._bisect(_key(end, self.width), right=True)
+        for position in range(low, high):
+            yield self._record(position)
+
+    def ids(self):
+        seen = None
+        for position in range(self.count):
+            item_id = self._key_at(position).decode('utf-8').lstrip()
+            if item_id != seen:
+                yield item_id
+                seen = item_id
+
+    def __contains__(self, item_id):
+        return len(self._positions(item_id)) > 0
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def get_items(path, ids):
+    """Items pedidos por ID usando el índice (los que no existan se omiten)."""
+    with IdIndex(path) as index:
+        return [item for item in (index.get(item_id) for item_id in ids) if item is not None]
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else 'output/items_all.json'
+    with IdIndex(source) as index:
+        for item_id in sys.argv[2:]:
+            print(json.dumps(index.get(item_id), ensure_ascii=False, indent=2))
@@ -1,21 +1,85 @@
-import json
-import csv
 import os
+import sys
 
-def json_to_woocommerce_csv(json_path, csv_path):
-    """Convierte un archivo JSON en un CSV compatible con WooCommerce."""
-    with open(json_path, 'r', encoding='utf-8') as jsonfile:
-        data = json.load(jsonfile)
-    if not data:
+from backup.stream_export import CsvStreamWriter
+from data_processing.clean_csv_name_column import strip_id_prefix
+from data_processing.data_validator import iter_items
+from data_processing.value_parsers import parse_price
+
+# Columnas del importador de productos de WooCommerce
+WOOCOMMERCE_COLUMNS = ('Type', 'SKU', 'Name', 'Published', 'Is featured?', 'Visibility in catalog',
+                       'Short description', 'In stock?', 'Regular price', 'Categories', 'Images')
+# Status del listado -> (Published, In stock?): 1 a la venta, 2 vendido (sigue visible en la web)
+STATUS_MAP = {'1': (1, 1), '2': (1, 0)}
+DRAFT = (-1, 0)  # Status desconocido: borrador para revisarlo antes de publicar
+
+def woocommerce_price(value):
+    """'€23,500.00' -> '23500.00'; '' si no es un precio (mismo criterio que columnar_export)."""
+    price = parse_price(value)
+    return '' if price is None else str(price)
+
+def woocommerce_row(item):
+    """Fila de producto simple de WooCommerce a partir de un item extraído."""
+    item_id = str(item.get('ID') or '')
+    published, in_stock = STATUS_MAP.get(str(item.get('Status')), DRAFT)
+    return {
+        'Type': 'simple',
+        'SKU': item_id,
+        'Name': strip_id_prefix(str(item.get('Name') or ''), item_id).strip(),
+        'Published': published,
+        'Is featured?': 1 if item.get('Featured') == 'Yes' else 0,
+        'Visibility in catalog': 'visible',
+        'Short description': item.get('DescriptionSummary') or '',
+        'In stock?': in_stock,
+        'Regular price': woocommerce_price(item.get('Price')),
+        # WooCommerce separa categorías por comas: las de dentro del nombre se escapan
+        'Categories': str(item.get('Category') or '').replace(',', '\\,'),
+        'Images': ', '.join(item.get('ImageLinks') or []),
+    }
+
+def chunk_path(csv_path, number):
+    """output/items_woocommerce.csv -> output/items_woocommerce_001.csv"""
+    root, ext = os.path.splitext(csv_path)
+    return f'{root}_{number:03d}{ext}'
+
+def json_to_woocommerce_csv(json_path, csv_path, ids=None, chunk_size=None, **filters):
+    """
+    Convierte un archivo JSON (o un CSV exportado, o el almacén SQLite .db con
+    filtros opcionales como category o status) en un CSV de productos de
+    WooCommerce item a item: en memoria sólo quedan los IDs ya escritos, para
+    omitir los repetidos. Con ids sólo se reexportan esos items, leídos por el
+    índice de IDs. Con chunk_size se escriben varios CSV de como mucho
+    chunk_size productos (items_woocommerce_001.csv, ...) para importarlos por
+    partes.
+    Devuelve las rutas escritas.
+    """
+    paths, writer, seen, duplicates = [], None, set(), 0
+    for item in iter_items(json_path, ids, **filters):
+        # WooCommerce exige SKU único: se queda el primer item de cada ID
+        item_id = str(item.get('ID') or '')
+        if item_id in seen:
+            duplicates += 1
+            continue
+        seen.add(item_id)
+        if writer is None or (chunk_size and writer.count >= chunk_size):
+            if writer is not None:
+                writer.close()
+            path = chunk_path(csv_path, len(paths) + 1) if chunk_size else csv_path
+            writer = CsvStreamWriter(path, WOOCOMMERCE_COLUMNS, fsync=False)
+            paths.append(path)
+        writer.write(woocommerce_row(item))
+    if writer is not None:
+        writer.close()
+    if duplicates:
+        print(f"[DATA] {duplicates} items con ID repetido omitidos (SKU duplicado)")
+    if not paths:
         print("No hay datos para convertir.")
-        return
-    with open(csv_path, 'w', encoding='utf-8', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=data[0].keys())
-        writer.writeheader()
-        writer.writerows(data)
-    print(f"[DATA] JSON convertido a CSV WooCommerce: {csv_path}")
+        return paths
+    print(f"[DATA] JSON convertido a CSV WooCommerce: {', '.join(paths)}")
+    return paths
 
 if __name__ == "__main__":
+    # python json_to_woocommerce_csv.py [productos por fichero]
     json_path = 'output/items_all.json'
     csv_path = 'output/items_woocommerce.csv'
-    json_to_woocommerce_csv(json_path, csv_path)
+    json_to_woocommerce_csv(json_path, csv_path, chunk_size=int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,195 @@
+# Diferencias entre dos exportaciones del catálogo (añadidos, eliminados, cambiados)
+# -*- coding: utf-8 -*-
+"""
+snapshot_diff
+-------------
+Compara dos salidas del scraper (items_all.json, items_from_465_final.json,
+un CSV de CSV_FILES/, el log JSONL de checkpoint o el almacén SQLite .db) en
+una pasada en streaming por cada una. Los dos lados se leen con el mismo
+scan_records(): en un log JSONL las líneas de un mismo ID (el item y la
+descripción anexada después) se fusionan como en IdIndex.get.
+
+1. De la antigua sólo se guarda, por ID, un hash de 16 bytes de su contenido
+   normalizado (espacios colapsados, ImageLinks como lista aunque venga como
+   texto del CSV) y la posición de su registro (de sus líneas, en un JSONL).
+2. La nueva se recorre comparando hashes: ID nuevo -> añadido, hash distinto
+   -> cambiado. Al terminar, los IDs antiguos no vistos son los eliminados.
+3. Sólo para los cambiados se relee el registro antiguo, directamente por su
+   posición en bytes (mmap), y se calculan las diferencias campo a campo.
+
+La memoria depende del número de IDs, no del tamaño de los registros.
+
+    python -m data_processing.snapshot_diff output/items_from_465_final.json output/items_all.json [informe.json]
+"""
+import hashlib
+import mmap
+import struct
+import sys
+
+from backup.background_writer import write_json_atomic
+from backup.item_store import FIELDS, ItemStore, load_items
+from data_processing.csv_to_json import parse_image_links
+from data_processing.id_index import SCANNERS, csv_header, decode_record, file_kind
+
+HASH_SIZE = 16
+LOCATION = struct.Struct('<QI')  # offset y longitud de un registro (o línea JSONL) en el fichero
+
+
+def normalise(record, fields=FIELDS):
+    """Valores comparables de un registro: texto sin espacios sobrantes, enlaces como tupla."""
+    values = []
+    for field in fields:
+        value = record.get(field)
+        if field == 'ImageLinks':
+            values.append(tuple(link.strip() for link in parse_image_links(value)))
+        elif isinstance(value, str):
+            values.append(' '.join(value.split()))
+        else:
+            values.append('' if value is None else str(value))
+    return tuple(values)
+
+
+def content_hash(values):
+    text = '\x1f'.join('\x1e'.join(value) if isinstance(value, tuple) else value for value in values)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=HASH_SIZE).digest()
+
+
+def read_record(data, locations, kind, fields=None):
+    """Registro en las posiciones empaquetadas locations; varias líneas JSONL se fusionan en orden."""
+    record = {}
+    for offset, length in LOCATION.iter_unpack(locations):
+        record.update(decode_record(data[offset:offset + length], kind, fields))
+    return record
+
+
+def scan_records(path):
+    """
+    (ID, posiciones, registro) de un JSON, CSV, log JSONL o almacén .db.
+    posiciones son los LOCATION empaquetados del registro (b'' en un .db); en
+    un JSONL, los de todas las líneas del ID, cuyo registro ya viene fusionado.
+    """
+    if path.endswith('.db'):
+        for record in load_items(path):
+            item_id = str(record.get('ID') or '').strip()
+            if item_id:
+                yield item_id, b'', record
+        return
+    kind = file_kind(path)
+    if kind != b'l':
+        for offset, length, record in SCANNERS[kind](path):
+            yield str(record['ID']).strip(), LOCATION.pack(offset, length), record
+        return
+    # JSONL: primero las líneas de cada ID (en orden de primera aparición), luego se fusionan
+    lines = {}
+    for offset, length, record in SCANNERS[kind](path):
+        item_id = str(record['ID']).strip()
+        lines[item_id] = lines.get(item_id, b'') + LOCATION.pack(offset, length)
+    if not lines:
+        return
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        for item_id, locations in lines.items():
+            yield item_id, locations, read_record(data, locations, kind)
+    finally:
+        data.close()
+
+
+class OldRecords:
+    """Lee un registro del fichero antiguo por su posición (mmap) o del almacén SQLite."""
+
+    def __init__(self, path):
+        self.store = ItemStore(path) if path.endswith('.db') else None
+        if self.store is None:
+            self.kind = file_kind(path)
+            with open(path, 'rb') as f:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.fields = csv_header(self.data) if self.kind == b'c' else None
+
+    def get(self, item_id, entry):
+        if self.store is not None:
+            return self.store.get(item_id)
+        return read_record(self.data, entry[HASH_SIZE:], self.kind, self.fields)
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+        else:
+            self.data.close()
+
+
+def field_changes(fields, old, new):
+    return {field: [list(before) if isinstance(before, tuple) else before,
+                    list(after) if isinstance(after, tuple) else after]
+            for field, before, after in zip(fields, old, new) if before != after}
+
+
+def diff_snapshots(old_path, new_path, fields=FIELDS):
+    """
+    Devuelve {'added': [IDs], 'removed': [IDs], 'changed': {ID: {campo: [antes, después]}},
+    'unchanged': n, 'duplicates': {'old': n, 'new': n}}.
+    """
+    fields = tuple(fields)
+    # Por ID antiguo: hash + posiciones del registro, en un único bytes
+    old_entries, duplicates = {}, {'old': 0, 'new': 0}
+    for item_id, locations, record in scan_records(old_path):
+        if item_id in old_entries:
+            duplicates['old'] += 1  # cuenta el primero
+            continue
+        old_entries[item_id] = content_hash(normalise(record, fields)) + locations
+
+    added, changed, seen, unchanged = [], {}, set(), 0
+    old_records = None
+    try:
+        for item_id, _, record in scan_records(new_path):
+            if item_id in seen:
+                duplicates['new'] += 1
+                continue
+            seen.add(item_id)
+            entry = old_entries.pop(item_id, None)
+            if entry is None:
+                added.append(item_id)
+                continue
+            values = normalise(record, fields)
+            if content_hash(values) == entry[:HASH_SIZE]:
+                unchanged += 1
+                continue
+            if old_records is None:
+                old_records = OldRecords(old_path)
+            old_values = normalise(old_records.get(item_id, entry), fields)
+            changed[item_id] = field_changes(fields, old_values, values)
+    finally:
+        if old_records is not None:
+            old_records.close()
+    return {'added': added, 'removed': list(old_entries), 'changed': changed,
+            'unchanged': unchanged, 'duplicates': duplicates}
+
+
+def print_diff(diff, limit=20):
+    print(f"[DIFF] Añadidos: {len(diff['added'])} | Eliminados: {len(diff['removed'])} | "
+          f"Cambiados: {len(diff['changed'])} | Sin cambios: {diff['unchanged']}")
+    if diff['duplicates']['old'] or diff['duplicates']['new']:
+        print(f"[DIFF] IDs duplicados ignorados: {diff['duplicates']['old']} (antes), "
+              f"{diff['duplicates']['new']} (después)")
+    for label in ('added', 'removed'):
+        if diff[label]:
+            more = f" (+{len(diff[label]) - limit})" if len(diff[label]) > limit else ''
+            print(f"  {label}: {', '.join(diff[label][:limit])}{more}")
+    for item_id, changes in list(diff['changed'].items())[:limit]:
+        print(f"  ~ {item_id}")
+        for field, (old, new) in changes.items():
+            if field == 'ImageLinks':
+                print(f"      {field}: {len(old)} -> {len(new)} enlaces")
+            else:
+                print(f"      {field}: {old!r} -> {new!r}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Uso: python -m data_processing.snapshot_diff ANTES DESPUÉS [informe.json]")
+        sys.exit(1)
+    result = diff_snapshots(sys.argv[1], sys.argv[2])
+    print_diff(result)
+    if len(sys.argv) > 3:
+        write_json_atomic(sys.argv[3], result)
+        print(f"[DIFF] Informe guardado: {sys.argv[3]}")
@@ -0,0 +1,42 @@
+# Conversión de los valores de texto del listado a tipos reales
+# -*- coding: utf-8 -*-
+"""
+Parsers sin dependencias externas compartidos por las exportaciones
+(columnar_export, json_to_woocommerce_csv): todas leen los precios, fotos y
+fechas con el mismo criterio. Devuelven None si el valor no es válido.
+"""
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+
+def parse_pictures(value):
+    """'8 x' -> 8; None si la columna no trae número."""
+    text = str(value or '').replace('x', '').strip()
+    return int(text) if text.isdigit() else None
+
+
+def parse_price(value):
+    """'€23,500.00' -> Decimal('23500.00'); None si no es un precio (también NaN o Infinity)."""
+    text = str(value or '').replace('€', '').replace(',', '').strip()
+    try:
+        price = Decimal(text)
+    except InvalidOperation:
+        return None
+    return price.quantize(Decimal('0.01')) if price.is_finite() else None
+
+
+def parse_featured(value):
+    text = str(value or '').strip().lower()
+    if text in ('yes', 'true', '1'):
+        return True
+    if text in ('no', 'false', '0'):
+        return False
+    return None
+
+
+def parse_updated(value):
+    """'30/05/2025' -> date(2025, 5, 30); None si no es dd/mm/yyyy."""
+    try:
+        return datetime.strptime(str(value or '').strip(), '%d/%m/%Y').date()
+    except ValueError:
+        return None
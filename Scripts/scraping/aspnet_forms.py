@@ -0,0 +1,127 @@
+# Utilidades para reproducir formularios y postbacks de ASP.NET WebForms
+# -*- coding: utf-8 -*-
+"""
+aspnet_forms
+------------
+Funciones auxiliares para trabajar con las páginas ASP.NET del panel de 4AM
+sin navegador: sesión HTTP con pool de conexiones, lectura de campos ocultos
+(__VIEWSTATE, __EVENTVALIDATION...), extracción de destinos de __doPostBack y
+construcción del cuerpo de los POST.
+"""
+import re
+import time
+from urllib.parse import urljoin
+
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+POSTBACK_RE = re.compile(r"__doPostBack\(\s*['\"]([^'\"]*)['\"]\s*,\s*['\"]([^'\"]*)['\"]\s*\)")
+POSTBACK_OPTIONS_RE = re.compile(r"WebForm_PostBackOptions\(\s*['\"]([^'\"]*)['\"]\s*,\s*['\"]([^'\"]*)['\"]")
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def create_session(pool_size=8, retries=3):
+    """
+    Crea una sesión requests con pool de conexiones y reintentos sólo de los
+    métodos idempotentes (GET...). Un POST repetido reenvía su __VIEWSTATE y
+    __EVENTVALIDATION: los postbacks que se pueden repetir usan post_retrying.
+    """
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=RETRY_STATUSES)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def post_retrying(session, url, data, retries=2, backoff=0.5, **kwargs):
+    """
+    POST que se reintenta ante un 5xx o un error de conexión. Sólo para
+    postbacks que no cambian el estado del formulario (paginación, botón de
+    edición), en los que repetir los mismos campos ocultos sigue siendo válido.
+    """
+    for attempt in range(retries + 1):
+        try:
+            response = session.post(url, data=data, **kwargs)
+        except requests.ConnectionError:
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+        time.sleep(backoff * 2 ** attempt)
+
+
+def parse_document(html, base_url=None):
+    """Convierte el HTML de una respuesta en un documento lxml."""
+    doc = lxml.html.fromstring(html)
+    if base_url:
+        doc.make_links_absolute(base_url, resolve_base_href=True)
+    return doc
+
+
+def get_hidden_fields(doc):
+    """Devuelve todos los campos ocultos del formulario principal (name -> value)."""
+    forms = doc.xpath('//form')
+    scope = forms[0] if forms else doc
+    fields = {}
+    for inp in scope.xpath(".//input[@type='hidden'][@name]"):
+        fields[inp.get('name')] = inp.get('value', '')
+    return fields
+
+
+def get_form_action(doc, base_url):
+    """URL absoluta a la que el formulario principal envía el POST."""
+    forms = doc.xpath('//form')
+    action = forms[0].get('action') if forms else None
+    return urljoin(base_url, action) if action else base_url
+
+
+def get_field_name(doc, element_id):
+    """Obtiene el atributo name de un control a partir de su id."""
+    found = doc.xpath('//*[@id=$element_id]', element_id=element_id)
+    if not found:
+        return None
+    return found[0].get('name')
+
+
+def parse_postback(href):
+    """
+    Extrae (target, argument) de un enlace javascript:__doPostBack(...).
+    Devuelve None si el enlace no es un postback.
+    """
+    if not href:
+        return None
+    match = POSTBACK_RE.search(href) or POSTBACK_OPTIONS_RE.search(href)
+    if not match:
+        return None
+    return match.group(1), match.group(2)
+
+
+def build_postback(hidden_fields, target, argument=''):
+    """Construye el cuerpo de un POST que simula __doPostBack(target, argument)."""
+    payload = dict(hidden_fields)
+    payload['__EVENTTARGET'] = target
+    payload['__EVENTARGUMENT'] = argument
+    return payload
+
+
+def build_submit(hidden_fields, control_name, control_type='submit', value=''):
+    """
+    Construye el cuerpo de un POST que simula pulsar un botón del formulario.
+    Los input[type=image] envían las coordenadas del clic (name.x / name.y).
+    """
+    payload = dict(hidden_fields)
+    payload['__EVENTTARGET'] = ''
+    payload['__EVENTARGUMENT'] = ''
+    if control_type == 'image':
+        payload[f'{control_name}.x'] = '1'
+        payload[f'{control_name}.y'] = '1'
+    else:
+        payload[control_name] = value
+    return payload
@@ -0,0 +1,319 @@
+# Motor de scraping asyncio con etapas de concurrencia acotada
+# -*- coding: utf-8 -*-
+"""
+AsyncScraper
+------------
+Motor asyncio (aiohttp) con tres etapas independientes, cada una con su propio
+límite de concurrencia:
+
+- listado: páginas de Items.aspx, pedidas en paralelo gracias al mapa del
+  paginador (cada página se alcanza con un único postback),
+- galería: páginas ReorderList1 de cada item,
+- edición: página de edición (txtdesc) para DescriptionSummary.
+
+En modo incremental (previous={ID: item}) los items sin cambios en Updated,
+Price, Status y Pictures no entran en las colas de galería y edición: se
+reutilizan sus ImageLinks y DescriptionSummary guardados.
+
+ASP.NET serializa las peticiones de una misma sesión, así que la concurrencia
+sólo es real si cada petición simultánea lleva su propia sesión: cada worker de
+galería y de edición tiene su ClientSession con su cookie jar y su login, y el
+listado usa un pool de listing_limit sesiones (una por página en curso). Todas
+comparten el mismo TCPConnector.
+
+Los items pasan de una etapa a otra por colas asyncio, así que una página de
+edición lenta sólo retrasa a su propio item. Las páginas del listado que
+fallan (salto caducado, página desconocida, error de red) se reintentan hasta
+`retries` veces, volviendo a recorrer el paginador para conocer sus enlaces;
+las que sigan fallando quedan en failed_pages y se avisa al terminar. El resultado es la misma lista
+all_data que Antiques.py: cada item completo se anexa al log de checkpoint de
+backup_manager, que al final se compacta en items_all.json / items_all.csv.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+from scraping.aspnet_forms import (
+    USER_AGENT, parse_document, get_hidden_fields, get_form_action, get_field_name,
+    parse_postback, build_postback, build_submit,
+)
+from scraping.description_summary import extract_description
+from scraping.gallery_fetcher import parse_gallery
+from scraping.grid_parser import parse_grid_rows
+from scraping.incremental import split_rows, load_previous
+from scraping.pager import PagerMap, PAGER_MAP_PATH, read_pager
+
+NEXT_LABELS = ['»', '>>', 'Next', '>|']
+
+
+class AsyncScraper:
+    def __init__(self, config, backup_manager=None, listing_limit=2, gallery_limit=8, edit_limit=4,
+                 timeout=30, pager_path=PAGER_MAP_PATH, previous=None, retries=1):
+        self.config = config
+        self.backup_manager = backup_manager
+        self.listing_limit = listing_limit
+        self.gallery_limit = gallery_limit
+        self.edit_limit = edit_limit
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.pager = PagerMap(pager_path)
+        self.all_data = []
+        self.seen_ids = set()
+        self.order = {}  # ID -> (página, fila) para devolver all_data en orden de listado
+        self.previous = previous or {}
+        self.retries = retries
+        self.failed_pages = []
+
+    # --- Peticiones ---------------------------------------------------------
+
+    async def fetch(self, session, url, data=None):
+        """GET (o POST si hay data) y devuelve (url final, documento lxml, campos ocultos)."""
+        method = session.post if data is not None else session.get
+        async with method(url, data=data) as response:
+            response.raise_for_status()
+            content = await response.read()
+            final_url = str(response.url)
+        doc = parse_document(content, final_url)
+        return final_url, doc, get_hidden_fields(doc)
+
+    async def login(self, session):
+        url, doc, state = await self.fetch(session, self.config.LOGIN_URL)
+        user_name = get_field_name(doc, self.config.USERNAME_FIELD)
+        pass_name = get_field_name(doc, self.config.PASSWORD_FIELD)
+        button = doc.xpath('//*[@id=$bid]', bid=self.config.LOGIN_BUTTON)
+        if not user_name or not pass_name or not button:
+            raise Exception("No se encontraron los campos de login en el formulario")
+        payload = build_submit(state, button[0].get('name'),
+                               button[0].get('type', 'submit'), button[0].get('value', ''))
+        payload[user_name] = self.config.USERNAME
+        payload[pass_name] = self.config.PASSWORD
+        url, _, _ = await self.fetch(session, get_form_action(doc, url), payload)
+        if 'Admin' not in url:
+            raise Exception(f"Login fallido, URL actual: {url}")
+
+    async def open_session(self, connector):
+        """ClientSession con su propio cookie jar y login sobre el connector compartido."""
+        session = aiohttp.ClientSession(connector=connector, connector_owner=False, timeout=self.timeout,
+                                        headers={'User-Agent': USER_AGENT})
+        try:
+            await self.login(session)
+        except BaseException:
+            await session.close()
+            raise
+        return session
+
+    async def open_sessions(self, connector, count):
+        """Abre count sesiones en paralelo; si falla algún login cierra las demás."""
+        results = await asyncio.gather(*(self.open_session(connector) for _ in range(count)),
+                                       return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            await asyncio.gather(*(result.close() for result in results
+                                   if not isinstance(result, BaseException)))
+            raise errors[0]
+        return results
+
+    # --- Etapa de listado ---------------------------------------------------
+
+    async def map_pages(self, session, pages):
+        """
+        Recorre el paginador con '»' desde la primera página hasta conocer el
+        postback de todas las páginas pedidas. Devuelve el documento de la
+        primera página del listado.
+        """
+        url, doc, state = await self.fetch(session, self.config.ITEMS_URL)
+        first = (url, doc, state)
+        self.pager.learn(doc, get_form_action(doc, url), state)
+        current, _ = read_pager(doc)
+        while any(page not in self.pager and page != current for page in pages):
+            step = None
+            for a in doc.xpath("//a[contains(concat(' ', normalize-space(@class), ' '), ' PagingLink ')]"):
+                if a.text_content().strip() in NEXT_LABELS:
+                    step = parse_postback(a.get('href'))
+                    break
+            if not step:
+                break
+            url, doc, state = await self.fetch(session, get_form_action(doc, url), build_postback(state, *step))
+            self.pager.learn(doc, get_form_action(doc, url), state)
+            current, _ = read_pager(doc)
+        return first
+
+    @staticmethod
+    @asynccontextmanager
+    async def borrow(sessions):
+        """Toma una sesión libre del pool (asyncio.Queue) y la devuelve al terminar."""
+        session = await sessions.get()
+        try:
+            yield session
+        finally:
+            sessions.put_nowait(session)
+
+    async def listing_stage(self, sessions, page, first, gallery_queue):
+        """
+        Extrae una página del listado con una sesión del pool y encola sus items.
+        Devuelve False si no se pudo.
+        """
+        async with self.borrow(sessions) as session:
+            try:
+                url, doc, state = first
+                if read_pager(doc)[0] != page:
+                    jump = self.pager.postback_for(page)
+                    if not jump:
+                        print(f"❌ Página {page} desconocida en el paginador")
+                        return False
+                    action, jump_state, target, argument = jump
+                    url, doc, state = await self.fetch(session, action, build_postback(jump_state, target, argument))
+                    if read_pager(doc)[0] != page:
+                        self.pager.forget(page)
+                        print(f"❌ El salto a la página {page} devolvió otra página")
+                        return False
+            except Exception as e:
+                print(f"[ERROR] General error on page {page}: {str(e)}")
+                return False
+        rows = parse_grid_rows(doc, url)
+        action = get_form_action(doc, url)
+        new_rows = []
+        for row in rows:
+            item_id = row['item']['ID']
+            if item_id in self.seen_ids:
+                print(f"[WARN] ID global duplicado: {item_id}. Saltando.")
+                continue
+            self.seen_ids.add(item_id)
+            self.order[item_id] = (page, row['row'])
+            new_rows.append(row)
+        changed, unchanged = split_rows(new_rows, self.previous)
+        for row in unchanged:
+            self.add_item(row['item'])
+        for row in changed:
+            # Cada item viaja con el estado de su página para el postback de edición
+            await gallery_queue.put((row, action, state))
+        print(f"[INFO] Page {page} processed with {len(rows)} items found")
+        return True
+
+    async def listing_with_retries(self, sessions, pages, first, gallery_queue):
+        """
+        Extrae las páginas y reintenta las fallidas hasta self.retries veces,
+        recorriendo antes el paginador otra vez. Devuelve las que siguen fallando.
+        """
+        pending = list(pages)
+        for attempt in range(self.retries + 1):
+            if attempt:
+                print(f"[RETRY] Intento {attempt + 1}: {len(pending)} páginas pendientes {pending}")
+                try:
+                    async with self.borrow(sessions) as session:
+                        first = await self.map_pages(session, pending)
+                except Exception as e:
+                    print(f"[ERROR] No se pudo recorrer el paginador: {str(e)}")
+                    continue
+            results = await asyncio.gather(*(self.listing_stage(sessions, page, first, gallery_queue)
+                                             for page in pending))
+            pending = [page for page, done in zip(pending, results) if not done]
+            if not pending:
+                break
+        if pending:
+            print(f"[ASYNC] Páginas sin extraer tras {self.retries + 1} intentos: {pending}")
+        return pending
+
+    # --- Etapas de galería y edición ----------------------------------------
+
+    async def gallery_worker(self, session, gallery_queue, edit_queue):
+        while True:
+            row, action, state = await gallery_queue.get()
+            try:
+                if row['gallery_url']:
+                    async with session.get(row['gallery_url']) as response:
+                        response.raise_for_status()
+                        row['item']['ImageLinks'] = parse_gallery(await response.read(), str(response.url))
+            except Exception as e:
+                print(f"[ERROR] Error obteniendo imágenes del item {row['item']['ID']}: {str(e)}")
+            finally:
+                await edit_queue.put((row, action, state))
+                gallery_queue.task_done()
+
+    async def edit_worker(self, session, edit_queue):
+        while True:
+            row, action, state = await edit_queue.get()
+            try:
+                if row['edit_name']:
+                    _, doc, _ = await self.fetch(session, action, build_submit(state, row['edit_name'], 'image'))
+                elif row['edit_url']:
+                    _, doc, _ = await self.fetch(session, row['edit_url'])
+                else:
+                    doc = None
+                    print("      [!] No edit button found for this item, skipping description.")
+                if doc is not None:
+                    row['item']['DescriptionSummary'] = extract_description(doc) or ''
+            except Exception as e:
+                print(f"      [!] Could not extract description: {e}")
+            finally:
+                self.add_item(row['item'])
+                edit_queue.task_done()
+
+    def add_item(self, item):
+        self.all_data.append(item)
+        if self.backup_manager:
+            self.backup_manager.checkpoint_item(item)
+
+    # --- Bucle principal ----------------------------------------------------
+
+    async def scrape(self, start_page, end_page):
+        pages = list(range(start_page, end_page + 1))
+        total = self.listing_limit + self.gallery_limit + self.edit_limit
+        connector = aiohttp.TCPConnector(limit=total)
+        try:
+            print("\n=== INICIANDO SESIÓN (asyncio) ===")
+            opened = await self.open_sessions(connector, total)
+            print(f"✅ Login exitoso ({total} sesiones)")
+            try:
+                await self.run_stages(opened, pages)
+            finally:
+                await asyncio.gather(*(session.close() for session in opened))
+        finally:
+            await connector.close()
+
+    async def run_stages(self, opened, pages):
+        """Reparte las sesiones abiertas entre el pool del listado y los workers."""
+        listing = opened[:self.listing_limit]
+        gallery = opened[self.listing_limit:self.listing_limit + self.gallery_limit]
+        edit = opened[self.listing_limit + self.gallery_limit:]
+        sessions = asyncio.Queue()
+        for session in listing:
+            sessions.put_nowait(session)
+        first = await self.map_pages(listing[0], pages)
+        gallery_queue, edit_queue = asyncio.Queue(), asyncio.Queue()
+        workers = [asyncio.create_task(self.gallery_worker(session, gallery_queue, edit_queue))
+                   for session in gallery]
+        workers += [asyncio.create_task(self.edit_worker(session, edit_queue)) for session in edit]
+        try:
+            self.failed_pages = await self.listing_with_retries(sessions, pages, first, gallery_queue)
+            await gallery_queue.join()
+            await edit_queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def run(self, start_page, end_page):
+        if self.backup_manager:
+            self.backup_manager.open_checkpoint(reset=True)
+        try:
+            asyncio.run(self.scrape(start_page, end_page))
+        except KeyboardInterrupt:
+            print("[INTERRUPT] Script interrupted by user. Saving backup...")
+        finally:
+            self.pager.flush()
+            self.all_data.sort(key=lambda item: self.order.get(item['ID'], (0, 0)))
+            if self.backup_manager:
+                self.backup_manager.close_checkpoint()
+        return self.all_data
+
+
+if __name__ == "__main__":
+    import sys
+    from config import login_config
+    from backup import backup_manager
+
+    previous = load_previous() if '--incremental' in sys.argv else None
+    scraper = AsyncScraper(login_config, backup_manager, previous=previous)
+    data = scraper.run(1, 43)
+    backup_manager.save_outputs(data)
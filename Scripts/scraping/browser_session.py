@@ -0,0 +1,155 @@
+# Sesión de navegador reutilizable: arranque de Chrome, login y navegación
+# -*- coding: utf-8 -*-
+"""
+browser_session
+---------------
+Funciones Selenium compartidas por Antiques.py y los workers del pool de
+navegadores (worker_pool.py): crear el driver, iniciar sesión y moverse por el
+paginador de Items.aspx.
+
+El driver se arranca con el binario de ChromeDriver en caché y login_cached()
+reutiliza las cookies de la ejecución anterior mientras sigan siendo válidas
+(scraping/session_cache.py).
+"""
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support import expected_conditions as EC
+from webdriver_manager.chrome import ChromeDriverManager
+
+from config import login_config
+from scraping.session_cache import (
+    COOKIES_PATH, save_cookies, load_cookies, clear_cookies, is_logged_in,
+    resolve_driver_path, remember_driver_path,
+)
+
+PAGING_PANEL_ID = "ctl00_ContentPlaceHolderBody_PanelDataListPaging"
+REWIND_LINK_ID = "ctl00_ContentPlaceHolderBody_pagelinkRewind"
+NEXT_LABELS = ['»', '>>', 'Next', '>|']
+PREV_LABELS = ['«', '<<']
+
+
+def create_driver(headless=False):
+    """Arranca Chrome con las mismas opciones que Antiques.py."""
+    driver_path = resolve_driver_path()
+    if driver_path is None:
+        # Sólo la primera vez: descarga el driver y recuerda su ruta
+        driver_path = ChromeDriverManager().install()
+        remember_driver_path(driver_path)
+    service = Service(driver_path)
+    options = webdriver.ChromeOptions()
+    options.add_argument('--start-maximized')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-gpu')
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    return webdriver.Chrome(service=service, options=options)
+
+
+def login(driver, wait, config=login_config):
+    """Inicia sesión en el panel y espera la redirección a /Admin."""
+    driver.get(config.LOGIN_URL)
+    wait.until(EC.presence_of_element_located((By.ID, config.USERNAME_FIELD)))
+    wait.until(EC.presence_of_element_located((By.ID, config.PASSWORD_FIELD)))
+    wait.until(EC.presence_of_element_located((By.ID, config.LOGIN_BUTTON)))
+    driver.find_element(By.ID, config.USERNAME_FIELD).send_keys(config.USERNAME)
+    driver.find_element(By.ID, config.PASSWORD_FIELD).send_keys(config.PASSWORD)
+    driver.find_element(By.ID, config.LOGIN_BUTTON).click()
+    wait.until(EC.url_contains("Admin"))
+
+
+def restore_session(driver, wait, config=login_config, path=COOKIES_PATH):
+    """
+    Carga las cookies guardadas en el navegador y abre Items.aspx.
+    Devuelve True si la sesión sigue siendo válida (el listado ya está abierto).
+    """
+    cookies = load_cookies(path)
+    if not cookies:
+        return False
+    # Network.setCookie no necesita cargar antes una página del dominio
+    for cookie in cookies:
+        params = {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly')
+                  if key in cookie}
+        if 'expiry' in cookie:
+            params['expires'] = cookie['expiry']
+        driver.execute_cdp_cmd('Network.setCookie', params)
+    driver.get(config.ITEMS_URL)
+    wait.until(lambda d: not is_logged_in(d.current_url)
+               or d.find_elements(By.CSS_SELECTOR, "table.gridView"), 'listing')
+    if is_logged_in(driver.current_url):
+        return True
+    clear_cookies(path)
+    return False
+
+
+def login_cached(driver, wait, config=login_config, path=COOKIES_PATH):
+    """
+    Reutiliza la sesión guardada si sigue siendo válida y, si no, hace el login
+    completo y guarda las nuevas cookies. Devuelve True si se omitió el login.
+    """
+    try:
+        if restore_session(driver, wait, config, path):
+            print("✅ Sesión restaurada desde cookies guardadas")
+            return True
+    except Exception as e:
+        print(f"[SESSION] No se pudo restaurar la sesión: {e}")
+    login(driver, wait, config)
+    save_cookies(driver.get_cookies(), path)
+    return False
+
+
+def open_items(driver, wait, config=login_config):
+    driver.get(config.ITEMS_URL)
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.gridView")))
+
+
+def current_page(driver):
+    try:
+        text = driver.find_element(By.CSS_SELECTOR, ".PagingLinkCurrent").text.strip()
+        return int(text) if text.isdigit() else None
+    except Exception:
+        return None
+
+
+def _click_and_wait(driver, wait, link):
+    """Pulsa un enlace del paginador y espera a que el postback recargue la página."""
+    panel = driver.find_element(By.ID, PAGING_PANEL_ID)
+    driver.execute_script("arguments[0].scrollIntoView(true);", link)
+    link.click()
+    wait.until(EC.staleness_of(panel))
+    wait.until(EC.presence_of_element_located((By.ID, PAGING_PANEL_ID)))
+
+
+def navigate_to_page(driver, wait, target_page, pager=None, max_steps=30):
+    """
+    Navega a target_page: salto directo con el mapa del paginador si se conoce
+    y, si no, recorriendo el paginador con «/».
+    """
+    for _ in range(max_steps):
+        if pager is not None:
+            pager.learn_html(driver.page_source, driver.current_url)
+        current = current_page(driver)
+        if current == target_page:
+            return True
+        if pager is not None and pager.jump_with_driver(driver, target_page):
+            continue
+        panel = driver.find_element(By.ID, PAGING_PANEL_ID)
+        links = panel.find_elements(By.CSS_SELECTOR, 'a.PagingLink')
+        visible = {int(l.text.strip()): l for l in links if l.text.strip().isdigit()}
+        if target_page in visible:
+            _click_and_wait(driver, wait, visible[target_page])
+            continue
+        step = None
+        if visible and target_page > max(visible):
+            step = next((l for l in links if l.text.strip() in NEXT_LABELS), None)
+        elif visible and target_page < min(visible):
+            step = next((l for l in links if l.get_attribute('id') == REWIND_LINK_ID
+                         or l.text.strip() in PREV_LABELS), None)
+        if step is None:
+            print(f"❌ No se pudo avanzar a la página {target_page} desde la página {current}")
+            return False
+        _click_and_wait(driver, wait, step)
+    print(f"❌ No se pudo navegar a la página {target_page} después de {max_steps} intentos")
+    return False
@@ -0,0 +1,108 @@
+# Etapa independiente para obtener las descripciones de las páginas de edición
+# -*- coding: utf-8 -*-
+"""
+DescriptionFetcher
+------------------
+Obtiene DescriptionSummary fuera del recorrido del listado. Por cada fila se
+guarda lo necesario para abrir su página de edición por HTTP:
+
+- el enlace de edición (<a href>), o
+- el name del botón RptEdit junto con los campos ocultos y la acción del
+  formulario de la página del listado en la que aparece.
+
+Las peticiones se hacen en un pool de hilos con la sesión autenticada (o un
+SessionPool, para que los hilos no compartan la sesión de ASP.NET), en
+paralelo con la navegación del listado, que nunca tiene que pulsar el botón de
+edición ni volver atrás. Cada resultado se escribe en su item por ID y, si se
+indica on_done, se notifica con el item ya completo, haya habido error o no
+(p. ej. para anexarlo al log de checkpoint).
+"""
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+
+from scraping.aspnet_forms import parse_document, get_hidden_fields, get_form_action, build_submit, post_retrying
+from scraping.description_summary import extract_description
+
+MAX_WORKERS = 4
+
+
+def build_jobs(page_rows, doc, url):
+    """
+    Prepara los trabajos de descripción de una página del listado.
+    Devuelve {ID: job}; las filas sin botón ni enlace de edición se omiten.
+    """
+    state = get_hidden_fields(doc)
+    action = get_form_action(doc, url)
+    jobs = {}
+    for row in page_rows:
+        if row['edit_url']:
+            jobs[row['item']['ID']] = {'edit_url': row['edit_url']}
+        elif row['edit_name']:
+            jobs[row['item']['ID']] = {'edit_name': row['edit_name'], 'action': action, 'state': state}
+    return jobs
+
+
+def fetch_description(session, job, timeout=30):
+    """Descarga la página de edición de un trabajo y devuelve su DescriptionSummary."""
+    if job.get('edit_url'):
+        response = session.get(job['edit_url'], timeout=timeout)
+    else:
+        # Todas las filas de la página envían el mismo estado: repetirlo tras un 5xx es válido
+        payload = build_submit(job['state'], job['edit_name'], 'image')
+        response = post_retrying(session, job['action'], payload, timeout=timeout)
+    response.raise_for_status()
+    summary = extract_description(parse_document(response.content, response.url))
+    if summary is None:
+        raise Exception("campo txtdesc no encontrado")
+    return summary
+
+
+class DescriptionFetcher:
+    def __init__(self, session, max_workers=MAX_WORKERS, timeout=30, on_done=None):
+        self.session = session
+        self.timeout = timeout
+        self.on_done = on_done
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.futures = {}
+
+    def _fetch(self, item, job):
+        try:
+            item['DescriptionSummary'] = fetch_description(self.session, job, self.timeout)
+        except Exception as e:
+            print(f"      [!] Could not extract description for {item['ID']}: {e}")
+        # También tras un error: el item queda completo con la descripción que tenga
+        if self.on_done:
+            try:
+                self.on_done(item)
+            except Exception as e:
+                # Un fallo aquí no debe llegar a wait() y cortar el cierre del scraper
+                print(f"      [!] Error processing description for {item['ID']}: {e}")
+        return item['DescriptionSummary']
+
+    def submit(self, item, job):
+        """Encola la descripción de un item; el resultado se escribe en item['DescriptionSummary']."""
+        future = self.executor.submit(self._fetch, item, job)
+        self.futures[item['ID']] = future
+        return future
+
+    def submit_page(self, page_rows, doc, url):
+        """Encola todas las filas de una página del listado (doc: HTML o documento lxml)."""
+        doc = parse_document(doc) if isinstance(doc, (str, bytes)) else doc
+        jobs = build_jobs(page_rows, doc, url)
+        for row in page_rows:
+            item = row['item']
+            if item['ID'] in jobs:
+                self.submit(item, jobs[item['ID']])
+            else:
+                print(f"      [!] No edit button found for item {item['ID']}, skipping description.")
+        return len(jobs)
+
+    def pending(self):
+        return sum(1 for future in self.futures.values() if not future.done())
+
+    def wait(self):
+        """Espera a que terminen todas las descripciones encoladas. Devuelve {ID: resumen}."""
+        wait_futures(list(self.futures.values()))
+        return {item_id: future.result() for item_id, future in self.futures.items()}
+
+    def close(self, wait=True):
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -0,0 +1,75 @@
+# Resumen de descripciones HTML de los artículos
+# -*- coding: utf-8 -*-
+"""
+description_summary
+-------------------
+Limpia el HTML de la descripción de un artículo (campo txtdesc de la página de
+edición) y genera el texto de DescriptionSummary.
+"""
+import re
+
+from bs4 import BeautifulSoup
+
+DESCRIPTION_FIELD = "ctl00$ContentPlaceHolderBody$txtdesc"
+
+
+def summarize_description(html):
+    """
+    Cleans the HTML and extracts key data from an antique product description.
+    Returns a concise string with dimensions, materials, provenance, condition, and unique features.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    text = soup.get_text(separator=' ', strip=True)
+    text = re.sub(r'\s+', ' ', text)
+    dims = re.findall(r'(Height|Width|Depth)[^\d]*(\d+[.,]?\d*)["\']? ?\(?([\d.,]+)? ?cm?\)?', text, re.I)
+    dims_str = ', '.join([f"{d[0].capitalize()}: {d[1]}{(' ('+d[2]+'cm)') if d[2] else ''}" for d in dims]) if dims else ''
+    materials = re.findall(r'(Arbutus|Yew Wood|Mahogany|Oak|Walnut|Bronze|Porcelain|Glass|Marble|Silver|Gold|Ivory|Ebony)', text, re.I)
+    materials_str = ', '.join(sorted(set([m.capitalize() for m in materials]))) if materials else ''
+    provenance = ''
+    prov_match = re.search(r'(made in|originates from|provenance:?|located in) ([A-Za-z ,.-]+)', text, re.I)
+    if prov_match:
+        provenance = prov_match.group(0)
+    elif 'Ireland' in text:
+        provenance = 'Ireland'
+    features = []
+    if 'inlaid' in text.lower():
+        features.append('Inlaid decoration')
+    if 'crossed ferns' in text.lower():
+        features.append('Crossed Ferns motif')
+    if 'original condition' in text.lower():
+        features.append('Original condition')
+    if 'provenance' in text.lower():
+        features.append('Provenance available')
+    if 'rare' in text.lower():
+        features.append('Rare piece')
+    features_str = ', '.join(features)
+    state = ''
+    if 'restored' in text.lower() or 'cleaned' in text.lower() or 'waxed' in text.lower():
+        state = 'Restored/Cleaned'
+    elif 'original condition' in text.lower():
+        state = 'Original condition'
+    summary_parts = []
+    if dims_str:
+        summary_parts.append(dims_str)
+    if materials_str:
+        summary_parts.append(f"Materials: {materials_str}")
+    if provenance:
+        summary_parts.append(f"Provenance: {provenance}")
+    if features_str:
+        summary_parts.append(f"Features: {features_str}")
+    if state:
+        summary_parts.append(f"State: {state}")
+    summary = '; '.join(summary_parts)
+    return summary or text[:200]
+
+
+def extract_description(doc):
+    """
+    Lee el campo txtdesc de la página de edición (documento lxml) y devuelve
+    su DescriptionSummary. Devuelve None si el campo no existe.
+    """
+    desc = doc.xpath('//*[@name=$name]', name=DESCRIPTION_FIELD)
+    if not desc:
+        return None
+    desc_html = desc[0].get('value') if desc[0].tag == 'input' else desc[0].text_content()
+    return summarize_description(desc_html or '')
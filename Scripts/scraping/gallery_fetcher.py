@@ -0,0 +1,74 @@
+# Descarga concurrente de las galerías de imágenes de los artículos
+# -*- coding: utf-8 -*-
+"""
+gallery_fetcher
+---------------
+Recoge las URLs de galería (columna Pictures) de una página del listado y las
+descarga en paralelo con un pool de hilos acotado que usa la sesión
+autenticada (de HttpScraper, copiada del navegador o un SessionPool con una
+sesión propia por petición concurrente).
+Devuelve {ID: [enlaces de imagen]} con http:// forzado a https://.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from scraping.aspnet_forms import parse_document, create_session
+
+GALLERY_XPATH = "//div[@id='ctl00_ContentPlaceHolderBody_ReorderList1']//ul/li//a[@target='_blank']"
+MAX_WORKERS = 8
+
+
+def session_from_driver(driver, pool_size=MAX_WORKERS):
+    """Crea una sesión HTTP con las cookies y el User-Agent del navegador."""
+    session = create_session(pool_size)
+    try:
+        session.headers['User-Agent'] = driver.execute_script("return navigator.userAgent;")
+    except Exception:
+        pass
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie['name'], cookie['value'],
+                            domain=cookie.get('domain'), path=cookie.get('path', '/'))
+    return session
+
+
+def parse_gallery(html, base_url=None):
+    """Extrae los enlaces de imagen de ReorderList1 forzando https."""
+    doc = parse_document(html, base_url)
+    images = []
+    for a in doc.xpath(GALLERY_XPATH):
+        href = a.get('href')
+        if href and href.startswith('http'):
+            images.append(href.replace('http://', 'https://', 1))
+    return images
+
+
+def fetch_gallery(session, gallery_url, timeout=30):
+    if not gallery_url:
+        return []
+    response = session.get(gallery_url, timeout=timeout)
+    response.raise_for_status()
+    return parse_gallery(response.content, response.url)
+
+
+def collect_gallery_urls(page_rows):
+    """{ID: gallery_url} a partir de las filas de parse_grid_rows."""
+    return {row['item']['ID']: row['gallery_url'] for row in page_rows if row['gallery_url']}
+
+
+def fetch_galleries(session, gallery_urls, max_workers=MAX_WORKERS, timeout=30):
+    """
+    Descarga en paralelo todas las galerías de gallery_urls ({ID: url}).
+    Un fallo en una galería deja una lista vacía para ese ID.
+    """
+    images = {item_id: [] for item_id in gallery_urls}
+    if not gallery_urls:
+        return images
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(gallery_urls))) as executor:
+        futures = {executor.submit(fetch_gallery, session, url, timeout): item_id
+                   for item_id, url in gallery_urls.items()}
+        for future in as_completed(futures):
+            item_id = futures[future]
+            try:
+                images[item_id] = future.result()
+            except Exception as e:
+                print(f"[ERROR] Error obteniendo imágenes del item {item_id}: {str(e)}")
+    return images
@@ -0,0 +1,104 @@
+# Análisis en bloque de las filas del gridView de Items.aspx
+# -*- coding: utf-8 -*-
+"""
+grid_parser
+-----------
+Extrae todas las filas de una página del listado con una única lectura del
+HTML, en lugar de consultar cada celda con llamadas a WebDriver.
+"""
+from urllib.parse import urljoin
+
+from scraping.aspnet_forms import parse_document
+
+
+def get_text(element):
+    return ' '.join(element.text_content().split()) if element is not None else ''
+
+
+def get_cell_text(td):
+    spans = td.xpath('.//span')
+    if spans:
+        return get_text(spans[0])
+    return get_text(td)
+
+
+def parse_grid_rows(source, base_url=None):
+    """
+    Analiza de una sola pasada todas las filas del gridView de Items.aspx.
+
+    source puede ser el HTML (driver.page_source o la respuesta HTTP) o un
+    documento lxml ya analizado. Devuelve una lista de diccionarios con:
+    - 'row': índice de la fila en la tabla (la fila 0 es el encabezado),
+    - 'item': el diccionario del artículo con las mismas claves que Antiques.py,
+    - 'gallery_url': enlace a la galería de imágenes (columna Pictures),
+    - 'edit_name' / 'edit_url': botón RptEdit (postback) o enlace de edición.
+    """
+    doc = parse_document(source) if isinstance(source, (str, bytes)) else source
+    grids = doc.xpath("//table[contains(concat(' ', normalize-space(@class), ' '), ' gridView ')]")
+    if not grids:
+        return []
+    rows = grids[0].xpath('./tbody/tr | ./tr')
+    parsed = []
+    for idx, row in enumerate(rows[1:], start=1):
+        inner_tables = row.xpath('.//table')
+        if not inner_tables:
+            continue
+        inner_rows = inner_tables[0].xpath('.//tr')
+        tds = inner_rows[0].xpath('.//td') if inner_rows else []
+        if len(tds) < 10:
+            continue
+        id_span = tds[2].xpath(".//span[contains(@id, '_RptIdItem')]")
+        item_id = get_text(id_span[0]) if id_span else ''
+        if not item_id:
+            print(f"[ERROR] Item sin ID en la fila {idx}. No se guarda.")
+            continue
+        featured_input = tds[7].xpath('.//input')
+        featured = 'Yes' if featured_input and featured_input[0].get('checked') is not None else 'No'
+        selects = tds[8].xpath('.//select')
+        if selects:
+            options = selects[0].xpath('.//option')
+            selected = [o for o in options if o.get('selected') is not None] or options[:1]
+            status = selected[0].get('value', get_text(selected[0])) if selected else ''
+        else:
+            status = get_cell_text(tds[8])
+        gallery = tds[5].xpath('.//a[@href]')
+        edit_name = None
+        edit_url = None
+        for td in tds:
+            for inp in td.xpath(".//input[@type='image'][@name]"):
+                if 'RptEdit' in inp.get('name'):
+                    edit_name = inp.get('name')
+                    break
+            if edit_name:
+                break
+        if not edit_name:
+            # Si no hay input, buscar <a> o <button> con texto/título de edición
+            for td in tds:
+                for el in td.xpath('.//a[@href] | .//button[@name]'):
+                    if 'edit' in el.text_content().lower() or 'edit' in (el.get('title') or '').lower():
+                        if el.tag == 'a':
+                            edit_url = urljoin(base_url or '', el.get('href'))
+                        else:
+                            edit_name = el.get('name')
+                        break
+                if edit_name or edit_url:
+                    break
+        parsed.append({
+            'row': idx,
+            'gallery_url': urljoin(base_url or '', gallery[0].get('href')) if gallery else None,
+            'edit_name': edit_name,
+            'edit_url': edit_url,
+            'item': {
+                'ID': item_id,
+                'Name': get_cell_text(tds[3]),
+                'Category': get_cell_text(tds[4]),
+                'Pictures': get_cell_text(tds[5]),
+                'Price': get_cell_text(tds[6]),
+                'Featured': featured,
+                'Status': status,
+                'Updated': get_cell_text(tds[9]),
+                'ImageLinks': [],
+                'DescriptionSummary': '',
+            },
+        })
+    return parsed
@@ -0,0 +1,309 @@
+# Scraper HTTP sin navegador que reproduce los postbacks de ASP.NET
+# -*- coding: utf-8 -*-
+"""
+HttpScraper
+-----------
+Alternativa a Antiques.py que no necesita Chrome ni Selenium.
+
+- Inicia sesión enviando el formulario de Logon.aspx con los campos de
+  config/login_config.py, o reutiliza las cookies guardadas de la ejecución
+  anterior si el panel todavía las acepta (scraping/session_cache.py).
+- Mantiene __VIEWSTATE / __EVENTVALIDATION entre postbacks del paginador
+  (__EVENTTARGET) dentro de una sesión HTTP con pool de conexiones.
+- Salta a cualquier página con un único postback gracias al mapa del
+  paginador (scraping/pager.py), que se aprende una vez y se guarda en disco.
+- Lee directamente el HTML de Items.aspx y de las galerías (ReorderList1), y
+  obtiene las descripciones (txtdesc) en segundo plano con DescriptionFetcher
+  mientras avanza el listado, sin esperas fijas.
+- Cada item se anexa al log de checkpoint JSONL de backup_manager al añadirse,
+  y su descripción cuando llega; con store=ItemStore también se guarda en el
+  almacén SQLite (backup/item_store.py).
+- En modo incremental (previous={ID: item}) sólo pide galería y descripción
+  de los items nuevos o modificados (scraping/incremental.py).
+"""
+from urllib.parse import urljoin
+
+from scraping.aspnet_forms import (
+    parse_document, get_hidden_fields, get_form_action, get_field_name,
+    parse_postback, build_postback, build_submit, create_session, post_retrying,
+)
+from scraping.description_fetcher import DescriptionFetcher
+from scraping.gallery_fetcher import fetch_gallery, fetch_galleries, collect_gallery_urls
+from scraping.grid_parser import parse_grid_rows
+from scraping.incremental import split_rows, load_previous
+from scraping.pager import PagerMap, PAGER_MAP_PATH, PAGING_PANEL_ID
+from scraping.session_cache import (
+    COOKIES_PATH, save_cookies, load_cookies, clear_cookies, cookies_from_session, apply_to_session, is_logged_in,
+)
+
+REWIND_LINK_ID = "ctl00_ContentPlaceHolderBody_pagelinkRewind"
+NEXT_LABELS = ['»', '>>', 'Next', '>|']
+PREV_LABELS = ['«', '<<']
+
+
+class HttpScraper:
+    def __init__(self, config, backup_manager=None, pool_size=8, timeout=30, pager_path=PAGER_MAP_PATH,
+                 previous=None, cookies_path=COOKIES_PATH, store=None):
+        self.config = config
+        self.backup_manager = backup_manager
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.cookies_path = cookies_path
+        self.store = store
+        self.session = create_session(pool_size)
+        self.all_data = []
+        self.seen_ids = set()
+        # Estado del último listado recibido (campos ocultos + documento)
+        self.doc = None
+        self.url = None
+        self.state = {}
+        self.pager = PagerMap(pager_path)
+        self.descriptions = DescriptionFetcher(self.session, timeout=timeout,
+                                               on_done=self.checkpoint_description)
+        # Registros de la ejecución anterior para el modo incremental
+        self.previous = previous or {}
+
+    # --- Peticiones ---------------------------------------------------------
+
+    def _load(self, response):
+        response.raise_for_status()
+        self.url = response.url
+        self.doc = parse_document(response.content, response.url)
+        self.state = get_hidden_fields(self.doc)
+        self.pager.learn(self.doc, get_form_action(self.doc, self.url), self.state)
+        return self.doc
+
+    def get(self, url):
+        return self._load(self.session.get(url, timeout=self.timeout))
+
+    def post(self, payload, retries=0):
+        action = get_form_action(self.doc, self.url)
+        return self._load(post_retrying(self.session, action, payload, retries=retries, timeout=self.timeout))
+
+    def postback(self, target, argument=''):
+        """Equivalente HTTP a __doPostBack(target, argument) sobre el listado actual."""
+        # Un 5xx no cambia self.state, así que el mismo postback sigue siendo válido
+        return self.post(build_postback(self.state, target, argument), retries=2)
+
+    # --- Login y listado ----------------------------------------------------
+
+    def restore_session(self):
+        """Prueba las cookies guardadas abriendo Items.aspx. True si la sesión sigue siendo válida."""
+        cookies = load_cookies(self.cookies_path)
+        if not cookies:
+            return False
+        apply_to_session(self.session, cookies)
+        try:
+            self.open_items()
+        except Exception as e:
+            print(f"[SESSION] Cookies guardadas no válidas: {e}")
+        if self.url and is_logged_in(self.url) and self.has_grid():
+            return True
+        self.session.cookies.clear()
+        clear_cookies(self.cookies_path)
+        return False
+
+    def login(self):
+        print("\n=== INICIANDO SESIÓN (HTTP) ===")
+        if self.restore_session():
+            print("✅ Sesión restaurada desde cookies guardadas")
+            return
+        self.get(self.config.LOGIN_URL)
+        user_name = get_field_name(self.doc, self.config.USERNAME_FIELD)
+        pass_name = get_field_name(self.doc, self.config.PASSWORD_FIELD)
+        button = self.doc.xpath('//*[@id=$bid]', bid=self.config.LOGIN_BUTTON)
+        if not user_name or not pass_name or not button:
+            raise Exception("No se encontraron los campos de login en el formulario")
+        button = button[0]
+        payload = build_submit(self.state, button.get('name'),
+                               button.get('type', 'submit'), button.get('value', ''))
+        payload[user_name] = self.config.USERNAME
+        payload[pass_name] = self.config.PASSWORD
+        self.post(payload)
+        if 'Admin' not in self.url:
+            raise Exception(f"Login fallido, URL actual: {self.url}")
+        save_cookies(cookies_from_session(self.session), self.cookies_path)
+        print("✅ Login exitoso")
+
+    def has_grid(self, doc=None):
+        doc = doc if doc is not None else self.doc
+        return doc is not None and bool(doc.xpath("//table[contains(@class, 'gridView')]"))
+
+    def open_items(self):
+        self.get(self.config.ITEMS_URL)
+        if not self.has_grid():
+            raise Exception("La página de items no contiene la tabla gridView")
+        return self.doc
+
+    # --- Paginación ---------------------------------------------------------
+
+    def pager_links(self, doc=None):
+        """Lista de (texto, id, href) de los enlaces a.PagingLink del paginador."""
+        doc = doc if doc is not None else self.doc
+        panel = doc.xpath('//*[@id=$pid]', pid=PAGING_PANEL_ID)
+        scope = panel[0] if panel else doc
+        links = []
+        for a in scope.xpath(".//a[contains(concat(' ', normalize-space(@class), ' '), ' PagingLink ')]"):
+            links.append((a.text_content().strip(), a.get('id', ''), a.get('href', '')))
+        return links
+
+    def current_page(self, doc=None):
+        doc = doc if doc is not None else self.doc
+        current = doc.xpath("//*[contains(concat(' ', normalize-space(@class), ' '), ' PagingLinkCurrent ')]")
+        if not current:
+            return None
+        text = current[0].text_content().strip()
+        return int(text) if text.isdigit() else None
+
+    def _follow(self, href):
+        postback = parse_postback(href)
+        if postback:
+            return self.postback(*postback)
+        return self.get(urljoin(self.url, href))
+
+    def jump_to_page(self, target_page):
+        """Salta a target_page con un único postback usando el mapa del paginador."""
+        jump = self.pager.postback_for(target_page)
+        if not jump:
+            return False
+        url, state, target, argument = jump
+        try:
+            self._load(self.session.post(url, data=build_postback(state, target, argument),
+                                         timeout=self.timeout))
+        except Exception as e:
+            print(f"[PAGER] Error saltando a la página {target_page}: {e}")
+        if self.current_page() == target_page:
+            return True
+        print(f"[PAGER] El salto directo a la página {target_page} no es válido, se recorre el paginador")
+        self.pager.forget(target_page)
+        return False
+
+    def map_pages(self, max_steps=30):
+        """Recorre los bloques del paginador con '»' para aprender todas las páginas."""
+        for _ in range(max_steps):
+            step = next((href for text, _, href in self.pager_links() if text in NEXT_LABELS), None)
+            if not step:
+                break
+            self._follow(step)
+        self.pager.flush()
+        return sorted(self.pager.entries)
+
+    def go_to_page(self, target_page, max_steps=30):
+        """
+        Navega a target_page: primero con un salto directo del mapa del paginador
+        y, si no se conoce, con un postback por paso del paginador.
+        """
+        if self.current_page() == target_page or self.jump_to_page(target_page):
+            return True
+        for _ in range(max_steps):
+            if self.current_page() == target_page:
+                return True
+            links = self.pager_links()
+            visible = {int(text): href for text, _, href in links if text.isdigit()}
+            if target_page in visible:
+                self._follow(visible[target_page])
+                continue
+            step = None
+            if visible and target_page > max(visible):
+                step = next((href for text, _, href in links if text in NEXT_LABELS), None)
+            elif visible and target_page < min(visible):
+                step = next((href for text, lid, href in links
+                             if lid == REWIND_LINK_ID or text in PREV_LABELS), None)
+            if not step:
+                print(f"❌ No se pudo avanzar a la página {target_page} desde la página {self.current_page()}")
+                return False
+            self._follow(step)
+        print(f"❌ No se pudo navegar a la página {target_page} después de {max_steps} pasos")
+        return False
+
+    # --- Filas, galería y descripción ---------------------------------------
+
+    def parse_rows(self, doc=None):
+        """Extrae las filas del gridView junto con el enlace de galería y de edición."""
+        return parse_grid_rows(doc if doc is not None else self.doc, self.url)
+
+    def get_item_images(self, gallery_url):
+        """Descarga la página de galería y devuelve los enlaces de imagen (https)."""
+        try:
+            return fetch_gallery(self.session, gallery_url, self.timeout)
+        except Exception as e:
+            print(f"[ERROR] Error obteniendo imágenes: {str(e)}")
+            return []
+
+    # --- Bucle principal ----------------------------------------------------
+
+    def add_item(self, item):
+        if item['ID'] in self.seen_ids:
+            print(f"[WARN] ID global duplicado: {item['ID']}. Saltando.")
+            return False
+        self.all_data.append(item)
+        self.seen_ids.add(item['ID'])
+        if self.backup_manager:
+            self.backup_manager.checkpoint_item(item)
+        if self.store is not None:
+            self.store.upsert(item)
+        return True
+
+    def checkpoint_description(self, item):
+        """Anexa al log la descripción que llega después de haber añadido el item."""
+        record = {'ID': item['ID'], 'DescriptionSummary': item['DescriptionSummary']}
+        if self.backup_manager:
+            self.backup_manager.checkpoint_item(record)
+        if self.store is not None:
+            self.store.upsert(record)
+
+    def scrape_page(self, page):
+        if not self.go_to_page(page):
+            return None
+        rows = [row for row in self.parse_rows() if row['item']['ID'] not in self.seen_ids]
+        # Los items sin cambios ya traen ImageLinks y DescriptionSummary guardados
+        changed, unchanged = split_rows(rows, self.previous)
+        # Todas las galerías de la página se descargan en paralelo
+        images = fetch_galleries(self.session, collect_gallery_urls(changed), self.pool_size, self.timeout)
+        # Las descripciones se piden en segundo plano con el estado de esta página
+        self.descriptions.submit_page(changed, self.doc, self.url)
+        for row in changed:
+            row['item']['ImageLinks'] = images.get(row['item']['ID'], [])
+        for row in rows:
+            self.add_item(row['item'])
+        print(f"[INFO] Page {page} processed with {len(rows)} items found ({len(unchanged)} sin cambios)")
+        return rows
+
+    def run(self, start_page, end_page):
+        if self.backup_manager:
+            self.backup_manager.open_checkpoint(reset=True)
+        self.login()
+        # Tras restaurar la sesión (o la redirección del login) el listado ya está cargado
+        if 'Items.aspx' not in self.url or not self.has_grid():
+            self.open_items()
+        try:
+            for page in range(start_page, end_page + 1):
+                print(f"\n--- Processing page {page} ---")
+                if self.scrape_page(page) is None:
+                    print("🔚 No hay más páginas disponibles")
+                    break
+        except KeyboardInterrupt:
+            print("[INTERRUPT] Script interrupted by user. Saving backup...")
+        finally:
+            self.descriptions.wait()
+            self.descriptions.close()
+            # El mapa del paginador se guarda una vez al final, no en cada respuesta
+            self.pager.flush()
+            if self.backup_manager:
+                self.backup_manager.close_checkpoint()
+            if self.store is not None:
+                self.store.commit()
+        return self.all_data
+
+
+if __name__ == "__main__":
+    import sys
+    from config import login_config
+    from backup import backup_manager
+    from backup.item_store import ItemStore
+
+    previous = load_previous() if '--incremental' in sys.argv else None
+    with ItemStore() as store:
+        scraper = HttpScraper(login_config, backup_manager, previous=previous, store=store)
+        scraper.run(1, 43)
+    backup_manager.compact_checkpoint()
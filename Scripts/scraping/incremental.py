@@ -0,0 +1,98 @@
+# Scraping incremental: sólo se reabren los items nuevos o modificados
+# -*- coding: utf-8 -*-
+"""
+incremental
+-----------
+La mayoría de los ~1.270 items no cambian entre ejecuciones (muchos tienen
+Updated de 2016 o 2019), pero cada pasada completa vuelve a abrir su galería y
+su página de edición.
+
+En modo incremental cada fila del listado se compara con el registro guardado
+de la ejecución anterior (output/items_all.json) por las columnas que el
+listado ya muestra: Updated, Price, Status y Pictures.
+
+- Si coinciden, se reutilizan ImageLinks y DescriptionSummary del registro
+  guardado y no se hace ninguna petición más.
+- Si el item es nuevo o alguna columna ha cambiado, se descargan galería y
+  descripción como en una pasada completa.
+- También si el registro guardado quedó incompleto: sin ImageLinks aunque
+  Pictures no sea 0, o sin DescriptionSummary. Un fallo puntual al descargarlos
+  deja [] o '' y no debe quedarse fijo en todas las ejecuciones siguientes.
+"""
+import os
+
+from backup.compact_item import CompactItem
+from backup.item_store import load_items
+from data_processing.csv_to_json import parse_image_links
+from data_processing.value_parsers import parse_pictures
+
+PREVIOUS_PATH = 'output/items_all.json'
+CHANGE_FIELDS = ('Updated', 'Price', 'Status', 'Pictures')
+REUSED_FIELDS = ('ImageLinks', 'DescriptionSummary')
+
+
+def compact_previous(items):
+    """{ID: CompactItem} de los registros anteriores; los que no tienen ID se omiten."""
+    return {str(item['ID']): CompactItem.from_dict(item) for item in items if item.get('ID')}
+
+
+def load_previous(path=PREVIOUS_PATH):
+    """
+    Carga la exportación anterior (JSON o almacén SQLite .db) como
+    {ID: CompactItem}. Devuelve {} si no existe.
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        data = load_items(path)
+    except Exception as e:
+        print(f"⚠️ Error cargando datos existentes: {e}")
+        return {}
+    previous = compact_previous(data)
+    print(f"📂 Modo incremental: {len(previous)} items previos cargados desde {path}")
+    return previous
+
+
+def is_incomplete(stored):
+    """True si al registro guardado le falta la galería (con Pictures > 0) o la descripción."""
+    if not stored.get('DescriptionSummary'):
+        return True
+    return bool(parse_pictures(stored.get('Pictures'))) and not parse_image_links(stored.get('ImageLinks'))
+
+
+def is_changed(item, stored):
+    """
+    True si el item es nuevo, si alguna columna de CHANGE_FIELDS difiere del
+    registro guardado o si éste está incompleto (is_incomplete).
+    """
+    if stored is None or is_incomplete(stored):
+        return True
+    return any(str(item.get(field, '')).strip() != str(stored.get(field, '')).strip()
+               for field in CHANGE_FIELDS)
+
+
+def reuse_stored(item, stored):
+    """Copia en item los campos caros (galería y descripción) del registro guardado."""
+    for field in REUSED_FIELDS:
+        if field in stored:
+            item[field] = stored[field]
+    return item
+
+
+def split_rows(page_rows, previous):
+    """
+    Separa las filas de una página (parse_grid_rows) en (cambiadas, sin cambios).
+    A las filas sin cambios se les rellenan ya ImageLinks y DescriptionSummary.
+    Sin datos previos todas las filas cuentan como cambiadas.
+    """
+    if not previous:
+        return list(page_rows), []
+    changed, unchanged = [], []
+    for row in page_rows:
+        stored = previous.get(row['item']['ID'])
+        if is_changed(row['item'], stored):
+            changed.append(row)
+        else:
+            reuse_stored(row['item'], stored)
+            unchanged.append(row)
+    return changed, unchanged
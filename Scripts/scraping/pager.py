@@ -0,0 +1,202 @@
+# Mapa de direcciones del paginador para saltar directamente a cualquier página
+# -*- coding: utf-8 -*-
+"""
+PagerMap
+--------
+El paginador de Items.aspx sólo muestra un bloque de páginas y obliga a pulsar
+«/» hasta que aparece el enlace buscado. ASP.NET valida cada postback contra el
+__VIEWSTATE/__EVENTVALIDATION de la respuesta en la que se pintó el enlace, así
+que para cada página se guarda:
+
+- el destino del postback (__EVENTTARGET / __EVENTARGUMENT),
+- los campos ocultos de la última respuesta en la que el enlace era visible.
+
+Con eso cualquier página se alcanza con un único postback, tanto por HTTP
+(HttpScraper) como en el navegador (jump_with_driver). El mapa se guarda en
+output/pager_map.json para reutilizarlo entre ejecuciones; los estados que ya
+no usa ninguna entrada se eliminan, así que el fichero no crece con cada
+bloque visitado.
+
+Cada respuesta trae un __VIEWSTATE nuevo, así que learn() cambia el mapa en
+casi todas las navegaciones. Por eso learn() no escribe a disco: con un
+BackgroundWriter encola la instantánea (las versiones pendientes se
+coalescen) y sin él sólo marca el mapa como modificado hasta flush().
+"""
+import json
+import os
+import time
+
+from backup.background_writer import write_atomic
+from scraping.aspnet_forms import parse_document, get_hidden_fields, parse_postback
+
+PAGING_PANEL_ID = "ctl00_ContentPlaceHolderBody_PanelDataListPaging"
+PAGER_MAP_PATH = 'output/pager_map.json'
+NEXT_LABELS = ('»', '>>', 'Next', '>|')
+
+# Restaura los campos ocultos guardados en el formulario y lanza el postback
+JS_JUMP = """
+var state = arguments[0];
+var form = document.forms[0];
+for (var name in state) {
+    var field = form.elements[name];
+    if (field) { field.value = state[name]; }
+}
+__doPostBack(arguments[1], arguments[2]);
+"""
+JS_CURRENT_PAGE = """
+var e = document.querySelector('.PagingLinkCurrent');
+return e ? e.textContent.trim() : null;
+"""
+
+
+def read_pager(doc):
+    """Devuelve (página actual, {página: (target, argument)}) de un documento lxml."""
+    panel = doc.xpath('//*[@id=$pid]', pid=PAGING_PANEL_ID)
+    scope = panel[0] if panel else doc
+    current = scope.xpath(".//*[contains(concat(' ', normalize-space(@class), ' '), ' PagingLinkCurrent ')]")
+    current_page = None
+    if current and current[0].text_content().strip().isdigit():
+        current_page = int(current[0].text_content().strip())
+    links = {}
+    for a in scope.xpath(".//a[contains(concat(' ', normalize-space(@class), ' '), ' PagingLink ')]"):
+        text = a.text_content().strip()
+        postback = parse_postback(a.get('href'))
+        if text.isdigit() and postback:
+            links[int(text)] = postback
+    return current_page, links
+
+
+def is_last_page(doc):
+    """
+    True sólo si el paginador de doc confirma que no hay página posterior: se
+    conoce la página actual y no hay enlace » ni enlace a una página mayor.
+    """
+    current_page, links = read_pager(doc)
+    if current_page is None or any(page > current_page for page in links):
+        return False
+    panel = doc.xpath('//*[@id=$pid]', pid=PAGING_PANEL_ID)
+    scope = panel[0] if panel else doc
+    return not any(a.text_content().strip() in NEXT_LABELS for a in scope.xpath('.//a'))
+
+
+class PagerMap:
+    def __init__(self, path=PAGER_MAP_PATH, writer=None):
+        self.path = path
+        self.writer = writer  # BackgroundWriter opcional para guardar fuera del bucle
+        self.states = []    # campos ocultos de cada bloque del paginador visto
+        self.entries = {}   # página -> [índice de estado, target, argument, url]
+        self.dirty = False  # hay cambios sin guardar
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.states = data.get('states', [])
+            self.entries = {int(page): entry for page, entry in data.get('entries', {}).items()}
+            print(f"[PAGER] Mapa del paginador cargado: {len(self.entries)} páginas")
+        except Exception as e:
+            print(f"[PAGER] No se pudo cargar {self.path}: {e}")
+            self.states, self.entries = [], {}
+
+    def save(self):
+        """Guarda el mapa: encolado en el writer si lo hay o, si no, en el momento."""
+        if not self.path:
+            return
+        # Copia: learn() sigue modificando el mapa mientras el writer lo serializa
+        data = {'states': list(self.states),
+                'entries': {page: list(entry) for page, entry in self.entries.items()}}
+        if self.writer is not None:
+            self.writer.write_snapshot(self.path, lambda f: json.dump(data, f, ensure_ascii=False))
+        else:
+            write_atomic(self.path, lambda f: json.dump(data, f, ensure_ascii=False))
+        self.dirty = False
+
+    def flush(self):
+        """Guarda el mapa si tiene cambios pendientes."""
+        if self.dirty:
+            self.save()
+
+    def clear(self):
+        self.states, self.entries = [], {}
+
+    def __contains__(self, page):
+        return page in self.entries
+
+    def learn(self, doc, url, hidden_fields=None):
+        """
+        Registra los enlaces visibles del paginador de una respuesta.
+        Devuelve la página actual del documento.
+        """
+        current_page, links = read_pager(doc)
+        if not links:
+            return current_page
+        # Las páginas ya conocidas también pasan al estado más reciente: el viejo puede caducar
+        state = hidden_fields if hidden_fields is not None else get_hidden_fields(doc)
+        if state in self.states:
+            state_idx = self.states.index(state)
+        else:
+            self.states.append(state)
+            state_idx = len(self.states) - 1
+        changed = False
+        for page, (target, argument) in links.items():
+            entry = [state_idx, target, argument, url]
+            if self.entries.get(page) != entry:
+                self.entries[page] = entry
+                changed = True
+        if changed:
+            self.prune()
+            self.dirty = True
+            if self.writer is not None:
+                self.save()
+        return current_page
+
+    def learn_html(self, html, url):
+        return self.learn(parse_document(html), url)
+
+    def forget(self, page):
+        """Elimina una entrada que ya no es válida (p. ej. viewstate caducado)."""
+        if self.entries.pop(page, None) is not None:
+            self.prune()
+            self.save()
+
+    def prune(self):
+        """Elimina los estados que ya no usa ninguna entrada y renumera las entradas."""
+        used = sorted({entry[0] for entry in self.entries.values()})
+        if len(used) == len(self.states):
+            return
+        renumber = {old: new for new, old in enumerate(used)}
+        self.states = [self.states[old] for old in used]
+        for entry in self.entries.values():
+            entry[0] = renumber[entry[0]]
+
+    def postback_for(self, page):
+        """Devuelve (url, campos ocultos, target, argument) para saltar a page, o None."""
+        entry = self.entries.get(page)
+        if not entry:
+            return None
+        state_idx, target, argument, url = entry
+        return url, self.states[state_idx], target, argument
+
+    def jump_with_driver(self, driver, target_page, timeout=10):
+        """Salta a target_page en el navegador con un único postback."""
+        jump = self.postback_for(target_page)
+        if not jump:
+            return False
+        _, state, target, argument = jump
+        try:
+            driver.execute_script(JS_JUMP, state, target, argument)
+            deadline = time.time() + timeout
+            while time.time() < deadline:
+                try:
+                    if driver.execute_script(JS_CURRENT_PAGE) == str(target_page):
+                        return True
+                except Exception:
+                    pass  # la página se está recargando
+                time.sleep(0.1)
+        except Exception as e:
+            print(f"[PAGER] Error saltando a la página {target_page}: {e}")
+        self.forget(target_page)
+        return False
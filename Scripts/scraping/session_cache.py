@@ -0,0 +1,112 @@
+# Caché de la sesión autenticada y de la ruta de ChromeDriver entre ejecuciones
+# -*- coding: utf-8 -*-
+"""
+session_cache
+-------------
+Evita el coste fijo de arranque de cada ejecución:
+
+- Las cookies de la sesión autenticada (ASP.NET_SessionId, .ASPXAUTH...) se
+  guardan en output/session_cookies.json. En la siguiente ejecución se cargan
+  y se revalidan pidiendo Items.aspx; si el panel no redirige a Logon.aspx se
+  omite el login completo.
+- La ruta del binario de ChromeDriver se resuelve desde caché local
+  (CHROMEDRIVER_PATH, output/chromedriver_path.txt, la caché de
+  webdriver_manager en ~/.wdm o el PATH) sin ninguna consulta de red. Sólo si
+  no hay ningún binario se recurre a ChromeDriverManager().install().
+
+Las cookies se guardan en el formato de Selenium (driver.get_cookies()), que
+sirve tanto para el navegador como para una sesión requests.
+"""
+import glob
+import json
+import os
+import shutil
+import time
+
+from backup.background_writer import write_atomic
+
+COOKIES_PATH = 'output/session_cookies.json'
+DRIVER_PATH_CACHE = 'output/chromedriver_path.txt'
+WDM_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.wdm')
+DRIVER_NAMES = ('chromedriver', 'chromedriver.exe')
+
+
+# --- Cookies ------------------------------------------------------------------
+
+def save_cookies(cookies, path=COOKIES_PATH):
+    """Guarda una lista de cookies en formato Selenium."""
+    if not path:
+        return
+    cookies = list(cookies)
+    write_atomic(path, lambda f: json.dump(cookies, f, ensure_ascii=False, indent=2))
+
+
+def load_cookies(path=COOKIES_PATH, now=None):
+    """Carga las cookies guardadas descartando las caducadas. Devuelve [] si no hay."""
+    if not path or not os.path.exists(path):
+        return []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cookies = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Error cargando cookies de sesión: {e}")
+        return []
+    now = time.time() if now is None else now
+    return [c for c in cookies if 'expiry' not in c or c['expiry'] > now]
+
+
+def clear_cookies(path=COOKIES_PATH):
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def cookies_from_session(session):
+    """Convierte las cookies de una sesión requests al formato Selenium."""
+    cookies = []
+    for cookie in session.cookies:
+        data = {'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain,
+                'path': cookie.path or '/', 'secure': bool(cookie.secure)}
+        if cookie.expires:
+            data['expiry'] = cookie.expires
+        cookies.append(data)
+    return cookies
+
+
+def apply_to_session(session, cookies):
+    for cookie in cookies:
+        session.cookies.set(cookie['name'], cookie['value'],
+                            domain=cookie.get('domain'), path=cookie.get('path', '/'))
+
+
+def is_logged_in(url):
+    """El panel redirige a Logon.aspx cuando la sesión no es válida."""
+    return 'Logon' not in url and 'Admin' in url
+
+
+# --- ChromeDriver -------------------------------------------------------------
+
+def _wdm_driver_paths(cache_dir=WDM_CACHE_DIR):
+    """Binarios de ChromeDriver ya descargados por webdriver_manager, el más reciente primero."""
+    paths = []
+    for name in DRIVER_NAMES:
+        paths += glob.glob(os.path.join(cache_dir, 'drivers', 'chromedriver', '**', name), recursive=True)
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+def resolve_driver_path(cache_path=DRIVER_PATH_CACHE, cache_dir=WDM_CACHE_DIR):
+    """Ruta de ChromeDriver sin consultas de red, o None si no hay ninguno en local."""
+    candidates = [os.environ.get('CHROMEDRIVER_PATH')]
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            candidates.append(f.read().strip())
+    candidates += _wdm_driver_paths(cache_dir)
+    candidates += [shutil.which(name) for name in DRIVER_NAMES]
+    for path in candidates:
+        if path and os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+    return None
+
+
+def remember_driver_path(path, cache_path=DRIVER_PATH_CACHE):
+    if cache_path and path:
+        write_atomic(cache_path, lambda f: f.write(path))
@@ -0,0 +1,102 @@
+# Pool de sesiones HTTP autenticadas, una por petición concurrente
+# -*- coding: utf-8 -*-
+"""
+SessionPool
+-----------
+ASP.NET serializa las peticiones de una misma sesión (la cookie
+ASP.NET_SessionId bloquea el estado de sesión mientras dura cada petición), así
+que varios hilos con la misma sesión, o con la del navegador, se ejecutan de
+uno en uno. El pool reparte sesiones requests con su propio cookie jar y su
+propio login (login_session) y presta cada una a una sola petición a la vez.
+
+Las sesiones se crean bajo demanda, hasta size, la primera vez que no hay
+ninguna libre; después se reutilizan. Tiene la interfaz get/post de
+requests.Session, así que fetch_gallery y fetch_description lo usan tal cual.
+"""
+import queue
+import threading
+
+from scraping.aspnet_forms import (
+    create_session, parse_document, get_hidden_fields, get_form_action, get_field_name, build_submit,
+)
+
+POOL_SIZE = 4
+
+
+def login_session(config, pool_size=1):
+    """Crea una sesión requests nueva e inicia sesión por HTTP con el formulario de login."""
+    session = create_session(pool_size)
+    try:
+        response = session.get(config.LOGIN_URL, timeout=30)
+        response.raise_for_status()
+        doc = parse_document(response.content, response.url)
+        user_name = get_field_name(doc, config.USERNAME_FIELD)
+        pass_name = get_field_name(doc, config.PASSWORD_FIELD)
+        button = doc.xpath('//*[@id=$bid]', bid=config.LOGIN_BUTTON)
+        if not user_name or not pass_name or not button:
+            raise Exception("No se encontraron los campos de login en el formulario")
+        payload = build_submit(get_hidden_fields(doc), button[0].get('name'),
+                               button[0].get('type', 'submit'), button[0].get('value', ''))
+        payload[user_name] = config.USERNAME
+        payload[pass_name] = config.PASSWORD
+        response = session.post(get_form_action(doc, response.url), data=payload, timeout=30)
+        response.raise_for_status()
+        if 'Admin' not in response.url:
+            raise Exception(f"Login fallido, URL actual: {response.url}")
+    except BaseException:
+        session.close()
+        raise
+    return session
+
+
+class SessionPool:
+    def __init__(self, factory, size=POOL_SIZE):
+        self.factory = factory  # crea una sesión nueva ya autenticada
+        self.size = size
+        self.idle = queue.LifoQueue()
+        self.sessions = []
+        self.lock = threading.Lock()
+
+    def _acquire(self):
+        while True:
+            try:
+                return self.idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self.lock:
+                create = len(self.sessions) < self.size
+                if create:
+                    self.sessions.append(None)  # plaza reservada mientras se hace el login
+            if create:
+                break
+            try:
+                return self.idle.get(timeout=1)
+            except queue.Empty:
+                pass  # si falló un login en curso queda una plaza libre: se vuelve a mirar
+        try:
+            session = self.factory()
+        except BaseException:
+            with self.lock:
+                self.sessions.remove(None)
+            raise
+        with self.lock:
+            self.sessions[self.sessions.index(None)] = session
+        return session
+
+    def request(self, method, url, **kwargs):
+        session = self._acquire()
+        try:
+            return session.request(method, url, **kwargs)
+        finally:
+            self.idle.put(session)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.request('POST', url, data=data, **kwargs)
+
+    def close(self):
+        for session in self.sessions:
+            if session is not None:
+                session.close()
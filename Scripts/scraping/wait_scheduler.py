@@ -0,0 +1,105 @@
+# Esperas adaptativas basadas en condiciones en lugar de pausas fijas
+# -*- coding: utf-8 -*-
+"""
+AdaptiveWait
+------------
+Sustituye los time.sleep fijos del scraper por esperas sobre condiciones
+reales del DOM (WebDriverWait con sondeo rápido) y aprende la latencia
+observada de cada tipo de página ('login', 'listing', 'pager', 'edit'...).
+
+- El timeout de cada espera es un múltiplo del percentil 95 observado para ese
+  tipo de página, acotado entre min_timeout y max_timeout.
+- backoff() sólo pausa cuando la última respuesta fue claramente más lenta que
+  la mediana, es decir, cuando el sitio está realmente lento.
+- retry_backoff(attempt) es la pausa tras un error: como mínimo retry_delay,
+  duplicada en cada intento (hasta max_backoff), para no reintentar en bucle
+  contra el sitio cuando un find_element o un clic fallan al instante.
+
+Se puede pasar como `wait` a las funciones de browser_session, ya que expone
+el mismo método until(condition) que WebDriverWait.
+"""
+import math
+import time
+from collections import defaultdict, deque
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+DEFAULT_PAGE_TYPE = 'page'
+
+
+def percentile(samples, pct):
+    """Percentil por el método del rango más cercano (samples no vacío)."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class AdaptiveWait:
+    def __init__(self, driver, min_timeout=5, max_timeout=30, factor=3, window=50,
+                 poll_frequency=0.1, slow_ratio=2, max_backoff=10, retry_delay=2):
+        self.driver = driver
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.factor = factor
+        self.poll_frequency = poll_frequency
+        self.slow_ratio = slow_ratio
+        self.max_backoff = max_backoff
+        self.retry_delay = retry_delay
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, page_type, elapsed):
+        self.samples[page_type].append(elapsed)
+
+    def timeout_for(self, page_type):
+        samples = self.samples.get(page_type)
+        if not samples or len(samples) < 5:
+            return self.max_timeout
+        return max(self.min_timeout, min(self.max_timeout, percentile(samples, 95) * self.factor))
+
+    def until(self, condition, page_type=DEFAULT_PAGE_TYPE):
+        """Espera a que se cumpla condition y registra cuánto ha tardado."""
+        start = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, self.timeout_for(page_type),
+                                   poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            self.record(page_type, time.monotonic() - start)
+            raise
+        self.record(page_type, time.monotonic() - start)
+        return result
+
+    def is_slow(self, page_type=DEFAULT_PAGE_TYPE):
+        samples = self.samples.get(page_type)
+        if not samples or len(samples) < 5:
+            return False
+        return samples[-1] > self.slow_ratio * percentile(samples, 50)
+
+    def backoff(self, page_type=DEFAULT_PAGE_TYPE):
+        """Pausa sólo si el sitio está lento; devuelve los segundos esperados."""
+        if not self.is_slow(page_type):
+            return 0
+        samples = self.samples[page_type]
+        delay = min(self.max_backoff, samples[-1] - percentile(samples, 50))
+        print(f"[WAIT] '{page_type}' lento ({samples[-1]:.1f}s), esperando {delay:.1f}s")
+        time.sleep(delay)
+        return delay
+
+    def retry_backoff(self, attempt, page_type=DEFAULT_PAGE_TYPE):
+        """
+        Pausa antes del reintento `attempt` (1, 2, ...) tras un error:
+        retry_delay * 2^(attempt-1) hasta max_backoff, o más si el sitio está lento.
+        Devuelve los segundos esperados.
+        """
+        delay = min(self.max_backoff, self.retry_delay * 2 ** (max(1, attempt) - 1))
+        if self.is_slow(page_type):
+            samples = self.samples[page_type]
+            delay = max(delay, min(self.max_backoff, samples[-1] - percentile(samples, 50)))
+        print(f"[WAIT] Reintento {attempt} de '{page_type}' en {delay:.1f}s")
+        time.sleep(delay)
+        return delay
+
+    def summary(self):
+        """{tipo de página: (n, p50, p95)} de las latencias observadas."""
+        return {page_type: (len(samples), percentile(samples, 50), percentile(samples, 95))
+                for page_type, samples in self.samples.items() if samples}
@@ -0,0 +1,156 @@
+# Pool de navegadores que reparte el rango de páginas entre varios workers
+# -*- coding: utf-8 -*-
+"""
+worker_pool
+-----------
+Arranca N procesos, cada uno con su propio Chrome y su propia sesión, y les
+asigna bloques disjuntos de páginas de START_PAGE..END_PAGE. Los resultados se
+fusionan por ID con la misma protección contra IDs duplicados de Antiques.py.
+
+Si un worker falla (Chrome no arranca, se pierde la sesión...), sólo sus
+páginas pendientes se vuelven a repartir; el resto del trabajo se conserva.
+
+Cada worker guarda sus cookies en un fichero propio (worker_cookies_path): si
+compartieran la sesión ASP.NET de Antiques.py, el servidor atendería sus
+peticiones de una en una y el paralelismo no serviría de nada.
+
+Con previous={ID: item} (modo incremental) cada worker sólo descarga galería y
+descripción de los items nuevos o modificados.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from scraping.aspnet_forms import parse_document
+from scraping.browser_session import create_driver, login_cached, open_items, navigate_to_page
+from scraping.session_cache import COOKIES_PATH
+from scraping.description_fetcher import DescriptionFetcher
+from scraping.gallery_fetcher import session_from_driver, collect_gallery_urls, fetch_galleries
+from scraping.grid_parser import parse_grid_rows
+from scraping.incremental import split_rows, load_previous
+from scraping.pager import PagerMap
+from scraping.wait_scheduler import AdaptiveWait
+
+START_PAGE = 1
+END_PAGE = 43
+
+
+def split_pages(pages, workers):
+    """Divide la lista ordenada de páginas en como mucho `workers` bloques contiguos y disjuntos."""
+    pages = list(pages)
+    workers = max(1, min(workers, len(pages)))
+    size, extra = divmod(len(pages), workers)
+    slices, pos = [], 0
+    for i in range(workers):
+        count = size + (1 if i < extra else 0)
+        slices.append(pages[pos:pos + count])
+        pos += count
+    return [s for s in slices if s]
+
+
+def worker_cookies_path(index):
+    """output/session_cookies.json -> output/session_cookies_worker1.json"""
+    root, ext = os.path.splitext(COOKIES_PATH)
+    return f'{root}_worker{index}{ext}'
+
+
+def scrape_listing_page(driver, wait, pager, session, descriptions, page, previous=None):
+    """
+    Extrae todos los items de una página del listado con el navegador ya logueado.
+    Las descripciones quedan encoladas en `descriptions` y se completan por ID.
+    """
+    if not navigate_to_page(driver, wait, page, pager):
+        raise Exception(f"No se pudo llegar a la página {page}")
+    doc = parse_document(driver.page_source)
+    page_rows = parse_grid_rows(doc, driver.current_url)
+    changed, _ = split_rows(page_rows, previous)
+    images = fetch_galleries(session, collect_gallery_urls(changed))
+    descriptions.submit_page(changed, doc, driver.current_url)
+    for parsed in changed:
+        parsed['item']['ImageLinks'] = images.get(parsed['item']['ID'], [])
+    return [parsed['item'] for parsed in page_rows]
+
+
+def scrape_slice(pages, headless=True, previous=None, index=0):
+    """
+    Trabajo de un worker: inicia su propio navegador, con la sesión del bloque
+    `index`, y extrae sus páginas. Devuelve ({página: items}, páginas fallidas).
+    """
+    worker = os.getpid()
+    driver = create_driver(headless)
+    wait = AdaptiveWait(driver)
+    items, failed = {}, []
+    try:
+        if not login_cached(driver, wait, path=worker_cookies_path(index)):
+            open_items(driver, wait)
+        # Mapa propio en memoria: varios procesos no deben escribir el mismo fichero
+        pager = PagerMap(None)
+        session = session_from_driver(driver)
+        descriptions = DescriptionFetcher(session)
+        for page in pages:
+            try:
+                page_items = scrape_listing_page(driver, wait, pager, session, descriptions, page, previous)
+                items[page] = page_items
+                print(f"[WORKER {worker}] Página {page}: {len(page_items)} items")
+            except Exception as e:
+                print(f"[WORKER {worker}] Error en la página {page}: {e}")
+                failed.append(page)
+        descriptions.wait()
+        descriptions.close()
+    finally:
+        driver.quit()
+    return items, failed
+
+
+def merge_by_id(chunks):
+    """Fusiona listas de items por ID; los IDs repetidos se descartan."""
+    all_data, seen_ids = [], set()
+    for items in chunks:
+        for item in items:
+            if item['ID'] in seen_ids:
+                print(f"[WARN] ID global duplicado: {item['ID']}. Saltando.")
+                continue
+            all_data.append(item)
+            seen_ids.add(item['ID'])
+    return all_data
+
+
+def run_pool(start_page=START_PAGE, end_page=END_PAGE, workers=None, headless=True, retries=1, previous=None):
+    """
+    Extrae start_page..end_page con `workers` navegadores en paralelo.
+    Las páginas de un worker que falla se reintentan hasta `retries` veces.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = {}  # página -> items, para fusionar en orden de página
+    pending = list(range(start_page, end_page + 1))
+    for attempt in range(retries + 1):
+        if not pending:
+            break
+        slices = split_pages(pending, workers)
+        print(f"[POOL] Intento {attempt + 1}: {len(pending)} páginas en {len(slices)} workers")
+        pending = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(slices))) as executor:
+            futures = {executor.submit(scrape_slice, pages, headless, previous, index): pages
+                       for index, pages in enumerate(slices, 1)}
+            for future in as_completed(futures):
+                pages = futures[future]
+                try:
+                    items, failed = future.result()
+                except Exception as e:
+                    print(f"[POOL] Worker de las páginas {pages[0]}-{pages[-1]} falló: {e}")
+                    pending.extend(pages)
+                    continue
+                results.update(items)
+                pending.extend(failed)
+        pending.sort()
+    if pending:
+        print(f"[POOL] Páginas sin extraer tras {retries + 1} intentos: {pending}")
+    return merge_by_id(results[page] for page in sorted(results))
+
+
+if __name__ == "__main__":
+    import sys
+    from backup import backup_manager
+
+    previous = load_previous() if '--incremental' in sys.argv else None
+    data = run_pool(START_PAGE, END_PAGE, previous=previous)
+    backup_manager.save_outputs(data)
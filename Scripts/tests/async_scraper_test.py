@@ -0,0 +1,151 @@
+# Pruebas unitarias para el motor asyncio
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+import aiohttp
+from scraping.aspnet_forms import parse_document, get_hidden_fields
+from scraping.async_scraper import AsyncScraper
+
+LISTING_HTML = """
+<html><body><form method="post" action="./Items.aspx">
+<input type="hidden" name="__VIEWSTATE" value="VS1" />
+<table class="gridView"><tr><th>ID</th></tr>
+<tr><td><table><tr>
+  <td></td><td></td><td><span id="x_RptIdItem_0">832</span></td>
+  <td>832 Mahogany Cabinet</td><td>Fine Furniture</td>
+  <td><a href="/Admin/Gallery.aspx?id=832">1 x</a></td><td>&#8364;1,100.00</td>
+  <td><input type="checkbox" /></td><td>1</td><td>15/02/2023</td>
+  <td><input type="image" name="ctl00$Body$Rpt$ctl01$RptEdit" /></td>
+</tr></table></td></tr></table>
+<div id="ctl00_ContentPlaceHolderBody_PanelDataListPaging"><a class="PagingLinkCurrent">1</a></div>
+</form></body></html>
+"""
+GALLERY_HTML = """<div id="ctl00_ContentPlaceHolderBody_ReorderList1"><ul>
+<li><a target="_blank" href="http://file.4pm.ie/927/d5670cd1.jpg">1</a></li></ul></div>"""
+EDIT_HTML = """<form><textarea name="ctl00$ContentPlaceHolderBody$txtdesc">
+&lt;p&gt;Height: 31 (79cm) Mahogany&lt;/p&gt;</textarea></form>"""
+
+
+class FakeResponse:
+    def __init__(self, url, body):
+        self.url = url
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def read(self):
+        return self.body.encode('utf-8')
+
+
+class FakeSession:
+    def __init__(self):
+        self.posts = []
+
+    def get(self, url, data=None):
+        return FakeResponse(url, GALLERY_HTML)
+
+    def post(self, url, data=None):
+        self.posts.append(data)
+        return FakeResponse(url, EDIT_HTML)
+
+
+def session_pool(*sessions):
+    pool = asyncio.Queue()
+    for session in sessions:
+        pool.put_nowait(session)
+    return pool
+
+
+class TestAsyncScraper(unittest.TestCase):
+    def test_item_flows_through_all_stages(self):
+        scraper = AsyncScraper(MagicMock(), pager_path=None)
+        session = FakeSession()
+        url = 'https://4am.ie/Admin/Items.aspx'
+        doc = parse_document(LISTING_HTML, url)
+        first = (url, doc, get_hidden_fields(doc))
+
+        async def pipeline():
+            gallery_queue, edit_queue = asyncio.Queue(), asyncio.Queue()
+            workers = [asyncio.create_task(scraper.gallery_worker(session, gallery_queue, edit_queue)),
+                       asyncio.create_task(scraper.edit_worker(session, edit_queue))]
+            await scraper.listing_stage(session_pool(session), 1, first, gallery_queue)
+            await gallery_queue.join()
+            await edit_queue.join()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        asyncio.run(pipeline())
+        self.assertEqual(len(scraper.all_data), 1)
+        item = scraper.all_data[0]
+        self.assertEqual(item['ImageLinks'], ['https://file.4pm.ie/927/d5670cd1.jpg'])
+        self.assertIn('Height: 31', item['DescriptionSummary'])
+        self.assertEqual(session.posts[0]['__VIEWSTATE'], 'VS1')
+        self.assertIn('ctl00$Body$Rpt$ctl01$RptEdit.x', session.posts[0])
+
+    def test_failed_pages_are_retried_and_reported(self):
+        scraper = AsyncScraper(MagicMock(), pager_path=None, retries=2)
+        attempts, mapped = [], []
+
+        async def listing_stage(sessions, page, first, gallery_queue):
+            attempts.append(page)
+            return page != 3 and (page != 2 or attempts.count(2) > 1)
+
+        async def map_pages(session, pages):
+            mapped.append(list(pages))
+            return 'first'
+
+        scraper.listing_stage = listing_stage
+        scraper.map_pages = map_pages
+        async def retry():
+            return await scraper.listing_with_retries(session_pool(FakeSession()), [1, 2, 3], 'first', None)
+
+        failed = asyncio.run(retry())
+        self.assertEqual(failed, [3])
+        self.assertEqual(mapped, [[2, 3], [3]])
+        self.assertEqual(attempts, [1, 2, 3, 2, 3, 3])
+
+    def test_unknown_page_is_reported_as_failed(self):
+        scraper = AsyncScraper(MagicMock(), pager_path=None)
+        url = 'https://4am.ie/Admin/Items.aspx'
+        doc = parse_document(LISTING_HTML, url)
+
+        async def stage():
+            return await scraper.listing_stage(session_pool(FakeSession()), 7, (url, doc, {}), None)
+
+        self.assertFalse(asyncio.run(stage()))
+
+    def test_failed_login_closes_opened_sessions(self):
+        scraper = AsyncScraper(MagicMock(), pager_path=None)
+        logins = []
+
+        async def login(session):
+            logins.append(session)
+            if len(logins) == 2:
+                raise Exception("Login fallido")
+
+        async def open_all():
+            connector = aiohttp.TCPConnector()
+            try:
+                await scraper.open_sessions(connector, 3)
+            finally:
+                await connector.close()
+
+        scraper.login = login
+        with self.assertRaises(Exception):
+            asyncio.run(open_all())
+        # Cada sesión tiene su propio cookie jar y ninguna queda abierta
+        self.assertEqual(len({id(session.cookie_jar) for session in logins}), 3)
+        self.assertTrue(all(session.closed for session in logins))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# Pruebas unitarias para el hilo de persistencia y las escrituras atómicas
+import json
+import os
+import tempfile
+import threading
+import unittest
+from backup.background_writer import BackgroundWriter, write_atomic
+from backup.checkpoint_log import CheckpointLog, load_checkpoint
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'items_all.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_failed_write_keeps_previous_snapshot(self):
+        write_atomic(self.path, lambda f: json.dump([{'ID': '831'}], f))
+
+        def crash(f):
+            f.write('[{"ID": "832"')
+            raise RuntimeError("disco lleno")
+
+        with self.assertRaises(RuntimeError):
+            write_atomic(self.path, crash)
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), [{'ID': '831'}])
+        self.assertEqual(os.listdir(self.tmp.name), ['items_all.json'])
+
+    def test_snapshots_are_coalesced(self):
+        gate = threading.Event()
+        calls = []
+        with BackgroundWriter(fsync=False) as writer:
+            writer.submit(gate.wait)  # bloquea el hilo mientras se encolan versiones
+            for version in range(5):
+                writer.write_snapshot(self.path, lambda f, v=version: (calls.append(v), f.write(str(v))))
+            gate.set()
+        self.assertEqual(calls, [4])
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), '4')
+
+    def test_checkpoint_log_through_writer(self):
+        log_path = os.path.join(self.tmp.name, 'items_checkpoint.jsonl')
+        with BackgroundWriter(fsync=False) as writer:
+            log = CheckpointLog(log_path, writer=writer).open(reset=True)
+            log.append({'ID': '831'})
+            log.append({'ID': '831', 'DescriptionSummary': 'Height: 19.75 (50cm)'})
+            log.close()
+        self.assertEqual(os.path.getsize(log_path), log.position()[0])
+        self.assertEqual(load_checkpoint(log_path), [{'ID': '831', 'DescriptionSummary': 'Height: 19.75 (50cm)'}])
+
+    def test_failed_append_stops_log_and_manifest(self):
+        log_path = os.path.join(self.tmp.name, 'items_checkpoint.jsonl')
+        manifest_path = os.path.join(self.tmp.name, 'checkpoint_manifest.json')
+        writer = BackgroundWriter(fsync=False)
+        writer.append(log_path, b'{"ID": "831"}\n')
+        writer.write_json(manifest_path, {'count': 1}, after=log_path)
+        writer.close_file(log_path)
+        # El log se vuelve inescribible durante un append y después se recupera
+        writer.submit(lambda: (os.replace(log_path, log_path + '.ok'), os.mkdir(log_path)))
+        writer.append(log_path, b'{"ID": "832"}\n')
+        writer.submit(lambda: (os.rmdir(log_path), os.replace(log_path + '.ok', log_path)))
+        writer.append(log_path, b'{"ID": "833"}\n')
+        writer.write_json(manifest_path, {'count': 3}, after=log_path)
+        with self.assertRaises(OSError):
+            writer.close()
+        self.assertIn(log_path, writer.failed)
+        with open(log_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), '{"ID": "831"}\n')
+        with open(manifest_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'count': 1})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+# Pruebas unitarias para el log de checkpoint JSONL
+import json
+import os
+import tempfile
+import unittest
+from backup import backup_manager
+from backup.checkpoint_log import CheckpointLog, read_checkpoint, load_checkpoint
+from fixtures import item
+
+
+class TestCheckpointLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'items_checkpoint.jsonl')
+
+    def tearDown(self):
+        backup_manager.close_checkpoint()
+        self.tmp.cleanup()
+
+    def test_append_writes_one_line_per_record(self):
+        with CheckpointLog(self.path) as log:
+            log.append(item('831'))
+            log.append(item('832'))
+            # Cada registro ya está en disco antes de cerrar
+            with open(self.path, encoding='utf-8') as f:
+                self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual(log.count, 2)
+
+    def test_later_records_are_merged_by_id(self):
+        with CheckpointLog(self.path) as log:
+            log.append(item('831'))
+            log.append(item('832'))
+            log.append({'ID': '831', 'DescriptionSummary': 'Height: 19.75 (50cm)'})
+        data = load_checkpoint(self.path)
+        self.assertEqual([i['ID'] for i in data], ['831', '832'])
+        self.assertEqual(data[0]['DescriptionSummary'], 'Height: 19.75 (50cm)')
+        self.assertEqual(list(data[0]), ['ID', 'Name', 'Category', 'Pictures', 'Price', 'Featured',
+                                         'Status', 'Updated', 'ImageLinks', 'DescriptionSummary'])
+
+    def test_truncated_last_line_is_ignored(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(item('831')) + '\n{"ID": "832", "Na')
+        self.assertEqual([i['ID'] for i in read_checkpoint(self.path)], ['831'])
+
+    def test_compact_checkpoint_writes_final_export(self):
+        backup_manager.open_checkpoint(self.path, reset=True)
+        backup_manager.checkpoint_item(item('831'))
+        backup_manager.save_partial_backup([item('831'), item('832')], 100)
+        backup_manager.close_checkpoint()
+        data = backup_manager.compact_checkpoint(self.path, self.tmp.name)
+        self.assertEqual(len(data), 2)
+        with open(os.path.join(self.tmp.name, 'items_all.json'), encoding='utf-8') as f:
+            self.assertEqual(json.load(f), data)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, 'items_all.csv')))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# Pruebas unitarias para el manifiesto de checkpoint y la reanudación exacta
+import os
+import tempfile
+import unittest
+from backup.checkpoint_log import CheckpointLog
+from backup.checkpoint_manifest import CheckpointManifest, read_manifest, resume_checkpoint
+from fixtures import item
+
+
+class TestCheckpointManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmp.name, 'items_checkpoint.jsonl')
+        self.manifest_path = os.path.join(self.tmp.name, 'checkpoint_manifest.json')
+        self.log = CheckpointLog(self.log_path).open(reset=True)
+        self.manifest = CheckpointManifest(self.log, self.manifest_path)
+
+    def tearDown(self):
+        self.log.close()
+        self.tmp.cleanup()
+
+    def add(self, page, row, item_id, pending=False):
+        self.log.append(item(item_id))
+        self.manifest.track(page, row, item_id, pending)
+
+    def test_cursor_waits_for_pending_descriptions(self):
+        self.add(38, 1, '1200')
+        self.add(38, 2, '1201', pending=True)
+        self.add(38, 3, '1202')
+        self.assertEqual(read_manifest(self.manifest_path)['last_id'], '1200')
+        self.log.append({'ID': '1201', 'DescriptionSummary': 'Circa 1800'})
+        self.manifest.complete('1201')
+        manifest = read_manifest(self.manifest_path)
+        self.assertEqual((manifest['page'], manifest['row'], manifest['last_id']), (38, 3, '1202'))
+        self.assertEqual(manifest['count'], 3)
+
+    def test_description_done_before_track(self):
+        self.manifest.complete('1200')
+        self.add(38, 1, '1200', pending=True)
+        self.assertEqual(read_manifest(self.manifest_path)['count'], 1)
+
+    def test_resume_drops_uncommitted_tail(self):
+        self.add(38, 1, '1200')
+        self.add(38, 2, '1201', pending=True)  # sin descripción al cortarse
+        self.log.close()
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write('{"ID": "1202", "Na')  # escritura cortada a mitad
+        data, cursor = resume_checkpoint(self.manifest_path, self.log_path)
+        self.assertEqual([i['ID'] for i in data], ['1200'])
+        self.assertEqual(cursor, {'page': 38, 'row': 1, 'last_id': '1200'})
+        self.assertEqual(os.path.getsize(self.log_path), read_manifest(self.manifest_path)['log_offset'])
+
+    def test_no_resume_after_finish_or_tampered_log(self):
+        self.add(38, 1, '1200')
+        self.manifest.finish()
+        self.assertIsNone(resume_checkpoint(self.manifest_path, self.log_path))
+        self.manifest.write()
+        self.log.close()
+        with open(self.log_path, 'r+b') as f:
+            f.write(b'X')
+        self.assertIsNone(resume_checkpoint(self.manifest_path, self.log_path))
+        # El log que no coincide se aparta en lugar de perderse con el reset siguiente
+        self.assertFalse(os.path.exists(self.log_path))
+        aside = [name for name in os.listdir(self.tmp.name) if name.endswith('.unverified')]
+        self.assertEqual(len(aside), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
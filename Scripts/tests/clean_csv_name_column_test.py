@@ -0,0 +1,74 @@
+# Pruebas unitarias para la limpieza por lotes de la columna Name
+import csv
+import os
+import re
+import tempfile
+import unittest
+from data_processing.clean_csv_name_column import (chunk_boundaries, clean_name, clean_names, process_csv,
+                                                   process_csv_parallel)
+
+
+def reference_clean_name(name, id_value):
+    """Implementación anterior, fila a fila con un patrón por ID."""
+    name = re.sub(rf'^"?{re.escape(id_value)}[\s,-]*', '', name)
+    name = re.sub(r'[^\w\s.,;:()\-\'\"]+', '', name)
+    return name.strip()
+
+
+CASES = [
+    ('M178 Pair of Framed Prints', 'M178'),
+    ('"001, - Sold Irish Table €23,500', '001'),
+    ('001 Sold Table', '01'),
+    ('831 Bankers Lamp & Shade / Brass™', '831'),
+    ('M001 Mirror\x1fGilt', 'M001'),
+    ('"', ''),
+    ('', 'M1'),
+    ('(1.5) M1 Lamp', 'M1'),
+]
+
+
+class TestCleanCsvNameColumn(unittest.TestCase):
+    def test_matches_previous_implementation(self):
+        for name, id_value in CASES:
+            self.assertEqual(clean_name(name, id_value), reference_clean_name(name, id_value), name)
+        names, ids = zip(*CASES)
+        self.assertEqual(clean_names(names, ids), [reference_clean_name(n, i) for n, i in CASES])
+
+    def test_process_csv_in_batches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, 'items.csv')
+            output_path = os.path.join(tmp, 'items_clean.csv')
+            rows = [['ID', 'Name', 'Price'], ['single']] + [[i, n, '€945.00'] for n, i in CASES]
+            with open(input_path, 'w', encoding='utf-8', newline='') as f:
+                csv.writer(f).writerows(rows)
+            process_csv(input_path, output_path, batch_size=3)
+            with open(output_path, encoding='utf-8', newline='') as f:
+                cleaned = list(csv.reader(f))
+        self.assertEqual(cleaned[:2], [['ID', 'Name', 'Price'], ['single']])
+        self.assertEqual([row[1] for row in cleaned[2:]], [reference_clean_name(n, i) for n, i in CASES])
+
+    def test_parallel_matches_sequential(self):
+        contents = [
+            # Campo multilínea entre comillas: ningún corte puede caer dentro
+            'ID,Name\r\n' + ''.join(f'M{i},"M{i} Lamp\r\nBrass™ {i}"\r\n{i},{i} Chair &\r\n' for i in range(40)),
+            # Comilla suelta fuera de comillas: descoloca los cortes y se repite en un solo proceso
+            'ID,Name\n1,1 12" x\n2,"2 a\nb"\n3,3 c\n' * 3,
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, 'items.csv')
+            for content in contents:
+                with open(input_path, 'w', encoding='utf-8', newline='') as f:
+                    f.write(content)
+                expected, parallel = os.path.join(tmp, 'expected.csv'), os.path.join(tmp, 'parallel.csv')
+                process_csv(input_path, expected)
+                chunks = chunk_boundaries(input_path, chunk_size=40)
+                self.assertGreater(len(chunks), 2)
+                self.assertEqual(chunks[0][0], 0)
+                self.assertEqual(chunks[-1][1], os.path.getsize(input_path))
+                process_csv_parallel(input_path, parallel, workers=2, chunk_size=40)
+                with open(expected, 'rb') as a, open(parallel, 'rb') as b:
+                    self.assertEqual(a.read(), b.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+# Pruebas unitarias para la exportación columnar Parquet / Arrow
+import os
+import tempfile
+import unittest
+from datetime import date
+from decimal import Decimal
+
+import pyarrow as pa
+
+from data_processing.columnar_export import (
+    SCHEMA, export_columnar, items_to_table, parse_image_links, parse_price, read_columns,
+)
+from fixtures import item
+
+LINKS = ['https://file.4pm.ie/668/a.jpg', 'https://file.4pm.ie/668/b.jpg']
+
+
+class TestColumnarExport(unittest.TestCase):
+    def test_value_parsers(self):
+        self.assertEqual(parse_price('€23,500.00'), Decimal('23500.00'))
+        self.assertIsNone(parse_price('POA'))
+        self.assertEqual(parse_image_links("['https://file.4pm.ie/1/a.jpg']"),
+                         ['https://file.4pm.ie/1/a.jpg'])
+        self.assertEqual(parse_image_links(''), [])
+
+    def test_typed_table(self):
+        table = items_to_table([item('831', Pictures='2 x', Price='€23,500.00', ImageLinks=LINKS),
+                                item('832', Price='', ImageLinks='[]')])
+        self.assertEqual(table.schema, SCHEMA)
+        row = table.slice(0, 1).to_pylist()[0]
+        self.assertEqual(row['Pictures'], 2)
+        self.assertEqual(row['Price'], Decimal('23500.00'))
+        self.assertIs(row['Featured'], False)
+        self.assertEqual(row['Updated'], date(2016, 11, 8))
+        self.assertEqual(row['ImageLinks'], LINKS)
+        self.assertIsNone(table.column('Price')[1].as_py())
+        self.assertTrue(pa.types.is_dictionary(table.schema.field('Category').type))
+
+    def test_round_trip_reads_column_subset(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_columnar([item('831'), item('832')], output_dir=tmp)
+            for name in ('items_all.parquet', 'items_all.arrow'):
+                table = read_columns(os.path.join(tmp, name), ['ID', 'Price'])
+                self.assertEqual(table.column_names, ['ID', 'Price'])
+                self.assertEqual(table.column('ID').to_pylist(), ['831', '832'])
+
+
+if __name__ == "__main__":
+    unittest.main()
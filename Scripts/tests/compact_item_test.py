@@ -0,0 +1,45 @@
+# Pruebas unitarias para la representación compacta de items
+import unittest
+from backup.compact_item import CompactItem, compact_items, split_links, to_dicts
+from fixtures import item
+
+LINKS = ['https://file.4pm.ie/668/d17238eb.jpg', 'https://file.4pm.ie/668/a1b2c3d4.jpg']
+
+
+class TestCompactItem(unittest.TestCase):
+    def test_round_trip_keeps_dict_shape(self):
+        data = [item('831', Pictures='2 x', ImageLinks=LINKS, DescriptionSummary='Height: 19.75 (50cm)'),
+                item('832', Category='Fine Furniture')]
+        compact = compact_items(data)
+        self.assertEqual(to_dicts(compact), data)
+        self.assertEqual(list(compact[0].to_dict()), list(data[0]))
+        self.assertFalse(hasattr(compact[0], '__dict__'))
+
+    def test_interned_fields_and_prefix_compression(self):
+        first, second = compact_items([item('831', ImageLinks=LINKS), item('832')])
+        self.assertIs(first.Category, second.Category)
+        self.assertIs(first.image_prefix, second.image_prefix)
+        self.assertEqual(first.image_prefix, 'https://file.4pm.ie/668/')
+        self.assertEqual(first.ImageLinks, LINKS)
+        self.assertEqual(split_links([]), ('', None))
+        self.assertEqual(split_links(['http://other/a.jpg']), ('', ('http://other/a.jpg',)))
+
+    def test_partial_and_unusual_records(self):
+        patch = {'ID': '831', 'DescriptionSummary': 'Materials: Silver'}
+        self.assertEqual(list(CompactItem.from_dict(patch).to_dict().items()), list(patch.items()))
+        raw = {'ID': '831', 'ImageLinks': "['https://file.4pm.ie/1/a.jpg']", 'Extra': None}
+        self.assertEqual(CompactItem.from_dict(raw).to_dict(), raw)
+        self.assertEqual(CompactItem.from_dict(dict(item('831'), ImageLinks=[])).ImageLinks, [])
+
+    def test_dict_like_access(self):
+        compact = CompactItem.from_dict({'ID': '831', 'Price': '€425.00'})
+        self.assertEqual(compact['Price'], '€425.00')
+        self.assertIn('Price', compact)
+        self.assertNotIn('Name', compact)
+        self.assertIsNone(compact.get('Name'))
+        with self.assertRaises(KeyError):
+            compact['Name']
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# Pruebas unitarias para la conversión CSV -> JSON / JSONL en streaming
+import csv
+import json
+import os
+import tempfile
+import unittest
+from data_processing.csv_to_json import csv_to_json, parse_image_links
+
+LINKS = ['https://file.4pm.ie/843/127d2a64.jpg', 'https://file.4pm.ie/843/3a4f8333.jpg']
+
+
+class TestCsvToJson(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, 'items_all.csv')
+        rows = [
+            {'ID': '001', 'Name': '001 Irish Table', 'Price': '€23,500.00', 'ImageLinks': str(LINKS)},
+            {'ID': '002', 'Name': 'Mirror\n"Gilt"', 'Price': '€945.00', 'ImageLinks': '[]'},
+        ]
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_image_links(self):
+        self.assertEqual(parse_image_links(str(LINKS)), LINKS)
+        self.assertEqual(parse_image_links("['https://file.4pm.ie/1/it\\'s.jpg']"),
+                         ["https://file.4pm.ie/1/it's.jpg"])
+        self.assertEqual(parse_image_links(f'[{LINKS[0]}, {LINKS[1]}]'), LINKS)
+        self.assertEqual(parse_image_links(''), [])
+
+    def test_json_array_matches_json_dump(self):
+        json_path = os.path.join(self.tmp.name, 'items_all.json')
+        self.assertEqual(csv_to_json(self.csv_path, json_path), 2)
+        with open(json_path, encoding='utf-8') as f:
+            text = f.read()
+        data = json.loads(text)
+        self.assertEqual(text, json.dumps(data, ensure_ascii=False, indent=2))
+        self.assertEqual(data[0]['ImageLinks'], LINKS)
+        self.assertEqual(data[1]['ImageLinks'], [])
+        self.assertEqual(data[1]['Name'], 'Mirror\n"Gilt"')
+
+    def test_jsonl_mode(self):
+        jsonl_path = os.path.join(self.tmp.name, 'items_all.jsonl')
+        csv_to_json(self.csv_path, jsonl_path)
+        with open(jsonl_path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r['ID'] for r in records], ['001', '002'])
+        self.assertEqual(records[0]['ImageLinks'], LINKS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# Pruebas unitarias para las reglas de validación de los datos extraídos
+import csv
+import json
+import os
+import tempfile
+import unittest
+from data_processing.data_validator import RULES, is_date, validate_data, validate_items
+from fixtures import item as base_item
+
+LINKS = ['https://file.4pm.ie/668/a.jpg', 'https://file.4pm.ie/668/b.jpg']
+
+
+def item(item_id='831', **fields):
+    """Item válido con dos imágenes y precio con millares; el Name ya no lleva el prefijo del ID."""
+    return base_item(item_id, **{'Name': 'Bankers Lamp', 'Pictures': '2 x', 'Price': '€23,500.00',
+                                 'ImageLinks': LINKS, **fields})
+
+
+class TestDataValidator(unittest.TestCase):
+    def test_rules(self):
+        failures = {
+            'id_name': item(Name=''),
+            'price_format': item(Price='23500'),
+            'pictures_count': item(Pictures='8 x'),
+            'updated_date': item(Updated='31/02/2024'),
+            'https_images': item(ImageLinks=['http://file.4pm.ie/668/a.jpg', 'https://file.4pm.ie/668/b.jpg']),
+            'status_domain': item(Status='7'),
+            'featured_domain': item(Featured='maybe'),
+            'id_prefix_in_name': item(Name='"831, - Bankers Lamp'),
+        }
+        for name, rule in RULES.items():
+            self.assertTrue(rule(item()), name)
+            self.assertFalse(rule(failures[name]), name)
+        for price in ('€0.00', '€945.00', '€1,850.00', '€1,234,567.89'):
+            self.assertTrue(RULES['price_format'](item(Price=price)), price)
+        # '8310 Lamp' no lleva el prefijo del ID 831
+        self.assertTrue(RULES['id_prefix_in_name'](item(Name='8310 Lamp')))
+        self.assertFalse(is_date('8/11/2016'))
+
+    def test_report_counts(self):
+        items = [item('831'), item('832', Price='POA', Status=''), item('831'), item('', Pictures='x')]
+        report = validate_items(items, examples=1)
+        self.assertEqual((report['items'], report['valid']), (4, 1))
+        counts = {name: entry['failed'] for name, entry in report['rules'].items()}
+        self.assertEqual(counts, {'id_name': 1, 'price_format': 1, 'pictures_count': 1, 'updated_date': 0,
+                                  'https_images': 0, 'status_domain': 1, 'featured_domain': 0,
+                                  'id_prefix_in_name': 0, 'duplicate_id': 1})
+        self.assertEqual(report['rules']['duplicate_id']['examples'], ['831'])
+        self.assertEqual(report['rules']['id_name']['examples'], ['#3'])
+
+    def test_validate_files(self):
+        items = [item('831'), item('M001', Name='M001 Mirror')]
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, 'items_all.json')
+            csv_path = os.path.join(tmp, 'items_all.csv')
+            report_path = os.path.join(tmp, 'report.json')
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(items, f, ensure_ascii=False, indent=2)
+            with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=list(items[0]))
+                writer.writeheader()
+                writer.writerows(items)
+                writer.writerow({field: field for field in items[0]})  # cabecera repetida
+            report = validate_data(json_path, report_path=report_path)
+            with open(report_path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), report)
+            self.assertEqual(report['rules']['id_prefix_in_name']['examples'], ['M001'])
+            self.assertEqual(validate_data(csv_path)['rules'], report['rules'])
+            self.assertEqual(validate_data(json_path, ids=['831'])['valid'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
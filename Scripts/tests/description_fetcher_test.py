@@ -0,0 +1,81 @@
+# Pruebas unitarias para la etapa de descripciones fuera del listado
+import unittest
+from unittest.mock import MagicMock
+from scraping.aspnet_forms import parse_document
+from scraping.description_fetcher import build_jobs, DescriptionFetcher
+
+LISTING_HTML = """
+<html><body><form action="Items.aspx" method="post">
+  <input type="hidden" name="__VIEWSTATE" value="vs-page-3" />
+  <input type="hidden" name="__EVENTVALIDATION" value="ev-page-3" />
+</form></body></html>
+"""
+
+EDIT_HTML = """
+<html><body><form>
+  <textarea name="ctl00$ContentPlaceHolderBody$txtdesc">&lt;p&gt;Irish Georgian silver teapot.&lt;/p&gt;</textarea>
+</form></body></html>
+"""
+
+
+def row(item_id, edit_name=None, edit_url=None):
+    item = {'ID': item_id, 'DescriptionSummary': ''}
+    return {'item': item, 'edit_name': edit_name, 'edit_url': edit_url}
+
+
+def fake_response(content):
+    response = MagicMock()
+    response.url = 'https://4am.ie/Admin/EditItem.aspx'
+    response.content = content
+    return response
+
+
+class TestDescriptionFetcher(unittest.TestCase):
+    def setUp(self):
+        self.doc = parse_document(LISTING_HTML)
+        self.rows = [
+            row('832', edit_name='ctl00$ContentPlaceHolderBody$RptEdit$ctl00$btnEdit'),
+            row('833', edit_url='https://4am.ie/Admin/EditItem.aspx?id=833'),
+            row('834'),
+        ]
+
+    def test_build_jobs_keeps_listing_state(self):
+        jobs = build_jobs(self.rows, self.doc, 'https://4am.ie/Admin/Items.aspx')
+        self.assertEqual(set(jobs), {'832', '833'})
+        self.assertEqual(jobs['832']['action'], 'https://4am.ie/Admin/Items.aspx')
+        self.assertEqual(jobs['832']['state']['__VIEWSTATE'], 'vs-page-3')
+        self.assertEqual(jobs['833'], {'edit_url': 'https://4am.ie/Admin/EditItem.aspx?id=833'})
+
+    def test_descriptions_written_by_id(self):
+        session = MagicMock()
+        session.post.return_value = fake_response(EDIT_HTML)
+        session.get.return_value = fake_response('<html></html>')
+        fetcher = DescriptionFetcher(session, max_workers=2)
+        self.assertEqual(fetcher.submit_page(self.rows, self.doc, 'https://4am.ie/Admin/Items.aspx'), 2)
+        results = fetcher.wait()
+        fetcher.close()
+        self.assertEqual(self.rows[0]['item']['DescriptionSummary'], 'Materials: Silver')
+        self.assertEqual(results['833'], '')  # sin txtdesc: se registra el error y queda vacío
+        self.assertEqual(self.rows[2]['item']['DescriptionSummary'], '')
+        payload = session.post.call_args.kwargs['data']
+        self.assertEqual(payload['__VIEWSTATE'], 'vs-page-3')
+        self.assertIn('ctl00$ContentPlaceHolderBody$RptEdit$ctl00$btnEdit.x', payload)
+
+    def test_on_done_error_does_not_reach_wait(self):
+        session = MagicMock()
+        session.post.return_value = fake_response(EDIT_HTML)
+        done = []
+
+        def on_done(item):
+            done.append(item['ID'])
+            raise OSError("disco lleno")
+
+        fetcher = DescriptionFetcher(session, max_workers=1, on_done=on_done)
+        fetcher.submit_page(self.rows[:1], self.doc, 'https://4am.ie/Admin/Items.aspx')
+        self.assertEqual(fetcher.wait(), {'832': 'Materials: Silver'})
+        fetcher.close()
+        self.assertEqual(done, ['832'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,16 @@
+# Datos de ejemplo compartidos por las pruebas
+
+
+def item(item_id='831', name='Bankers Lamp', **fields):
+    """
+    Item como los que extrae el scraper (el 831 de output/items_all.json).
+    El Name lleva delante el ID, como en el listado; fields sustituye campos
+    (ImageLinks=[...], Price='€23,500.00'...).
+    """
+    data = {
+        'ID': item_id, 'Name': f'{item_id} {name}', 'Category': 'Antique Lamps', 'Pictures': '1 x',
+        'Price': '€425.00', 'Featured': 'No', 'Status': '1', 'Updated': '08/11/2016',
+        'ImageLinks': ['https://file.4pm.ie/668/d17238eb.jpg'], 'DescriptionSummary': '',
+    }
+    data.update(fields)
+    return data
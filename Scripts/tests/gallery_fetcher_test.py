@@ -0,0 +1,46 @@
+# Pruebas unitarias para la descarga concurrente de galerías
+import unittest
+from unittest.mock import MagicMock
+from scraping.gallery_fetcher import parse_gallery, fetch_galleries, session_from_driver
+
+GALLERY_HTML = """
+<html><body><div id="ctl00_ContentPlaceHolderBody_ReorderList1"><ul>
+  <li><a target="_blank" href="http://file.4pm.ie/927/d5670cd1.jpg">1</a></li>
+  <li><a target="_blank" href="https://file.4pm.ie/927/f7b2a1d2.jpg">2</a></li>
+  <li><a href="https://file.4pm.ie/927/thumb.jpg">sin target</a></li>
+</ul></div></body></html>
+"""
+
+
+def fake_response(url):
+    response = MagicMock()
+    response.url = url
+    response.content = GALLERY_HTML if 'ok' in url else ''
+    if 'error' in url:
+        response.raise_for_status.side_effect = Exception("500 Server Error")
+    return response
+
+
+class TestGalleryFetcher(unittest.TestCase):
+    def test_parse_gallery_forces_https(self):
+        self.assertEqual(parse_gallery(GALLERY_HTML), [
+            'https://file.4pm.ie/927/d5670cd1.jpg',
+            'https://file.4pm.ie/927/f7b2a1d2.jpg',
+        ])
+
+    def test_fetch_galleries_keyed_by_id(self):
+        session = MagicMock()
+        session.get.side_effect = lambda url, timeout: fake_response(url)
+        images = fetch_galleries(session, {'832': 'https://4am.ie/ok?id=832', '833': 'https://4am.ie/error'})
+        self.assertEqual(len(images['832']), 2)
+        self.assertEqual(images['833'], [])
+
+    def test_session_from_driver_copies_cookies(self):
+        driver = MagicMock()
+        driver.get_cookies.return_value = [{'name': 'ASP.NET_SessionId', 'value': 'abc', 'domain': '4am.ie', 'path': '/'}]
+        session = session_from_driver(driver)
+        self.assertEqual(session.cookies.get('ASP.NET_SessionId'), 'abc')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+# Pruebas unitarias para el análisis en bloque del gridView
+import unittest
+from scraping.grid_parser import parse_grid_rows
+
+ROW = """
+<tr><td><table><tr>
+  <td></td><td></td>
+  <td><span id="ctl00_RptIdItem_{n}">{item_id}</span></td>
+  <td>  {item_id} Mahogany   Cabinet </td>
+  <td><span>Fine Furniture</span></td>
+  <td><a href="/Admin/Gallery.aspx?id={item_id}">5 x</a></td>
+  <td><span>&#8364;1,100.00</span></td>
+  <td><input type="checkbox" /></td>
+  <td><span>1</span></td>
+  <td><span>15/02/2023</span></td>
+  <td><a href="/Admin/ItemEdit.aspx?id={item_id}" title="Edit item"><img /></a></td>
+</tr></table></td></tr>
+"""
+
+
+def grid_html(*rows):
+    return f'<html><body><table class="gridView"><tr><th>ID</th></tr>{"".join(rows)}</table></body></html>'
+
+
+class TestGridParser(unittest.TestCase):
+    def test_parses_every_row_in_one_pass(self):
+        html = grid_html(ROW.format(n=0, item_id='832'), ROW.format(n=1, item_id='833'))
+        rows = parse_grid_rows(html, 'https://4am.ie/Admin/Items.aspx')
+        self.assertEqual([r['row'] for r in rows], [1, 2])
+        self.assertEqual(list(rows[0]['item'].keys()), [
+            'ID', 'Name', 'Category', 'Pictures', 'Price', 'Featured', 'Status', 'Updated',
+            'ImageLinks', 'DescriptionSummary'])
+        item = rows[1]['item']
+        self.assertEqual(item['ID'], '833')
+        self.assertEqual(item['Name'], '833 Mahogany Cabinet')
+        self.assertEqual(item['Featured'], 'No')
+        self.assertEqual(item['Status'], '1')
+        self.assertIsNone(rows[1]['edit_name'])
+        self.assertEqual(rows[1]['edit_url'], 'https://4am.ie/Admin/ItemEdit.aspx?id=833')
+        self.assertEqual(rows[1]['gallery_url'], 'https://4am.ie/Admin/Gallery.aspx?id=833')
+
+    def test_rows_without_id_are_skipped(self):
+        html = grid_html(ROW.format(n=0, item_id=''), ROW.format(n=1, item_id='834'))
+        rows = parse_grid_rows(html)
+        self.assertEqual([r['item']['ID'] for r in rows], ['834'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# Pruebas unitarias para el scraper HTTP (sin navegador)
+import unittest
+from unittest.mock import MagicMock
+
+import requests
+from scraping.aspnet_forms import (
+    parse_document, get_hidden_fields, parse_postback, build_postback, create_session, post_retrying,
+)
+from scraping.http_scraper import HttpScraper
+
+ITEMS_HTML = """
+<html><body><form method="post" action="./Items.aspx">
+<input type="hidden" name="__VIEWSTATE" value="VS1" />
+<input type="hidden" name="__EVENTVALIDATION" value="EV1" />
+<table class="gridView"><tbody>
+<tr><th>Header</th></tr>
+<tr><td><table><tr>
+  <td></td><td></td>
+  <td><span id="ctl00_RptIdItem_0">831</span></td>
+  <td><span>831 Superb Bankers Lamp</span></td>
+  <td><span>Antique Lamps</span></td>
+  <td><a href="Gallery.aspx?id=831">1 x</a></td>
+  <td><span>&#8364;425.00</span></td>
+  <td><input type="checkbox" checked="checked" /></td>
+  <td><select><option value="1">Live</option><option value="2" selected="selected">Sold</option></select></td>
+  <td><span>08/11/2016</span></td>
+  <td><input type="image" name="ctl00$ContentPlaceHolderBody$Rpt$ctl01$RptEdit" /></td>
+</tr></table></td></tr>
+</tbody></table>
+<div id="ctl00_ContentPlaceHolderBody_PanelDataListPaging">
+  <a class="PagingLinkCurrent">1</a>
+  <a class="PagingLink" href="javascript:__doPostBack('ctl00$ContentPlaceHolderBody$pagelink2','')">2</a>
+  <a class="PagingLink" href="javascript:__doPostBack('ctl00$ContentPlaceHolderBody$pagelinkNext','')">&#187;</a>
+</div>
+</form></body></html>
+"""
+
+
+class TestAspNetForms(unittest.TestCase):
+    def test_hidden_fields_and_postback(self):
+        doc = parse_document(ITEMS_HTML)
+        fields = get_hidden_fields(doc)
+        self.assertEqual(fields, {'__VIEWSTATE': 'VS1', '__EVENTVALIDATION': 'EV1'})
+        target = parse_postback("javascript:__doPostBack('ctl00$Body$pagelink2','')")
+        self.assertEqual(target, ('ctl00$Body$pagelink2', ''))
+        payload = build_postback(fields, *target)
+        self.assertEqual(payload['__EVENTTARGET'], 'ctl00$Body$pagelink2')
+        self.assertEqual(payload['__VIEWSTATE'], 'VS1')
+
+    def test_parse_postback_plain_link(self):
+        self.assertIsNone(parse_postback('Items.aspx?page=2'))
+
+    def test_posts_are_not_retried_by_the_adapter(self):
+        retry = create_session().get_adapter('https://4am.ie').max_retries
+        self.assertIn('GET', retry.allowed_methods)
+        self.assertNotIn('POST', retry.allowed_methods)
+
+    def test_post_retrying_repeats_on_server_errors_only(self):
+        session = MagicMock()
+        session.post.side_effect = [requests.ConnectionError(), MagicMock(status_code=503),
+                                    MagicMock(status_code=200)]
+        response = post_retrying(session, 'https://4am.ie/Admin/Items.aspx', {'__VIEWSTATE': 'VS1'}, backoff=0)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.post.call_count, 3)
+        session.post.side_effect = [MagicMock(status_code=404)]
+        self.assertEqual(post_retrying(session, 'https://4am.ie/x', {}, backoff=0).status_code, 404)
+        session.post.side_effect = [MagicMock(status_code=500)] * 2
+        self.assertEqual(post_retrying(session, 'https://4am.ie/x', {}, retries=1, backoff=0).status_code, 500)
+
+
+class TestHttpScraper(unittest.TestCase):
+    def setUp(self):
+        self.scraper = HttpScraper(MagicMock(), pager_path=None)
+        self.scraper.url = 'https://4am.ie/Admin/Items.aspx'
+        self.scraper.doc = parse_document(ITEMS_HTML)
+
+    def test_parse_rows(self):
+        rows = self.scraper.parse_rows()
+        self.assertEqual(len(rows), 1)
+        item = rows[0]['item']
+        self.assertEqual(item['ID'], '831')
+        self.assertEqual(item['Name'], '831 Superb Bankers Lamp')
+        self.assertEqual(item['Price'], '€425.00')
+        self.assertEqual(item['Featured'], 'Yes')
+        self.assertEqual(item['Status'], '2')
+        self.assertEqual(item['Updated'], '08/11/2016')
+        self.assertEqual(rows[0]['gallery_url'], 'https://4am.ie/Admin/Gallery.aspx?id=831')
+        self.assertEqual(rows[0]['edit_name'], 'ctl00$ContentPlaceHolderBody$Rpt$ctl01$RptEdit')
+
+    def test_pager(self):
+        self.assertEqual(self.scraper.current_page(), 1)
+        self.scraper.postback = MagicMock()
+        self.scraper.go_to_page(2, max_steps=1)
+        self.scraper.postback.assert_called_with('ctl00$ContentPlaceHolderBody$pagelink2', '')
+
+
+if __name__ == "__main__":
+    unittest.main()
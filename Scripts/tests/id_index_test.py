@@ -0,0 +1,69 @@
+# Pruebas unitarias para el índice por ID con mmap
+import csv
+import json
+import os
+import tempfile
+import unittest
+from data_processing.id_index import IdIndex, index_path, is_fresh
+from fixtures import item
+
+
+class TestIdIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = [item('831'), item('M001', 'Mirror\n"Gilt"'), item('1000'), item('99')]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_json_array(self):
+        path = self.path('items_all.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        with IdIndex(path) as index:
+            self.assertEqual(index.get('M001'), self.data[1])
+            self.assertIsNone(index.get('832'))
+            self.assertNotIn('83', index)
+            # IDs numéricos en orden numérico
+            self.assertEqual([i['ID'] for i in index.range('90', '900')], ['99', '831'])
+            self.assertEqual(list(index.ids()), ['99', '831', '1000', 'M001'])
+
+    def test_csv_with_multiline_fields_and_repeated_header(self):
+        path = self.path('items_all.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.data[0]))
+            writer.writeheader()
+            writer.writerows(self.data[:2])
+            writer.writeheader()
+            writer.writerows(self.data[2:])
+        with IdIndex(path) as index:
+            self.assertEqual(len(index), 4)
+            record = index.get('M001')
+            self.assertEqual(record['Name'], 'M001 Mirror\n"Gilt"')
+            self.assertEqual(record['ImageLinks'], "['https://file.4pm.ie/668/d17238eb.jpg']")
+
+    def test_jsonl_merges_records_and_rebuilds_when_stale(self):
+        path = self.path('items_checkpoint.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(item('831')) + '\n')
+        with IdIndex(path) as index:
+            self.assertEqual(len(index), 1)
+        self.assertTrue(is_fresh(path))
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'ID': '831', 'DescriptionSummary': 'Materials: Silver'}) + '\n')
+            f.write('{"ID": "83')  # línea a medias
+        self.assertFalse(is_fresh(path))
+        with self.assertRaises(ValueError):
+            IdIndex(path, rebuild=False)
+        with IdIndex(path) as index:
+            self.assertEqual(len(index.get_all('831')), 2)
+            self.assertEqual(index.get('831')['DescriptionSummary'], 'Materials: Silver')
+            self.assertEqual(index.get('831')['Name'], '831 Bankers Lamp')
+        self.assertTrue(os.path.exists(index_path(path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -36,3 +36,9 @@ def test_import_data_validator():
         from data_processing.data_validator import validate_data
     except ImportError as e:
         pytest.fail(f"No se pudo importar data_validator: {e}")
+
+def test_import_http_scraper():
+    try:
+        from scraping.http_scraper import HttpScraper
+    except ImportError as e:
+        pytest.fail(f"No se pudo importar HttpScraper: {e}")
@@ -0,0 +1,70 @@
+# Pruebas unitarias para el modo incremental
+import json
+import os
+import tempfile
+import unittest
+from backup.compact_item import CompactItem
+from scraping.incremental import compact_previous, load_previous, is_changed, is_incomplete, split_rows
+
+STORED = {
+    'ID': '831', 'Pictures': '1 x', 'Price': '€425.00', 'Status': '1', 'Updated': '08/11/2016',
+    'ImageLinks': ['https://file.4pm.ie/668/d17238eb.jpg'], 'DescriptionSummary': 'Height: 19.75 (50cm)',
+}
+
+
+def row(item_id, **changes):
+    item = {'ID': item_id, 'Pictures': '1 x', 'Price': '€425.00', 'Status': '1', 'Updated': '08/11/2016',
+            'ImageLinks': [], 'DescriptionSummary': ''}
+    item.update(changes)
+    return {'item': item}
+
+
+class TestIncremental(unittest.TestCase):
+    def test_is_changed(self):
+        self.assertFalse(is_changed(row('831')['item'], STORED))
+        self.assertTrue(is_changed(row('831', Price='€450.00')['item'], STORED))
+        self.assertTrue(is_changed(row('831', Updated='02/03/2025')['item'], STORED))
+        self.assertTrue(is_changed(row('831')['item'], None))
+
+    def test_split_rows_reuses_stored_fields(self):
+        rows = [row('831'), row('832'), row('831', Pictures='2 x')]
+        changed, unchanged = split_rows(rows, {'831': STORED})
+        self.assertEqual([r['item']['ID'] for r in unchanged], ['831'])
+        self.assertEqual(len(changed), 2)
+        self.assertEqual(unchanged[0]['item']['ImageLinks'], STORED['ImageLinks'])
+        self.assertEqual(unchanged[0]['item']['DescriptionSummary'], 'Height: 19.75 (50cm)')
+        self.assertEqual(changed[1]['item']['ImageLinks'], [])
+
+    def test_incomplete_stored_records_are_fetched_again(self):
+        self.assertFalse(is_incomplete(STORED))
+        self.assertTrue(is_incomplete(dict(STORED, ImageLinks=[])))
+        self.assertTrue(is_incomplete(dict(STORED, ImageLinks='[]')))
+        self.assertTrue(is_incomplete(dict(STORED, DescriptionSummary='')))
+        self.assertFalse(is_incomplete(dict(STORED, Pictures='0 x', ImageLinks=[])))
+        previous = {'831': dict(STORED, ImageLinks=[]), '832': dict(STORED, ID='832', DescriptionSummary='')}
+        changed, unchanged = split_rows([row('831'), row('832')], previous)
+        self.assertEqual([r['item']['ID'] for r in changed], ['831', '832'])
+        self.assertEqual(unchanged, [])
+
+    def test_compact_previous_from_store_rows(self):
+        previous = compact_previous([STORED, {'ID': '', 'Name': 'sin ID'}])
+        self.assertEqual(list(previous), ['831'])
+        self.assertIsInstance(previous['831'], CompactItem)
+        changed, unchanged = split_rows([row('831')], previous)
+        self.assertEqual(unchanged[0]['item']['ImageLinks'], STORED['ImageLinks'])
+
+    def test_split_rows_without_previous(self):
+        rows = [row('831')]
+        self.assertEqual(split_rows(rows, {}), (rows, []))
+
+    def test_load_previous(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'items_all.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump([STORED], f)
+            self.assertEqual(set(load_previous(path)), {'831'})
+            self.assertEqual(load_previous(os.path.join(tmp, 'missing.json')), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# Pruebas unitarias para el almacén SQLite de items
+import json
+import os
+import tempfile
+import unittest
+from backup.item_store import ItemStore, load_items, parse_updated, parse_price
+from fixtures import item
+
+
+class TestItemStore(unittest.TestCase):
+    def setUp(self):
+        self.store = ItemStore(':memory:')
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_normalised_columns(self):
+        self.assertEqual(parse_updated('08/11/2016'), '2016-11-08')
+        self.assertIsNone(parse_updated(''))
+        self.assertEqual(parse_price('€23,500.00'), 23500.0)
+        self.assertIsNone(parse_price('POA'))
+
+    def test_upsert_keeps_insertion_order_and_merges(self):
+        self.store.upsert(item('831'))
+        self.store.upsert(item('832'))
+        self.store.upsert({'ID': '831', 'DescriptionSummary': 'Height: 19.75 (50cm)'})
+        self.assertEqual(len(self.store), 2)
+        self.assertIn('832', self.store)
+        self.assertNotIn('999', self.store)
+        first = self.store.items()[0]
+        self.assertEqual(first['ID'], '831')
+        self.assertEqual(first['DescriptionSummary'], 'Height: 19.75 (50cm)')
+        self.assertEqual(first['ImageLinks'], ['https://file.4pm.ie/668/d17238eb.jpg'])
+        self.assertEqual(first['Price'], '€425.00')
+
+    def test_indexed_filters(self):
+        self.store.upsert_many([
+            item('831'),
+            item('832', Category='Fine Furniture', Price='€23,500.00', Updated='02/03/2025'),
+            item('833', Status='2', Price='€90.00'),
+        ])
+        self.assertEqual([i['ID'] for i in self.store.items(category='Fine Furniture')], ['832'])
+        self.assertEqual([i['ID'] for i in self.store.items(status=2)], ['833'])
+        self.assertEqual([i['ID'] for i in self.store.items(updated_since='01/01/2020')], ['832'])
+        self.assertEqual([i['ID'] for i in self.store.items(min_price=400, max_price=1000)], ['831'])
+        plan = self.store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM items WHERE price_value >= 400").fetchall()
+        self.assertIn('idx_items_price', ' '.join(str(tuple(row)) for row in plan))
+
+    def test_load_items_from_json_or_db(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'items.db')
+            json_path = os.path.join(tmp, 'items_all.json')
+            with ItemStore(db_path) as store:
+                store.upsert_many([item('831'), item('832', Status='2')])
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump([item('831')], f)
+            self.assertEqual([i['ID'] for i in load_items(db_path, status='2')], ['832'])
+            self.assertEqual(len(load_items(json_path)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
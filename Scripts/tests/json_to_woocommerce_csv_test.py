@@ -0,0 +1,78 @@
+# Pruebas unitarias para la exportación en streaming a productos de WooCommerce
+import csv
+import json
+import os
+import tempfile
+import unittest
+from data_processing.json_to_woocommerce_csv import WOOCOMMERCE_COLUMNS, json_to_woocommerce_csv
+from fixtures import item
+
+LINKS = ['https://file.4pm.ie/668/a.jpg', 'https://file.4pm.ie/668/b.jpg']
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+class TestJsonToWoocommerceCsv(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.tmp.name, 'items_all.json')
+        self.csv_path = os.path.join(self.tmp.name, 'items_woocommerce.csv')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_items(self, items):
+        with open(self.json_path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False, indent=2)
+
+    def test_product_columns(self):
+        # El primer item no tiene ImageLinks: la cabecera no depende de él
+        first = item('831', Price='€23,500.00')
+        del first['ImageLinks']
+        self.write_items([
+            first,
+            item('M001', Name='"M001, - Mirror', Price='POA', Status='2', Featured='Yes', ImageLinks=LINKS,
+                 Category='Jewellery Caskets, Writing Slopes and Tea Caddies'),
+            item('832', Status='', Price='NaN'),
+            item('831', Name='duplicado'),
+        ])
+        self.assertEqual(json_to_woocommerce_csv(self.json_path, self.csv_path), [self.csv_path])
+        with open(self.csv_path, encoding='utf-8', newline='') as f:
+            self.assertEqual(tuple(next(csv.reader(f))), WOOCOMMERCE_COLUMNS)
+        rows = read_csv(self.csv_path)
+        self.assertEqual([row['SKU'] for row in rows], ['831', 'M001', '832'])
+        self.assertEqual(rows[0]['Name'], 'Bankers Lamp')
+        self.assertEqual(rows[0]['Regular price'], '23500.00')
+        self.assertEqual(rows[0]['Images'], '')
+        self.assertEqual((rows[0]['Published'], rows[0]['In stock?'], rows[0]['Is featured?']), ('1', '1', '0'))
+        self.assertEqual(rows[1]['Name'], 'Mirror')
+        self.assertEqual(rows[1]['Regular price'], '')
+        self.assertEqual((rows[1]['Published'], rows[1]['In stock?'], rows[1]['Is featured?']), ('1', '0', '1'))
+        self.assertEqual(rows[1]['Categories'], 'Jewellery Caskets\\, Writing Slopes and Tea Caddies')
+        self.assertEqual(rows[1]['Images'], 'https://file.4pm.ie/668/a.jpg, https://file.4pm.ie/668/b.jpg')
+        self.assertEqual(rows[2]['Published'], '-1')
+        self.assertEqual(rows[2]['Regular price'], '')
+
+    def test_chunks(self):
+        self.write_items([item(str(i)) for i in range(5)])
+        paths = json_to_woocommerce_csv(self.json_path, self.csv_path, chunk_size=2)
+        self.assertEqual([os.path.basename(path) for path in paths],
+                         ['items_woocommerce_001.csv', 'items_woocommerce_002.csv', 'items_woocommerce_003.csv'])
+        self.assertEqual([[row['SKU'] for row in read_csv(path)] for path in paths], [['0', '1'], ['2', '3'], ['4']])
+        self.assertFalse(os.path.exists(self.csv_path))
+
+    def test_selected_ids_from_csv_export(self):
+        with open(self.csv_path.replace('woocommerce', 'export'), 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(item('1')))
+            writer.writeheader()
+            writer.writerows([dict(item('1'), ImageLinks=str(item('1')['ImageLinks'])), item('2')])
+        json_to_woocommerce_csv(self.csv_path.replace('woocommerce', 'export'), self.csv_path, ids=['2'])
+        rows = read_csv(self.csv_path)
+        self.assertEqual([row['SKU'] for row in rows], ['2'])
+
+
+if __name__ == "__main__":
+    unittest.main()
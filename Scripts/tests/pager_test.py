@@ -0,0 +1,102 @@
+# Pruebas unitarias para el mapa del paginador
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from backup.background_writer import BackgroundWriter
+from scraping.aspnet_forms import parse_document
+from scraping.pager import PagerMap, is_last_page
+
+PAGER_HTML = """
+<html><body><form method="post" action="./Items.aspx">
+<input type="hidden" name="__VIEWSTATE" value="{vs}" />
+<div id="ctl00_ContentPlaceHolderBody_PanelDataListPaging">
+  <a class="PagingLinkCurrent">{current}</a>
+  {links}
+</div></form></body></html>
+"""
+
+
+def pager_html(vs, current, pages):
+    links = ''.join(
+        f"<a class=\"PagingLink\" href=\"javascript:__doPostBack('pager$p{p}','')\">{p}</a>" for p in pages)
+    return PAGER_HTML.format(vs=vs, current=current, links=links)
+
+
+class TestPagerMap(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'pager_map.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_learn_refreshes_state_and_prunes_unused(self):
+        pager = PagerMap(self.path)
+        current = pager.learn(parse_document(pager_html('VS1', 1, [2, 3])), 'https://4am.ie/Admin/Items.aspx')
+        self.assertEqual(current, 1)
+        pager.learn(parse_document(pager_html('VS2', 3, [2, 4])), 'https://4am.ie/Admin/Items.aspx')
+        url, state, target, argument = pager.postback_for(3)
+        self.assertEqual(state['__VIEWSTATE'], 'VS1')
+        self.assertEqual(target, 'pager$p3')
+        # La página 2 se volvió a ver con VS2: su entrada usa el estado más reciente
+        self.assertEqual(pager.postback_for(2)[1]['__VIEWSTATE'], 'VS2')
+        self.assertEqual(pager.postback_for(4)[1]['__VIEWSTATE'], 'VS2')
+        self.assertEqual(len(pager.states), 2)
+        pager.learn(parse_document(pager_html('VS3', 4, [3, 5])), 'https://4am.ie/Admin/Items.aspx')
+        # Ninguna entrada usa ya VS1
+        self.assertEqual([state['__VIEWSTATE'] for state in pager.states], ['VS2', 'VS3'])
+        self.assertEqual(pager.postback_for(2)[1]['__VIEWSTATE'], 'VS2')
+        self.assertEqual(pager.postback_for(3)[1]['__VIEWSTATE'], 'VS3')
+
+    def test_map_is_persisted_on_flush(self):
+        pager = PagerMap(self.path)
+        pager.learn(parse_document(pager_html('VS1', 1, [2])), 'https://4am.ie/Admin/Items.aspx')
+        # learn() no escribe a disco en cada respuesta
+        self.assertFalse(os.path.exists(self.path))
+        pager.flush()
+        reloaded = PagerMap(self.path)
+        self.assertIn(2, reloaded)
+        self.assertNotIn(5, reloaded)
+
+    def test_learn_with_writer_saves_in_background(self):
+        writer = BackgroundWriter()
+        pager = PagerMap(self.path, writer=writer)
+        pager.learn(parse_document(pager_html('VS1', 1, [2])), 'https://4am.ie/Admin/Items.aspx')
+        pager.learn(parse_document(pager_html('VS2', 2, [3])), 'https://4am.ie/Admin/Items.aspx')
+        self.assertFalse(pager.dirty)
+        writer.close()
+        reloaded = PagerMap(self.path)
+        self.assertEqual(sorted(reloaded.entries), [2, 3])
+        self.assertEqual([state['__VIEWSTATE'] for state in reloaded.states], ['VS1', 'VS2'])
+
+    def test_failed_driver_jump_forgets_entry(self):
+        pager = PagerMap(None)
+        pager.learn(parse_document(pager_html('VS1', 1, [2])), 'https://4am.ie/Admin/Items.aspx')
+        driver = MagicMock()
+        driver.execute_script.side_effect = Exception("postback error")
+        self.assertFalse(pager.jump_with_driver(driver, 2))
+        self.assertNotIn(2, pager)
+
+    def test_forget_is_persisted(self):
+        pager = PagerMap(self.path)
+        pager.learn(parse_document(pager_html('VS1', 1, [2])), 'https://4am.ie/Admin/Items.aspx')
+        pager.learn(parse_document(pager_html('VS2', 2, [3])), 'https://4am.ie/Admin/Items.aspx')
+        pager.forget(2)
+        reloaded = PagerMap(self.path)
+        self.assertNotIn(2, reloaded)
+        self.assertEqual([state['__VIEWSTATE'] for state in reloaded.states], ['VS2'])
+        self.assertEqual(reloaded.postback_for(3)[1]['__VIEWSTATE'], 'VS2')
+
+    def test_is_last_page_needs_confirmation(self):
+        self.assertTrue(is_last_page(parse_document(pager_html('VS1', 43, [41, 42]))))
+        self.assertFalse(is_last_page(parse_document(pager_html('VS1', 40, [39, 41]))))
+        next_block = pager_html('VS1', 40, [39]).replace(
+            '</div>', "<a class=\"PagingLink\" href=\"javascript:__doPostBack('pager$next','')\">»</a></div>")
+        self.assertFalse(is_last_page(parse_document(next_block)))
+        # Sin paginador legible (error, sesión caducada) no se da por terminada
+        self.assertFalse(is_last_page(parse_document('<html><body></body></html>')))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# Pruebas unitarias para la caché de sesión y de ChromeDriver
+import os
+import stat
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from scraping.aspnet_forms import create_session
+from scraping.session_cache import (
+    save_cookies, load_cookies, cookies_from_session, apply_to_session, is_logged_in,
+    resolve_driver_path, remember_driver_path,
+)
+from scraping.http_scraper import HttpScraper
+
+COOKIES = [
+    {'name': 'ASP.NET_SessionId', 'value': 'abc', 'domain': '4am.ie', 'path': '/'},
+    {'name': '.ASPXAUTH', 'value': 'old', 'domain': '4am.ie', 'path': '/', 'expiry': 100},
+]
+
+
+def fake_response(url, content):
+    response = MagicMock()
+    response.url = url
+    response.content = content
+    return response
+
+
+class TestSessionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cookies_path = os.path.join(self.tmp.name, 'session_cookies.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_expired_cookies_are_dropped(self):
+        save_cookies(COOKIES, self.cookies_path)
+        self.assertEqual([c['name'] for c in load_cookies(self.cookies_path, now=200)], ['ASP.NET_SessionId'])
+        self.assertEqual(load_cookies(os.path.join(self.tmp.name, 'missing.json')), [])
+
+    def test_session_round_trip(self):
+        session = create_session()
+        apply_to_session(session, COOKIES[:1])
+        self.assertEqual(cookies_from_session(session)[0]['value'], 'abc')
+        self.assertTrue(is_logged_in('https://4am.ie/Admin/Items.aspx'))
+        self.assertFalse(is_logged_in('https://4am.ie/Logon.aspx?admin&ReturnUrl=%2fAdmin%2fItems.aspx'))
+
+    def test_resolve_driver_path_from_cache_file(self):
+        driver = os.path.join(self.tmp.name, 'chromedriver')
+        with open(driver, 'w') as f:
+            f.write('')
+        os.chmod(driver, os.stat(driver).st_mode | stat.S_IEXEC)
+        cache_path = os.path.join(self.tmp.name, 'chromedriver_path.txt')
+        remember_driver_path(driver, cache_path)
+        self.assertEqual(resolve_driver_path(cache_path, cache_dir=self.tmp.name), driver)
+
+    def test_http_login_skipped_with_valid_cookies(self):
+        save_cookies(COOKIES[:1], self.cookies_path)
+        config = MagicMock(ITEMS_URL='https://4am.ie/Admin/Items.aspx')
+        scraper = HttpScraper(config, pager_path=None, cookies_path=self.cookies_path)
+        scraper.session = MagicMock()
+        scraper.session.get.return_value = fake_response(
+            config.ITEMS_URL, '<html><body><table class="gridView"></table></body></html>')
+        scraper.login()
+        scraper.session.get.assert_called_once_with(config.ITEMS_URL, timeout=30)
+        scraper.session.post.assert_not_called()
+
+    def test_http_invalid_cookies_are_cleared(self):
+        save_cookies(COOKIES[:1], self.cookies_path)
+        scraper = HttpScraper(MagicMock(), pager_path=None, cookies_path=self.cookies_path)
+        scraper.session = MagicMock()
+        scraper.session.get.return_value = fake_response('https://4am.ie/Logon.aspx', '<html><body></body></html>')
+        self.assertFalse(scraper.restore_session())
+        self.assertFalse(os.path.exists(self.cookies_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# Pruebas unitarias para el pool de sesiones HTTP autenticadas
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+from scraping.session_pool import SessionPool
+
+
+class FakeSession:
+    def __init__(self, active, peak):
+        self.active = active
+        self.peak = peak
+        self.requests = []
+        self.closed = False
+
+    def request(self, method, url, **kwargs):
+        with self.active['lock']:
+            self.active['count'] += 1
+            self.peak.append(self.active['count'])
+        self.requests.append((method, url))
+        time.sleep(0.01)
+        with self.active['lock']:
+            self.active['count'] -= 1
+        return url
+
+    def close(self):
+        self.closed = True
+
+
+class TestSessionPool(unittest.TestCase):
+    def test_each_concurrent_request_gets_its_own_session(self):
+        active, peak, created = {'count': 0, 'lock': threading.Lock()}, [], []
+
+        def factory():
+            created.append(FakeSession(active, peak))
+            return created[-1]
+
+        pool = SessionPool(factory, size=3)
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(pool.get, [f'https://4am.ie/{i}' for i in range(12)]))
+        self.assertEqual(results, [f'https://4am.ie/{i}' for i in range(12)])
+        self.assertLessEqual(len(created), 3)
+        self.assertLessEqual(max(peak), 3)
+        # Ninguna sesión atiende dos peticiones a la vez
+        self.assertEqual(sum(len(session.requests) for session in created), 12)
+        pool.close()
+        self.assertTrue(all(session.closed for session in created))
+
+    def test_failed_login_frees_its_slot(self):
+        session = MagicMock()
+        factory = MagicMock(side_effect=[Exception("Login fallido"), session])
+        pool = SessionPool(factory, size=1)
+        with self.assertRaises(Exception):
+            pool.get('https://4am.ie/Admin/Items.aspx')
+        pool.post('https://4am.ie/Admin/Items.aspx', data={'a': '1'})
+        session.request.assert_called_once_with('POST', 'https://4am.ie/Admin/Items.aspx', data={'a': '1'})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# Pruebas unitarias para el diff entre exportaciones
+import csv
+import json
+import os
+import tempfile
+import unittest
+from backup.item_store import ItemStore
+from data_processing.snapshot_diff import diff_snapshots
+from fixtures import item
+
+
+class TestSnapshotDiff(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_json(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return path
+
+    def write_csv(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(data[0]))
+            writer.writeheader()
+            writer.writerows(data)
+        return path
+
+    def test_added_removed_changed_with_field_differences(self):
+        old = self.write_json('old.json', [item('831'), item('832'), item('833'), item('833')])
+        new = self.write_json('new.json', [item('831', Price='€450.00'), item('833'), item('834')])
+        diff = diff_snapshots(old, new)
+        self.assertEqual(diff['added'], ['834'])
+        self.assertEqual(diff['removed'], ['832'])
+        self.assertEqual(diff['changed'], {'831': {'Price': ['€425.00', '€450.00']}})
+        self.assertEqual(diff['unchanged'], 1)
+        self.assertEqual(diff['duplicates'], {'old': 1, 'new': 0})
+
+    def test_csv_against_json_is_normalised(self):
+        # En el CSV ImageLinks es texto y el Name trae espacios sobrantes
+        old = self.write_csv('old.csv', [dict(item('831'), Name='831  Bankers Lamp '), item('832')])
+        new = self.write_json('new.json', [item('831'), item('832', ImageLinks=[])])
+        diff = diff_snapshots(old, new)
+        self.assertEqual(diff['unchanged'], 1)
+        self.assertEqual(diff['changed'], {'832': {'ImageLinks': [['https://file.4pm.ie/668/d17238eb.jpg'], []]}})
+
+    def test_checkpoint_log_on_either_side_merges_lines_by_id(self):
+        # Log JSONL: item completo y, después, la línea con su descripción
+        path = os.path.join(self.tmp.name, 'items_checkpoint.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in (item('831'), item('832'), {'ID': '831', 'DescriptionSummary': 'Height: 19.75 (50cm)'},
+                           {'ID': '832', 'DescriptionSummary': 'Materials: Oak'}):
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        final = self.write_json('items_all.json', [item('831', DescriptionSummary='Height: 19.75 (50cm)'),
+                                                   item('832', DescriptionSummary='Materials: Mahogany')])
+        for old, new in ((path, final), (final, path)):
+            diff = diff_snapshots(old, new)
+            self.assertEqual((diff['added'], diff['removed'], diff['unchanged']), ([], [], 1))
+            self.assertEqual(diff['duplicates'], {'old': 0, 'new': 0})
+            self.assertEqual(list(diff['changed']), ['832'])
+        self.assertEqual(diff_snapshots(path, final)['changed']['832'],
+                         {'DescriptionSummary': ['Materials: Oak', 'Materials: Mahogany']})
+
+    def test_sqlite_store_as_old_side(self):
+        db_path = os.path.join(self.tmp.name, 'items.db')
+        with ItemStore(db_path) as store:
+            store.upsert_many([item('831'), item('832')])
+        new = self.write_json('new.json', [item('831', 'Brass Lamp')])
+        diff = diff_snapshots(db_path, new)
+        self.assertEqual(diff['removed'], ['832'])
+        self.assertEqual(diff['changed']['831']['Name'], ['831 Bankers Lamp', '831 Brass Lamp'])
+
+
+if __name__ == "__main__":
+    unittest.main()
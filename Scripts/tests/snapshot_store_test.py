@@ -0,0 +1,72 @@
+# Pruebas unitarias para el almacén de instantáneas deduplicado
+import csv
+import json
+import os
+import tempfile
+import unittest
+from backup.snapshot_store import SnapshotStore, file_sha256
+
+
+def items(count, start=800):
+    return [{'ID': str(start + i), 'Name': f'{start + i} Bankers Lamp', 'Price': '€425.00',
+             'ImageLinks': [f'https://file.4pm.ie/668/{i}.jpg']} for i in range(count)]
+
+
+def chunk_files(store):
+    return sum(len(files) for _, _, files in os.walk(store.chunk_dir))
+
+
+class TestSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(os.path.join(self.tmp.name, 'snapshots'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_and_dedup(self):
+        data = items(300)
+        self.store.put(data, 'run1')
+        stored = chunk_files(self.store)
+        self.store.put(data, 'run2')
+        self.assertEqual(chunk_files(self.store), stored)
+        self.assertEqual(self.store.get('run2'), data)
+        self.assertEqual(self.store.names(), ['run1', 'run2'])
+
+    def test_small_change_only_writes_new_chunks(self):
+        data = items(300)
+        first = self.store.put(data, 'run1')
+        changed = [dict(item) for item in data]
+        changed[150]['Price'] = '€450.00'
+        changed.insert(10, items(1, start=5000)[0])
+        second = self.store.put(changed, 'run2')
+        new = set(second['chunks']) - set(first['chunks'])
+        self.assertLessEqual(len(new), 2)
+        self.assertEqual(self.store.get('run1'), data)
+        self.assertEqual(self.store.get('run2'), changed)
+
+    def test_restore_files_byte_identical(self):
+        json_path = os.path.join(self.tmp.name, 'items_backup_100.json')
+        csv_path = os.path.join(self.tmp.name, 'items_all.csv')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(items(40), f, ensure_ascii=False, indent=2)
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['ID', 'Name', 'Price', 'ImageLinks'],
+                                    lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(items(40))
+        for path in (json_path, csv_path):
+            self.store.import_file(path)
+            restored = self.store.restore(os.path.basename(path), path + '.restored')
+            self.assertEqual(file_sha256(restored), file_sha256(path))
+
+    def test_gc_removes_unreferenced_chunks(self):
+        self.store.put(items(100), 'old')
+        self.store.put(items(100, start=3000), 'new')
+        self.store.delete('old')
+        self.assertGreater(self.store.gc(), 0)
+        self.assertEqual(len(self.store.get('new')), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# Pruebas unitarias para la exportación final en streaming
+import json
+import os
+import tempfile
+import unittest
+from backup.backup_manager import save_outputs
+from backup.stream_export import StreamingExport, iter_json_array
+from fixtures import item
+
+
+class TestStreamingExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, directory, name):
+        with open(os.path.join(directory, name), 'rb') as f:
+            return f.read()
+
+    def test_same_bytes_as_save_outputs(self):
+        data = [item('831'), item('832'), item('833')]
+        with StreamingExport(self.dir) as export:
+            for record in data:
+                export.add(record)
+        reference = os.path.join(self.dir, 'reference')
+        save_outputs(data, reference)
+        for name in ('items_all.json', 'items_all.csv'):
+            self.assertEqual(self.read(self.dir, name), self.read(reference, name))
+        self.assertEqual(list(iter_json_array(os.path.join(self.dir, 'items_all.json'), 16)), data)
+
+    def test_pending_descriptions_keep_listing_order(self):
+        export = StreamingExport(self.dir)
+        first, second = item('831'), item('832')
+        export.add(first, pending=True)
+        export.complete('833')  # descripción terminada antes de add()
+        export.add(second)
+        export.add(item('833'), pending=True)
+        self.assertEqual(export.count, 0)
+        first['DescriptionSummary'] = 'Height: 19.75 (50cm)'
+        export.complete('831')
+        self.assertEqual(export.count, 3)
+        export.close()
+        with open(export.json_path, encoding='utf-8') as f:
+            written = json.load(f)
+        self.assertEqual([i['ID'] for i in written], ['831', '832', '833'])
+        self.assertEqual(written[0]['DescriptionSummary'], 'Height: 19.75 (50cm)')
+
+    def test_finalised_on_interrupt(self):
+        path = os.path.join(self.dir, 'items_all.json')
+        with self.assertRaises(KeyboardInterrupt):
+            with StreamingExport(self.dir) as export:
+                export.add(item('831'))
+                export.add(item('832'), pending=True)
+                raise KeyboardInterrupt
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual([i['ID'] for i in json.load(f)], ['831', '832'])
+        self.assertFalse(os.path.exists(path + '.part'))
+
+    def test_empty_export(self):
+        StreamingExport(self.dir).close()
+        self.assertEqual(self.read(self.dir, 'items_all.json'), b'[]')
+        self.assertFalse(os.path.exists(os.path.join(self.dir, 'items_all.csv')))
+
+
+if __name__ == "__main__":
+    unittest.main()
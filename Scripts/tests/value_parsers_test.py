@@ -0,0 +1,25 @@
+# Pruebas unitarias para los parsers de valores compartidos por las exportaciones
+import unittest
+from datetime import date
+from decimal import Decimal
+from data_processing.value_parsers import parse_featured, parse_pictures, parse_price, parse_updated
+
+
+class TestValueParsers(unittest.TestCase):
+    def test_price(self):
+        self.assertEqual(parse_price('€23,500.00'), Decimal('23500.00'))
+        self.assertEqual(parse_price('945'), Decimal('945.00'))
+        for value in ('POA', '', None, 'NaN', 'sNaN', 'Infinity', '-inf'):
+            self.assertIsNone(parse_price(value), value)
+
+    def test_other_columns(self):
+        self.assertEqual(parse_pictures('8 x'), 8)
+        self.assertIsNone(parse_pictures('x'))
+        self.assertIs(parse_featured('Yes'), True)
+        self.assertIsNone(parse_featured('maybe'))
+        self.assertEqual(parse_updated('30/05/2025'), date(2025, 5, 30))
+        self.assertIsNone(parse_updated('31/02/2024'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# Pruebas unitarias para las esperas adaptativas
+import unittest
+from unittest.mock import MagicMock, patch
+from scraping.wait_scheduler import AdaptiveWait, percentile
+
+
+class TestAdaptiveWait(unittest.TestCase):
+    def setUp(self):
+        self.wait = AdaptiveWait(MagicMock(), min_timeout=2, max_timeout=30, factor=3)
+
+    def test_percentile(self):
+        samples = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+        self.assertEqual(percentile(samples, 50), 5)
+        self.assertEqual(percentile(samples, 95), 10)
+
+    def test_until_returns_condition_result_and_records_latency(self):
+        result = self.wait.until(lambda driver: 'ok', 'listing')
+        self.assertEqual(result, 'ok')
+        self.assertEqual(len(self.wait.samples['listing']), 1)
+
+    def test_timeout_learns_from_observed_latency(self):
+        self.assertEqual(self.wait.timeout_for('pager'), 30)
+        for elapsed in [0.2, 0.3, 0.25, 0.4, 0.5, 0.3]:
+            self.wait.record('pager', elapsed)
+        self.assertEqual(self.wait.timeout_for('pager'), 2)
+        for elapsed in [5, 6, 7, 8, 9, 10]:
+            self.wait.record('edit', elapsed)
+        self.assertEqual(self.wait.timeout_for('edit'), 30)
+
+    @patch('scraping.wait_scheduler.time.sleep')
+    def test_backoff_only_when_slow(self, sleep):
+        for elapsed in [0.5, 0.5, 0.6, 0.5, 0.4]:
+            self.wait.record('pager', elapsed)
+        self.assertEqual(self.wait.backoff('pager'), 0)
+        sleep.assert_not_called()
+        self.wait.record('pager', 3.5)
+        self.assertAlmostEqual(self.wait.backoff('pager'), 3.0)
+        sleep.assert_called_once()
+
+    @patch('scraping.wait_scheduler.time.sleep')
+    def test_retry_backoff_has_a_growing_floor(self, sleep):
+        # Sin latencias medidas (o con el sitio rápido) también se espera
+        self.assertEqual([self.wait.retry_backoff(attempt, 'pager') for attempt in (1, 2, 3, 4, 5)],
+                         [2, 4, 8, 10, 10])
+        self.assertEqual(sleep.call_count, 5)
+        for elapsed in [0.5, 0.5, 0.6, 0.5, 12.5]:
+            self.wait.record('pager', elapsed)
+        self.assertEqual(self.wait.retry_backoff(1, 'pager'), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+# Pruebas unitarias para el reparto de páginas del pool de navegadores
+import unittest
+from scraping.session_cache import COOKIES_PATH
+from scraping.worker_pool import split_pages, merge_by_id, worker_cookies_path
+
+
+class TestWorkerPool(unittest.TestCase):
+    def test_split_pages_is_disjoint_and_complete(self):
+        slices = split_pages(range(1, 44), 8)
+        self.assertEqual(len(slices), 8)
+        self.assertEqual(sum(slices, []), list(range(1, 44)))
+        self.assertEqual(max(len(s) for s in slices) - min(len(s) for s in slices), 1)
+
+    def test_split_pages_more_workers_than_pages(self):
+        self.assertEqual(split_pages([3, 7], 8), [[3], [7]])
+
+    def test_merge_by_id_skips_duplicates(self):
+        merged = merge_by_id([[{'ID': '1'}, {'ID': '2'}], [{'ID': '2'}, {'ID': '3'}]])
+        self.assertEqual([item['ID'] for item in merged], ['1', '2', '3'])
+
+    def test_each_worker_has_its_own_session(self):
+        paths = {worker_cookies_path(index) for index in range(1, 9)}
+        self.assertEqual(len(paths), 8)
+        self.assertNotIn(COOKIES_PATH, paths)
+        self.assertEqual(worker_cookies_path(1), 'output/session_cookies_worker1.json')
+
+
+if __name__ == "__main__":
+    unittest.main()